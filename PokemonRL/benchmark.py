@@ -0,0 +1,253 @@
+"""
+Benchmarks de rendimiento de los caminos calientes: motor, entorno, GameManager,
+redes y Estratega. Escribe los resultados en JSON y, si se le pasa una línea base,
+marca las regresiones por encima del umbral (y sale con código 1).
+
+    python benchmark.py                                  # todo, resultados a benchmarks/latest.json
+    python benchmark.py --only engine,env --out r.json
+    python benchmark.py --save-baseline                  # guarda la línea base de esta máquina
+    python benchmark.py --baseline benchmarks/baseline.json --threshold 0.15
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import numpy as np
+import torch
+from src.env.pokemon_env import PokemonSimEnv
+from src.env.battle_engine import BattleEngine
+from src.agents.explorer import ExplorerAgent
+from src.agents.tactician import TacticianAgent
+from src.agents.strategist import Strategist
+from src.game_manager import GameManager
+from src.utils.rng import RandomStream
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BENCH_DIR = os.path.join(BASE_DIR, "benchmarks")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+LATEST_PATH = os.path.join(BENCH_DIR, "latest.json")
+
+MIN_TIME = 0.5           # Segundos mínimos por medida
+REPEATS = 3              # Se queda la mejor de REPEATS medidas
+THRESHOLD = 0.15         # Regresión = más de un 15% peor que la línea base
+BATCH_SIZES = (1, 32, 256)
+MAP_OBS_SHAPE = (9, 10, 10)
+COMBAT_OBS_DIM = 10
+SEED = 0
+
+_results = {}
+
+
+def measure(fn, ops_per_call=1, min_time=MIN_TIME, repeats=REPEATS):
+    """Mejor tasa (operaciones/s) de repeats medidas de al menos min_time segundos."""
+    fn()  # Calentamiento
+    best = 0.0
+    for _ in range(repeats):
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            fn()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        best = max(best, calls * ops_per_call / elapsed)
+    return best
+
+
+def record(name, value, unit, higher_is_better=True):
+    _results[name] = {'value': value, 'unit': unit, 'higher_is_better': higher_is_better}
+    print(f"  {name:<40} {value:>14,.2f} {unit}")
+
+
+# --- MOTOR ---
+def bench_engine():
+    env = PokemonSimEnv(seed=SEED)
+    strategist = Strategist(env.pokedex, seed=SEED)
+    attacker = strategist.prepare_pokemon('6', 40)
+    defender = strategist.prepare_pokemon('9', 40)
+    rng = RandomStream(SEED)
+    moves = ['flamethrower', 'slash', 'tackle', 'ember']
+
+    def run():
+        for move in moves:
+            defender['is_protected'] = False
+            BattleEngine.calculate_damage(attacker, defender, move, rng)
+    record("engine.calculate_damage", measure(run, len(moves)), "calls/s")
+
+
+# --- ENTORNO ---
+def bench_env():
+    env = PokemonSimEnv(seed=SEED)
+    strategist = Strategist(env.pokedex, seed=SEED)
+    env.my_pokemon = strategist.prepare_pokemon('4', 20)
+    env.reset(seed=SEED)
+    actions = np.random.default_rng(SEED).integers(0, 4, 4096).tolist()
+
+    def run_map():
+        for a in actions[:256]:
+            if env.mode != "MAP":
+                env.mode = "MAP"  # Repelente: solo se mide el mapa (y la generación del salvaje)
+            _, _, done, _, _ = env.step(a)
+            if done:
+                env.reset()
+    record("env.step.map", measure(run_map, 256), "steps/s")
+
+    def start_combat():
+        env.mode = "COMBAT"
+        env._generate_wild_enemy()
+        env.my_hp = env.max_hp_my
+
+    def run_combat():
+        for a in actions[:256]:
+            if env.mode != "COMBAT":
+                start_combat()
+            _, _, done, _, _ = env.step(4 + a)
+            if done:
+                start_combat()
+    start_combat()
+    record("env.step.combat", measure(run_combat, 256), "steps/s")
+
+
+# --- GAME MANAGER (sin interfaz) ---
+def bench_game_manager():
+    torch.manual_seed(SEED)
+    env = PokemonSimEnv(seed=SEED)
+    strategist = Strategist(env.pokedex, seed=SEED)
+    gm = GameManager(env, strategist, TacticianAgent(COMBAT_OBS_DIM, 5), ExplorerAgent(MAP_OBS_SHAPE, 4), verbose=False)
+    gm.init_game(seed=SEED)
+    spent = {'MAP': 0.0, 'COMBAT': 0.0}
+    ticks = {'MAP': 0, 'COMBAT': 0}
+    end = time.perf_counter() + 2 * MIN_TIME * REPEATS
+    while time.perf_counter() < end:
+        mode = env.mode
+        start = time.perf_counter()
+        gm.tick()
+        if gm.champion:  # Se vuelve a empezar
+            gm.init_game(seed=SEED)
+        spent[mode] += time.perf_counter() - start
+        ticks[mode] += 1
+    record("game_manager.map_logic", ticks['MAP'] / max(spent['MAP'], 1e-9), "ticks/s")
+    record("game_manager.combat_logic", ticks['COMBAT'] / max(spent['COMBAT'], 1e-9), "ticks/s")
+
+
+# --- REDES ---
+def bench_models():
+    torch.manual_seed(SEED)
+    rng = np.random.default_rng(SEED)
+    agents = {
+        'map_cnn': (ExplorerAgent(MAP_OBS_SHAPE, 4), MAP_OBS_SHAPE, 4),
+        'combat_dqn': (TacticianAgent(COMBAT_OBS_DIM, 5), (COMBAT_OBS_DIM,), 5),
+    }
+    for name, (agent, obs_shape, n_actions) in agents.items():
+        for batch in BATCH_SIZES:
+            states = torch.as_tensor(rng.random((batch,) + obs_shape, dtype=np.float32), device=agent.device)
+
+            def forward():
+                with torch.no_grad():
+                    agent.policy_net(states)
+                if agent.device.type == "cuda":
+                    torch.cuda.synchronize()
+            record(f"{name}.forward.b{batch}", 1000.0 / measure(forward), "ms", higher_is_better=False)
+
+            batch_args = (rng.random((batch,) + obs_shape, dtype=np.float32), rng.integers(0, n_actions, batch),
+                          rng.random(batch, dtype=np.float32), rng.random((batch,) + obs_shape, dtype=np.float32),
+                          np.zeros(batch, dtype=np.float32))
+            record(f"{name}.learn.b{batch}", 1000.0 / measure(lambda: agent.learn_batch(*batch_args)), "ms",
+                   higher_is_better=False)
+
+
+# --- ESTRATEGA ---
+def bench_strategist():
+    env = PokemonSimEnv(seed=SEED)
+    strategist = Strategist(env.pokedex, seed=SEED)
+    rng = np.random.default_rng(SEED)
+    pids = [str(p) for p in rng.integers(1, 152, 512)]
+    levels = rng.integers(2, 60, 512).tolist()
+
+    def run():
+        for pid, level in zip(pids, levels):
+            strategist.prepare_pokemon(pid, level)
+    record("strategist.prepare_pokemon", measure(run, len(pids)), "calls/s")
+
+
+BENCHMARKS = {
+    'engine': bench_engine,
+    'env': bench_env,
+    'game_manager': bench_game_manager,
+    'models': bench_models,
+    'strategist': bench_strategist,
+}
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """Compara con la línea base. Devuelve la lista de regresiones (nombre, cambio relativo)."""
+    regressions = []
+    print(f"\n{'benchmark':<40} {'base':>12} {'actual':>12} {'cambio':>8}")
+    for name, cur in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        # Cambio positivo = mejora, sea cual sea la unidad
+        if cur['higher_is_better']:
+            change = cur['value'] / base['value'] - 1
+        else:
+            change = base['value'] / cur['value'] - 1
+        flag = " ⚠ REGRESIÓN" if change < -threshold else ""
+        print(f"{name:<40} {base['value']:>12.2f} {cur['value']:>12.2f} {change:>+7.1%}{flag}")
+        if flag:
+            regressions.append((name, change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de rendimiento de PokemonRL.")
+    parser.add_argument("--only", default="", help=f"grupos separados por comas: {','.join(BENCHMARKS)}")
+    parser.add_argument("--out", default=LATEST_PATH, help="fichero JSON de resultados")
+    parser.add_argument("--baseline", default=None, help="JSON con el que comparar")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="pérdida relativa que cuenta como regresión")
+    parser.add_argument("--save-baseline", action="store_true", help=f"guarda también los resultados en {BASELINE_PATH}")
+    args = parser.parse_args(argv)
+
+    groups = [g.strip() for g in args.only.split(",") if g.strip()] or list(BENCHMARKS)
+    unknown = [g for g in groups if g not in BENCHMARKS]
+    if unknown:
+        parser.error(f"grupos desconocidos: {','.join(unknown)} (disponibles: {','.join(BENCHMARKS)})")
+    for group in groups:
+        print(f"⏱️  {group}")
+        BENCHMARKS[group]()
+
+    report = {
+        'meta': {
+            'time': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'torch': torch.__version__,
+            'torch_threads': torch.get_num_threads(),
+            'cuda': torch.cuda.is_available(),
+        },
+        'results': _results,
+    }
+    paths = [args.out] + ([BASELINE_PATH] if args.save_baseline else [])
+    for path in paths:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Resultados en {path}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(_results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regresiones por encima del {args.threshold:.0%}")
+            return 1
+        print("\n✅ Sin regresiones")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""
+Campañas completas sin interfaz (init_game -> mapas -> Líder de Gimnasio) a toda la
+velocidad de la CPU, para evaluar checkpoints a escala.
+
+Cada proceso juega sus campañas en `threads` hilos que comparten un InferenceService
+(las decisiones de todas las partidas se agrupan en un solo forward por red); con
+`workers` > 0 las semillas se reparten además entre procesos.
+
+    python headless_play.py --campaigns 64 --checkpoint 2000 --workers 4 --threads 16
+"""
+import argparse
+import json
+import multiprocessing as mp
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import torch
+from src.env.pokemon_env import PokemonSimEnv
+from src.env.maps import ALL_MAPS
+from src.agents.explorer import ExplorerAgent
+from src.agents.tactician import TacticianAgent
+from src.agents.strategist import Strategist
+from src.agents.inference import InferenceService
+from src.game_manager import GameManager
+from src.utils.event_log import EventLog
+from src.utils.logger import setup_logging, parse_levels
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CHECKPOINT_DIR = os.path.join(BASE_DIR, "checkpoints")
+MAP_OBS_SHAPE = (9, 10, 10)
+COMBAT_OBS_DIM = 10
+MAX_TICKS = 50000  # Campaña sin terminar en estos ticks = 'timeout'
+
+
+def load_agents(checkpoint=None, checkpoint_dir=CHECKPOINT_DIR):
+    """Explorador y Táctico (solo inferencia) con los pesos del episodio `checkpoint`."""
+    # Sin replay buffer: aquí no se entrena
+    explorer = ExplorerAgent(MAP_OBS_SHAPE, 4, buffer_size=1)
+    tactician = TacticianAgent(COMBAT_OBS_DIM, 5, buffer_size=1)
+    if checkpoint is not None:
+        for name, agent in (("explorer", explorer), ("tactician", tactician)):
+            path = os.path.join(checkpoint_dir, f"{name}_ep{checkpoint}.pth")
+            if os.path.exists(path):
+                agent.policy_net.load_state_dict(torch.load(path, map_location=agent.device))
+            else:
+                print(f"⚠ No existe {path}, {name} con pesos aleatorios")
+    explorer.policy_net.eval()
+    tactician.policy_net.eval()
+    return explorer, tactician
+
+
+def play_campaign(manager, seed=None, party_ids=None, max_ticks=MAX_TICKS):
+    """
+    Juega una campaña con un GameManager ya creado y devuelve sus resultados:
+    ticks y wipeouts de cada mapa, intentos/wipeouts/ticks contra el Líder y el desenlace
+    ('champion' o 'timeout').
+    """
+    manager.init_game(party_ids=party_ids, seed=seed)
+    n_maps = len(ALL_MAPS)
+    map_ticks = [0] * n_maps
+    map_wipeouts = [0] * n_maps
+    boss = {'attempts': 0, 'wipeouts': 0, 'ticks': 0}
+
+    ticks = 0
+    while ticks < max_ticks and not manager.champion:
+        level, wipeouts = manager.current_level_idx, manager.wipeouts
+        # Solo cuenta como combate contra el Líder si de verdad se está peleando
+        in_boss = manager.boss_mode and manager.env.mode == "COMBAT"
+        manager.tick()
+        ticks += 1
+        if in_boss:
+            boss['ticks'] += 1
+            boss['wipeouts'] += manager.wipeouts - wipeouts
+        else:
+            map_ticks[level] += 1
+            map_wipeouts[level] += manager.wipeouts - wipeouts
+            if manager.boss_mode:
+                boss['attempts'] += 1
+
+    return {
+        'seed': seed,
+        'party': [str(p['id']) for p in manager.my_team],
+        'outcome': 'champion' if manager.champion else 'timeout',
+        'ticks': ticks,
+        'maps_cleared': n_maps if boss['attempts'] or manager.boss_mode else manager.current_level_idx,
+        'map_ticks': map_ticks,
+        'map_wipeouts': map_wipeouts,
+        'boss': boss,
+        'final_levels': [int(p['level']) for p in manager.my_team],
+    }
+
+
+def run_campaigns(seeds, checkpoint=None, threads=1, max_ticks=MAX_TICKS, party_ids=None, events_dir=None,
+                  navigation=True):
+    """
+    Juega una campaña por semilla en este proceso, `threads` a la vez con inferencia compartida.
+    Con events_dir, cada campaña se registra en events_dir/campaign_<semilla>.bin (src.replay).
+    """
+    explorer, tactician = load_agents(checkpoint)
+    inference = InferenceService(explorer, tactician)
+
+    def campaign(seed):
+        env = PokemonSimEnv()
+        events = EventLog(os.path.join(events_dir, f"campaign_{seed}.bin")) if events_dir else None
+        manager = GameManager(env, Strategist(env.pokedex), tactician, explorer,
+                              inference=inference, verbose=False, events=events,
+                              navigation=navigation)
+        try:
+            return play_campaign(manager, seed=seed, party_ids=party_ids, max_ticks=max_ticks)
+        finally:
+            manager.close()
+            if events is not None:
+                events.close()
+
+    try:
+        with ThreadPoolExecutor(max(1, threads)) as pool:
+            return list(pool.map(campaign, seeds))
+    finally:
+        inference.close()
+
+
+def _run_chunk(args):
+    seeds, kwargs, logging_kwargs = args
+    torch.set_num_threads(1)  # Un hilo de torch por proceso: los procesos ya reparten la CPU
+    if logging_kwargs is not None:
+        setup_logging(**logging_kwargs)
+    return run_campaigns(seeds, **kwargs)
+
+
+def run_parallel(seeds, workers=0, logging_kwargs=None, **kwargs):
+    """
+    Reparte las semillas entre `workers` procesos (0 = en este proceso). logging_kwargs
+    (argumentos de setup_logging) configura el logging de cada proceso.
+    """
+    seeds = list(seeds)
+    if workers <= 0:
+        return run_campaigns(seeds, **kwargs)
+    chunks = [(chunk.tolist(), kwargs, logging_kwargs) for chunk in np.array_split(seeds, workers) if len(chunk)]
+    with mp.get_context("spawn").Pool(len(chunks)) as pool:
+        return [r for results in pool.map(_run_chunk, chunks) for r in results]
+
+
+def summarize(results):
+    """Resumen agregado de una lista de resultados de play_campaign."""
+    wins = [r for r in results if r['outcome'] == 'champion']
+    return {
+        'campaigns': len(results),
+        'win_rate': len(wins) / max(len(results), 1),
+        'mean_ticks_to_champion': float(np.mean([r['ticks'] for r in wins])) if wins else None,
+        'mean_map_ticks': np.mean([r['map_ticks'] for r in results], axis=0).tolist(),
+        'mean_map_wipeouts': np.mean([r['map_wipeouts'] for r in results], axis=0).tolist(),
+        'mean_boss_attempts': float(np.mean([r['boss']['attempts'] for r in results])),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Campañas completas sin interfaz para evaluar checkpoints.")
+    parser.add_argument("--campaigns", type=int, default=16)
+    parser.add_argument("--checkpoint", type=int, default=None, help="episodio de checkpoints/*_ep<N>.pth")
+    parser.add_argument("--workers", type=int, default=0, help="procesos (0 = en este proceso)")
+    parser.add_argument("--threads", type=int, default=8, help="partidas simultáneas por proceso")
+    parser.add_argument("--max-ticks", type=int, default=MAX_TICKS)
+    parser.add_argument("--seed", type=int, default=0, help="semilla de la primera campaña")
+    parser.add_argument("--party", default=None, help="ids separados por comas (por defecto, al azar)")
+    parser.add_argument("--out", default=None, help="JSON con los resultados de cada campaña")
+    parser.add_argument("--events", default=None, help="carpeta donde registrar los eventos de cada campaña")
+    parser.add_argument("--no-navigation", action="store_true", help="Explorador sin índice de navegación")
+    parser.add_argument("--log-level", default="WARNING", help="nivel de los mensajes de las partidas")
+    parser.add_argument("--log", default="", help="niveles por componente, p. ej. game=INFO,strategist=ERROR")
+    args = parser.parse_args()
+
+    logging_kwargs = dict(level=args.log_level, components=parse_levels(args.log))
+    setup_logging(**logging_kwargs)
+    start = time.perf_counter()
+    results = run_parallel(range(args.seed, args.seed + args.campaigns), workers=args.workers,
+                           logging_kwargs=logging_kwargs,
+                           checkpoint=args.checkpoint, threads=args.threads, max_ticks=args.max_ticks,
+                           party_ids=args.party.split(",") if args.party else None, events_dir=args.events,
+                           navigation=not args.no_navigation)
+    elapsed = time.perf_counter() - start
+
+    summary = summarize(results)
+    total_ticks = sum(r['ticks'] for r in results)
+    print(f"\n🏁 {len(results)} campañas en {elapsed:.1f}s ({total_ticks / elapsed:,.0f} ticks/s)")
+    print(json.dumps(summary, indent=2))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({'summary': summary, 'campaigns': results}, f, indent=2)
+        print(f"💾 Resultados en {args.out}")
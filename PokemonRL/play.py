@@ -6,6 +6,7 @@ from src.env.pokemon_env import PokemonSimEnv
 from src.agents.explorer import ExplorerAgent
 from src.agents.tactician import TacticianAgent
 from src.agents.strategist import Strategist
+from src.utils.logger import setup_logging
 
 
 def play():
@@ -59,8 +60,8 @@ def play():
             # Nota: select_action espera un array, no un tensor directo a veces, depende de tu impl
             # Aquí forzamos una selección 'greedy' (sin aleatoriedad)
             with torch.no_grad():
-                state_t = torch.FloatTensor(
-                    state).unsqueeze(0).to(explorer.device)
+                state_t = torch.as_tensor(
+                    state, dtype=torch.float32).unsqueeze(0).to(explorer.device)
                 action = explorer.policy_net(state_t).argmax().item()
 
             next_state, reward, done, _, _ = env.step(action)
@@ -73,7 +74,7 @@ def play():
         elif env.mode == "COMBAT":
             # Usar Táctico
             with torch.no_grad():
-                state_t = torch.FloatTensor(state).to(tactician.device)
+                state_t = torch.as_tensor(state, dtype=torch.float32).to(tactician.device)
                 if state_t.dim() == 1:
                     state_t = state_t.unsqueeze(0)
                 action = tactician.policy_net(state_t).argmax().item()
@@ -158,4 +159,5 @@ def render_frame(env, ax1, ax2):
 
 
 if __name__ == "__main__":
+    setup_logging()
     play()
@@ -0,0 +1,119 @@
+"""
+Servicio de inferencia para GameManager: tiene las redes del Explorador y del Táctico
+y resuelve las peticiones de muchas partidas a la vez.
+
+Con un solo cliente registrado la red se evalúa en el momento (sin hilos ni esperas).
+Con varios (p. ej. muchas partidas en hilos del mismo proceso), las peticiones se
+acumulan en una cola y un hilo las evalúa en un solo forward por red cuando todos los
+clientes están esperando, se llena el lote o vence el plazo max_latency.
+"""
+import threading
+import time
+from concurrent.futures import Future
+import numpy as np
+import torch
+
+MAX_BATCH = 256
+MAX_LATENCY = 0.002  # Segundos que puede esperar la petición más antigua
+
+
+class InferenceService:
+    def __init__(self, explorer, tactician, max_batch=MAX_BATCH, max_latency=MAX_LATENCY):
+        # 'map' -> red del Explorador, 'combat' -> red del Táctico
+        self.agents = {'map': explorer, 'combat': tactician}
+        self.max_batch = max_batch
+        self.max_latency = max_latency
+        self.clients = 0
+        self.batches = 0    # Forwards ejecutados (estadística)
+        self.requests = 0   # Peticiones resueltas (estadística)
+
+        self._pending = []  # (instante, tipo, estado, Future)
+        self._cond = threading.Condition()
+        self._net_lock = threading.Lock()
+        self._thread = None
+        self._closed = False
+
+    # --- CLIENTES ---
+    def register(self):
+        """Cada partida que comparte el servicio se registra (así se sabe cuándo esperan todas)."""
+        with self._cond:
+            self.clients += 1
+            self._cond.notify()
+
+    def unregister(self):
+        with self._cond:
+            self.clients = max(0, self.clients - 1)
+            self._cond.notify()
+
+    # --- PETICIONES ---
+    def q_values(self, kind, state):
+        """Q-valores (n_acciones,) de un estado para la red 'map' o 'combat'."""
+        if self.clients <= 1:
+            return self._forward(kind, np.asarray(state, dtype=np.float32)[None])[0]
+        return self.submit(kind, state).result()
+
+    def act(self, kind, state):
+        """Acción greedy (argmax de los Q-valores)."""
+        return int(np.argmax(self.q_values(kind, state)))
+
+    def submit(self, kind, state):
+        """Encola una petición y devuelve un Future con sus Q-valores."""
+        future = Future()
+        # Copia: el estado puede ser una vista de un buffer que la partida reutiliza
+        state = np.array(state, dtype=np.float32)
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="inference", daemon=True)
+                self._thread.start()
+            self._pending.append((time.perf_counter(), kind, state, future))
+            self._cond.notify()
+        return future
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+
+    # --- EVALUACIÓN ---
+    def _forward(self, kind, states):
+        agent = self.agents[kind]
+        with self._net_lock, torch.no_grad():
+            q = agent.policy_net(torch.as_tensor(states).to(agent.device))
+            return q.cpu().numpy()
+
+    def _ready(self):
+        """Hay que vaciar la cola: esperan todos los clientes o el lote está lleno."""
+        return len(self._pending) >= min(self.max_batch, max(self.clients, 1))
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed and not self._pending:
+                    return
+                deadline = self._pending[0][0] + self.max_latency
+                while not self._ready() and not self._closed:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+            self._run(batch)
+
+    def _run(self, batch):
+        for kind in self.agents:
+            requests = [r for r in batch if r[1] == kind]
+            if not requests:
+                continue
+            try:
+                q = self._forward(kind, np.stack([r[2] for r in requests]))
+            except Exception as exc:
+                for r in requests: r[3].set_exception(exc)
+                continue
+            self.batches += 1
+            self.requests += len(requests)
+            for i, r in enumerate(requests):
+                r[3].set_result(q[i])
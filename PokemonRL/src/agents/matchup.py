@@ -0,0 +1,67 @@
+import numpy as np
+from src.env.type_chart import N_TYPES, NO_TYPE, DUAL_TYPE_MATRIX
+
+# --- PUNTOS DE ENFRENTAMIENTO (mismos criterios que Strategist.build_team) ---
+# Ofensiva: por cada tipo propio, +20 si es súper eficaz contra el rival, -10 si es poco eficaz
+OFFENSE_BONUS, OFFENSE_PENALTY = 20, -10
+# Defensiva: por cada tipo rival, +25 si lo resistimos, -30 si nos hace más daño
+DEFENSE_BONUS, DEFENSE_PENALTY = 25, -30
+
+# OFFENSE[t, u1, u2]: puntos del tipo atacante t contra el par (u1, u2). La fila NO_TYPE no puntúa.
+OFFENSE = np.zeros((N_TYPES + 1, N_TYPES + 1, N_TYPES + 1), dtype=np.float32)
+OFFENSE[:N_TYPES] = np.where(DUAL_TYPE_MATRIX > 1.2, OFFENSE_BONUS,
+                             np.where(DUAL_TYPE_MATRIX < 0.8, OFFENSE_PENALTY, 0))
+# DEFENSE[u, t1, t2]: puntos de recibir el tipo u siendo (t1, t2)
+DEFENSE = np.zeros((N_TYPES + 1, N_TYPES + 1, N_TYPES + 1), dtype=np.float32)
+DEFENSE[:N_TYPES] = np.where(DUAL_TYPE_MATRIX < 1.0, DEFENSE_BONUS,
+                             np.where(DUAL_TYPE_MATRIX > 1.0, DEFENSE_PENALTY, 0))
+
+# MATCHUP[t1, t2, u1, u2]: puntuación de un Pokémon (t1, t2) contra un rival (u1, u2).
+# Un tipo suelto T como rival es el par (T, NO_TYPE), igual que en build_team.
+_defense = DEFENSE.transpose(1, 2, 0)  # [t1, t2, u]
+MATCHUP = (OFFENSE[:, None, :, :] + OFFENSE[None, :, :, :]
+           + _defense[:, :, :, None] + _defense[:, :, None, :])
+MATCHUP.flags.writeable = False
+del _defense
+
+
+def as_type_pairs(types):
+    """Normaliza rivales a un array (m, 2) de ids: acepta un id de tipo, una lista de ids o de pares."""
+    arr = np.asarray(types, dtype=np.int64)
+    if arr.ndim == 0:
+        arr = arr[None]
+    if arr.ndim == 1:
+        arr = np.stack([arr, np.full_like(arr, NO_TYPE)], axis=1)
+    return arr
+
+
+def matchup_scores(type_ids, opponents):
+    """Matriz (n, m) de puntuaciones de n Pokémon (pares de tipos) contra m rivales."""
+    t = np.asarray(type_ids, dtype=np.int64)
+    o = as_type_pairs(opponents)
+    return MATCHUP[t[:, 0, None], t[:, 1, None], o[None, :, 0], o[None, :, 1]]
+
+
+def team_scores(type_ids, opponents, levels=None):
+    """Puntuación (n,) de cada Pokémon contra todo el equipo rival (suma), más su nivel."""
+    scores = matchup_scores(type_ids, opponents).sum(axis=1)
+    if levels is not None:
+        scores = scores + np.asarray(levels, dtype=np.float32)
+    return scores
+
+
+def party_scores(party_type_ids, opponents):
+    """
+    Puntuación (P,) de P equipos (P, tamaño, 2) contra el equipo rival: cada rival
+    se enfrenta al mejor miembro del equipo y se suman los resultados.
+    """
+    t = np.asarray(party_type_ids, dtype=np.int64)
+    o = as_type_pairs(opponents)
+    scores = MATCHUP[t[..., 0, None], t[..., 1, None], o[:, 0], o[:, 1]]  # (P, tamaño, m)
+    return scores.max(axis=1).sum(axis=1)
+
+
+def top_k(scores, k=None):
+    """Índices de las k mejores puntuaciones, de mayor a menor (en empate, el primero que aparece)."""
+    order = np.argsort(-np.asarray(scores), kind='stable')
+    return order if k is None else order[:k]
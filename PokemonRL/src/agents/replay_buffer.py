@@ -0,0 +1,146 @@
+import numpy as np
+import torch
+
+
+class ReplayBuffer:
+    """
+    Memoria de experiencias con arrays preasignados (buffer circular).
+    Guardar una transición solo copia valores en huecos ya reservados;
+    sample() devuelve un minibatch como tensores listos para learn_batch.
+    """
+
+    def __init__(self, capacity, obs_shape, device="cpu"):
+        self.capacity = capacity
+        self.device = torch.device(device)
+        self.states = np.zeros((capacity,) + tuple(obs_shape), dtype=np.float32)
+        self.next_states = np.zeros((capacity,) + tuple(obs_shape), dtype=np.float32)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.dones = np.zeros(capacity, dtype=np.float32)
+
+        # Vistas torch sobre la misma memoria (sin copias)
+        self._tensors = [torch.from_numpy(a) for a in
+                         (self.states, self.actions, self.rewards, self.next_states, self.dones)]
+        self.pos = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def push(self, state, action, reward, next_state, done):
+        i = self.pos
+        self.states[i] = state
+        self.next_states[i] = next_state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.dones[i] = 1.0 if done else 0.0
+        self.pos = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        return i
+
+    def push_batch(self, states, actions, rewards, next_states, dones):
+        """Guarda N transiciones de golpe (p. ej. de los workers o de PokemonVectorEnv)."""
+        n = len(actions)
+        idx = (self.pos + np.arange(n)) % self.capacity
+        self.states[idx] = states
+        self.next_states[idx] = next_states
+        self.actions[idx] = actions
+        self.rewards[idx] = rewards
+        self.dones[idx] = dones
+        self.pos = int((self.pos + n) % self.capacity)
+        self.size = min(self.size + n, self.capacity)
+        return idx
+
+    def gather(self, idx):
+        """Transiciones de los índices dados como tensores en el dispositivo del agente."""
+        idx_t = torch.from_numpy(np.asarray(idx, dtype=np.int64))
+        return tuple(t[idx_t].to(self.device, non_blocking=True) for t in self._tensors)
+
+    def sample(self, batch_size):
+        idx = np.random.randint(0, self.size, size=batch_size)
+        return self.gather(idx)
+
+
+class SumTree:
+    """
+    Árbol de sumas guardado en un array plano: hojas = prioridades, nodos = sumas.
+    Actualizar y muestrear cuesta O(log n) y se hace para todo el lote a la vez.
+    """
+
+    def __init__(self, capacity):
+        self.n_leaves = 1
+        while self.n_leaves < capacity:
+            self.n_leaves *= 2
+        self.depth = self.n_leaves.bit_length() - 1
+        self.tree = np.zeros(2 * self.n_leaves, dtype=np.float64)
+
+    @property
+    def total(self):
+        return self.tree[1]
+
+    def leaves(self, idx):
+        return self.tree[np.asarray(idx) + self.n_leaves]
+
+    def update(self, idx, priorities):
+        nodes = np.asarray(idx, dtype=np.int64) + self.n_leaves
+        self.tree[nodes] = priorities
+        for _ in range(self.depth):
+            nodes = np.unique(nodes // 2)
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+
+    def find(self, values):
+        """Hoja cuya suma acumulada contiene cada valor (descenso vectorizado)."""
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.int64)
+        for _ in range(self.depth):
+            left = 2 * nodes
+            go_right = values > self.tree[left]
+            values -= np.where(go_right, self.tree[left], 0.0)
+            nodes = left + go_right
+        return nodes - self.n_leaves
+
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    """
+    Replay priorizado (PER): las transiciones con más error TD salen más a menudo,
+    así las recompensas raras (meta +500, victoria +100) no se pierden entre los -0.01.
+    sample() devuelve además los pesos de importancia y los índices para update_priorities().
+    """
+
+    def __init__(self, capacity, obs_shape, device="cpu", alpha=0.6, beta=0.4, beta_increment=1e-4, eps=1e-3):
+        super().__init__(capacity, obs_shape, device)
+        self.tree = SumTree(capacity)
+        self.alpha = alpha
+        self.beta = beta
+        self.beta_increment = beta_increment
+        self.eps = eps
+        self.max_priority = 1.0
+
+    def push(self, state, action, reward, next_state, done):
+        i = super().push(state, action, reward, next_state, done)
+        self.tree.update([i], self.max_priority)
+        return i
+
+    def push_batch(self, states, actions, rewards, next_states, dones):
+        idx = super().push_batch(states, actions, rewards, next_states, dones)
+        self.tree.update(idx, self.max_priority)
+        return idx
+
+    def sample(self, batch_size):
+        # Muestreo estratificado: un valor por cada tramo de la suma total
+        segment = self.tree.total / batch_size
+        values = (np.arange(batch_size) + np.random.rand(batch_size)) * segment
+        idx = np.minimum(self.tree.find(values), self.size - 1)
+
+        probs = np.maximum(self.tree.leaves(idx) / self.tree.total, 1e-12)
+        weights = (self.size * probs) ** (-self.beta)
+        weights /= weights.max()
+        self.beta = min(1.0, self.beta + self.beta_increment)
+
+        weights_t = torch.as_tensor(weights, dtype=torch.float32, device=self.device)
+        return self.gather(idx) + (weights_t, idx)
+
+    def update_priorities(self, idx, td_errors):
+        priorities = (np.abs(td_errors) + self.eps) ** self.alpha
+        self.tree.update(idx, priorities)
+        self.max_priority = max(self.max_priority, float(priorities.max()))
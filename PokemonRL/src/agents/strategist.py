@@ -1,40 +1,40 @@
+import logging
 import numpy as np
-import json
-import os
-import random
-from src.env.battle_engine import BattleEngine, EFFECTS_DB  # <--- Importamos la Lista Blanca
+from src.env.battle_engine import BattleEngine
+from src.env.move_table import (MOVES_DB, MOVES_PATH, MOVE_NAMES, MOVE_IDS, MOVE_TYPE, MOVE_POWER,
+                                MOVE_EFFECT, EFFECT_NONE)  # <--- Lista Blanca compilada en MOVE_EFFECT
+from src.env.type_chart import TYPE_IDS, NO_TYPE
+from src.env.battle_mon import BattleMon, SpeciesTable
+from src.agents.matchup import team_scores, party_scores, top_k
+from src.env.battle_sim import estimate_win_rate
+from src.utils.rng import make_rng
+from src.utils.logger import get_logger
+
+LOG = get_logger('strategist')
 
 class Strategist:
-    def __init__(self, pokedex):
+    def __init__(self, pokedex, seed=None):
         self.pokedex = pokedex
+        self.species = SpeciesTable(pokedex)  # Datos inmutables compartidos por todos los BattleMon
         self.current_party = {} 
-        self.moves_db = {}
+        # Generador propio para el relleno aleatorio de movimientos (ver src/utils/rng.py)
+        self.rng = make_rng(seed)
+        # Cachés de select_moves: learnset por especie y candidatos por (especie, banda de nivel)
+        self._learnsets = {}
+        self._candidates = {}
+        self._dex_arrays = None  # Tipos/niveles/vivos de toda la Pokédex para rank_against
         self.load_moves_db()
 
     def load_moves_db(self):
         """
-        Carga la base de datos detallada de movimientos (moves.json).
-        Busca en varias rutas para asegurar que lo encuentra.
-        """
-        posibles_rutas = [
-            'moves.json',
-            'data/moves.json',
-            '../data/moves.json',
-            os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'data', 'moves.json')
-        ]
-
-        for path in posibles_rutas:
-            if os.path.exists(path):
-                try:
-                    with open(path, 'r', encoding='utf-8') as f:
-                        self.moves_db = json.load(f)
-                    print(f"🧠 ESTRATEGA: Base de datos de movimientos cargada desde {path} ({len(self.moves_db)} ataques).")
-                    return
-                except Exception as e:
-                    print(f"⚠ Error leyendo {path}: {e}")
-
-        print("⚠ ESTRATEGA: No se encontró 'moves.json'. El sistema usará movimientos básicos.")
-        self.moves_db = {}
+        Usa la tabla de movimientos compartida (move_table), que se lee una sola vez
+        para el motor, el entorno y el Estratega.
+        """
+        self.moves_db = MOVES_DB
+        if MOVES_DB:
+            LOG.info("🧠 ESTRATEGA: Base de datos de movimientos cargada desde %s (%d ataques).", MOVES_PATH, len(MOVES_DB))
+        else:
+            LOG.warning("⚠ ESTRATEGA: No se encontró 'moves.json'. El sistema usará movimientos básicos.")
 
     def set_party(self, party_ids):
         """Define el equipo actual."""
@@ -43,144 +43,192 @@ class Strategist:
             for pid in party_ids
             if str(pid) in self.pokedex
         }
-        names = [p['name'] for p in self.current_party.values()]
-        print(f"\n🎒 ESTRATEGA: Nuevo equipo asignado: {names}")
+        if LOG.isEnabledFor(logging.INFO):
+            LOG.info("🎒 ESTRATEGA: Nuevo equipo asignado: %s", [p['name'] for p in self.current_party.values()])
 
-    def select_moves(self, pokemon, level):
+    def _learnset(self, pokemon):
         """
-        Elige 4 movimientos aplicando la LISTA BLANCA y el CAPADO POR NIVEL.
+        Datos fijos del learnset de una especie (se calculan una vez): ids en el orden
+        del JSON, su poder, qué filas son ataques de estado soportados, cuáles son
+        STAB y los poderes de daño distintos ordenados, que marcan las bandas de nivel.
+        """
+        pid = int(pokemon['id'])
+        entry = self._learnsets.get(pid)
+        if entry is None:
+            ids = np.array([MOVE_IDS[m] for m in pokemon.get('moves', []) if m in MOVES_DB], dtype=np.int64)
+            power = MOVE_POWER[ids]
+            t1, t2 = BattleEngine.get_type_ids(pokemon)
+            entry = self._learnsets[pid] = {
+                'ids': ids,
+                'power': power,
+                'status': (power == 0) & (MOVE_EFFECT[ids] != EFFECT_NONE),
+                'stab': (MOVE_TYPE[ids] == t1) | (MOVE_TYPE[ids] == t2),
+                'bands': np.unique(power[power > 0]),
+            }
+        return entry
+
+    def _move_candidates(self, pokemon, level):
         """
-        possible_moves_names = pokemon.get('moves', [])
-        valid_moves = []
-        
+        Parte determinista de select_moves para (especie, banda de nivel): los 2 mejores
+        STAB, los ataques de estado y el resto del pool. Dos niveles con el mismo límite
+        de poder efectivo caen en la misma banda y comparten la entrada.
+        None si no hay ningún movimiento válido.
+        """
+        learnset = self._learnset(pokemon)
+
         # --- 1. DEFINIR LÍMITE DE PODER POR NIVEL ---
         # Nivel 5 -> Max 55 (Placaje, Ascuas)
         # Nivel 50 -> Max 145 (Hiperrayo)
         max_power_allowed = 45 + (level * 2.0)
+        band = int(np.searchsorted(learnset['bands'], max_power_allowed, side='right'))
+        key = (int(pokemon['id']), band)
+        if key in self._candidates:
+            return self._candidates[key]
+
+        # --- 2. FILTRO DE LISTA BLANCA (WHITELIST) ---
+        # A) Es un ataque de daño válido para el nivel
+        # B) Es un ataque de estado soportado por nuestro motor
+        power = learnset['power']
+        cap = learnset['bands'][band - 1] if band else 0
+        valid = ((power > 0) & (power <= cap)) | learnset['status']
+
+        candidates = None
+        if valid.any():
+            power = power[valid]
+            valid_moves = [MOVE_NAMES[m] for m in learnset['ids'][valid]]
+
+            # --- 3. SELECCIÓN ESTRATÉGICA ---
+            # Priorizar STAB (Same Type Attack Bonus): los 2 mejores, ordenados por poder (orden estable)
+            stab_idx = np.flatnonzero(learnset['stab'][valid])
+            best = stab_idx[np.argsort(-power[stab_idx], kind='stable')[:2]]
+            chosen = [valid_moves[k] for k in best]
+
+            # El resto se rellena al azar; los de estado aparte (se intenta meter uno)
+            pool = [k for k in range(len(valid_moves)) if valid_moves[k] not in chosen]
+            status_moves = [valid_moves[k] for k in pool if power[k] == 0]
+            candidates = (chosen, status_moves, [valid_moves[k] for k in pool])
+        self._candidates[key] = candidates
+        return candidates
 
-        for move_name in possible_moves_names:
-            if move_name in self.moves_db:
-                move_data = self.moves_db[move_name]
-                power = move_data.get('power')
-                
-                if power is None: power = 0
-                
-                # --- 2. FILTRO DE LISTA BLANCA (WHITELIST) ---
-                
-                # A) Es un ataque de daño válido para el nivel
-                is_valid_damage = (power > 0 and power <= max_power_allowed)
-                
-                # B) Es un ataque de estado soportado por nuestro motor
-                is_supported_status = (power == 0 and move_name in EFFECTS_DB)
-                
-                # Solo pasa si cumple A o B
-                if is_valid_damage or is_supported_status:
-                    valid_moves.append(move_name)
+    def select_moves(self, pokemon, level):
+        """
+        Elige 4 movimientos aplicando la LISTA BLANCA y el CAPADO POR NIVEL.
+        El filtrado y la ordenación salen de la caché por (especie, banda de nivel);
+        solo el relleno aleatorio se sortea en cada llamada, con self.rng.
+        """
+        candidates = self._move_candidates(pokemon, level)
 
         # Fallback si no hay nada válido
-        if not valid_moves:
+        if candidates is None:
             return ['tackle', 'struggle']
+        stab, status_moves, pool = candidates
+        chosen = list(stab)
 
-        # --- 3. SELECCIÓN ESTRATÉGICA ---
-        # Priorizar STAB (Same Type Attack Bonus)
-        stab_moves = [m for m in valid_moves if self.moves_db[m]['type'] in pokemon['types']]
-        other_moves = [m for m in valid_moves if m not in stab_moves]
-        
-        chosen = []
-        
-        # Intentamos coger los 2 mejores de STAB (ordenados por poder)
-        if stab_moves:
-            # Ordenar por poder para coger los más fuertes disponibles
-            stab_moves.sort(key=lambda x: (self.moves_db[x].get('power') or 0), reverse=True)
-            chosen.extend(stab_moves[:2])
-        
         # Rellenamos los huecos con el resto (barajados para variedad)
         remaining_slots = 4 - len(chosen)
         if remaining_slots > 0:
-            # Quitamos los que ya elegimos del pool de otros
-            pool = [m for m in valid_moves if m not in chosen]
-            
             # Intentar meter al menos un movimiento de estado si hay hueco
-            status_moves = [m for m in pool if self.moves_db[m].get('power', 0) == 0]
-            if status_moves and remaining_slots >= 1:
-                chosen.append(random.choice(status_moves))
+            if status_moves:
+                chosen.append(status_moves[self.rng.integers(len(status_moves))])
                 remaining_slots -= 1
-                pool = [m for m in pool if m not in chosen] # Actualizar pool
+                pool = [m for m in pool if m not in chosen]  # Actualizar pool
 
             # Rellenar el resto al azar
             if pool and remaining_slots > 0:
-                chosen.extend(np.random.choice(pool, size=min(remaining_slots, len(pool)), replace=False))
+                picks = self.rng.choice(len(pool), size=min(remaining_slots, len(pool)), replace=False)
+                chosen.extend(pool[k] for k in picks)
 
-        return list(chosen)
+        return chosen
 
     def prepare_pokemon(self, pid, level):
         """
-        Prepara un Pokémon completo con stats calculados y movimientos filtrados.
+        Prepara un Pokémon completo (BattleMon) con stats calculados y movimientos filtrados.
         """
         pid = str(pid)
         if pid not in self.pokedex:
             return None
-            
-        p = self.pokedex[pid].copy()
-        
-        # Establecer Nivel
-        p['level'] = level
-        p['exp'] = 0
-        
-        # Calcular Stats
-        p['stats'] = BattleEngine.get_stats_at_level(p, level)
-        
+
+        # Stats de nivel calculados en el constructor, la especie se comparte por referencia
+        p = BattleMon(self.species.get(pid), level)
+
         # Elegir Movimientos
-        p['active_moves'] = self.select_moves(p, level)
-        
+        p['active_moves'] = self.select_moves(self.pokedex[pid], level)
+
         return p
 
+    def _pool_arrays(self, pool):
+        """Tipos (n, 2), niveles (n,) y vivos (n,) de un pool de Pokémon en forma de dicts."""
+        data = list(pool.values())
+        types = np.array([BattleEngine.get_type_ids(d) for d in data], dtype=np.int64).reshape(-1, 2)
+        levels = np.array([d.get('level', 1) for d in data], dtype=np.float32)
+        alive = np.array([d['stats'].get('hp', 0) > 0 if 'stats' in d else True for d in data], dtype=bool)
+        return data, types, levels, alive
+
+    def opponent_types(self, opponents):
+        """
+        Pares de tipos (m, 2) del rival. Acepta un tipo ('fire'), una lista de tipos
+        o una lista de ids de especie (p. ej. GYM_LEADER_TEAM_IDS).
+        """
+        if isinstance(opponents, str):
+            opponents = [opponents]
+        pairs = []
+        for o in opponents:
+            if str(o) in self.pokedex:
+                pairs.append(BattleEngine.get_type_ids(self.pokedex[str(o)]))
+            elif o in TYPE_IDS:
+                pairs.append((TYPE_IDS[o], NO_TYPE))
+        return np.array(pairs, dtype=np.int64).reshape(-1, 2)
+
+    def rank_against(self, opponents, k=None, pool=None):
+        """
+        Ranking de candidatos contra un rival (tipo, lista de tipos o equipo) en una
+        sola operación sobre la tabla MATCHUP. Por defecto el pool es el equipo actual
+        o, si no hay, toda la Pokédex. Devuelve los k mejores como [(puntuación, datos)].
+        """
+        if pool is None:
+            pool = self.current_party if self.current_party else self.pokedex
+        if pool is self.pokedex:
+            # La Pokédex no cambia: sus arrays se sacan una sola vez
+            if self._dex_arrays is None:
+                self._dex_arrays = self._pool_arrays(self.pokedex)
+            data, types, levels, alive = self._dex_arrays
+        else:
+            data, types, levels, alive = self._pool_arrays(pool)
+        opp = self.opponent_types(opponents)
+        scores = team_scores(types, opp, levels) if len(opp) else levels
+        idx = np.flatnonzero(alive)
+        return [(float(scores[i]), data[i]) for i in idx[top_k(scores[idx], k)]]
+
+    def rank_parties(self, parties, opponents, k=None):
+        """
+        Ranking de equipos candidatos (lista de listas de ids de especie, todas del mismo
+        tamaño) contra un equipo rival. Devuelve los k mejores como [(puntuación, equipo)].
+        """
+        ids = np.array([[int(pid) for pid in party] for party in parties], dtype=np.int64)
+        scores = party_scores(self.species.type_ids[ids], self.opponent_types(opponents))
+        return [(float(scores[i]), list(parties[i])) for i in top_k(scores, k)]
+
+    def win_probability(self, team, opponent, **kwargs):
+        """
+        P(victoria) de team contra opponent (BattleMon o listas de BattleMon, p. ej. de
+        prepare_pokemon) con combates simulados. Ver battle_sim.estimate_win_rate.
+        """
+        return estimate_win_rate(team, opponent, self.species, **kwargs)
+
     def build_team(self, target_type, team_size=1):
         """
         Elige el mejor Pokémon disponible para contrarrestar un tipo.
         """
-        candidates = []
         pool = self.current_party if self.current_party else self.pokedex
 
-        print(f"🧠 Estratega: Analizando opciones contra {target_type.upper()}...")
-
-        for p_id, data in pool.items():
-            # Saltar muertos
-            if 'stats' in data and data['stats'].get('hp', 0) <= 0:
-                continue
-
-            score = 0
-            
-            # 1. Ventaja Ofensiva (Tipos)
-            # Simplificación: Miramos los tipos base del Pokémon
-            for t in data['types']:
-                if t in BattleEngine.TYPE_CHART:
-                    mult = BattleEngine.TYPE_CHART[t].get(target_type, 1.0)
-                    if mult > 1.2: score += 20
-                    elif mult < 0.8: score -= 10
-            
-            # 2. Ventaja Defensiva (Resistencia)
-            if target_type in BattleEngine.TYPE_CHART:
-                chart = BattleEngine.TYPE_CHART[target_type]
-                damage_taken = 1.0
-                for my_t in data['types']:
-                    damage_taken *= chart.get(my_t, 1.0)
-                
-                if damage_taken < 1.0: score += 25 # ¡Resisto!
-                elif damage_taken > 1.0: score -= 30 # ¡Me duele!
-
-            # 3. Nivel (Fuerza bruta)
-            score += data.get('level', 1)
-
-            candidates.append((score, data))
-
-        # Ordenar por puntuación
-        candidates.sort(key=lambda x: x[0], reverse=True)
-
-        if not candidates:
+        LOG.info("🧠 Estratega: Analizando opciones contra %s...", target_type.upper())
+        # Ventaja ofensiva (tipos) + resistencia + nivel, todo el pool de una vez (ver matchup.py)
+        ranking = self.rank_against(target_type, k=1, pool=pool)
+
+        if not ranking:
             # Si todos están muertos, devolvemos el primero aunque sea cadáver (se gestionará fuera)
             return list(pool.values())[0]
 
-        best_mon = candidates[0][1]
-        print(f"🧠 Estratega: Elijo a {best_mon['name']} (Score: {candidates[0][0]:.1f})")
-        return best_mon
\ No newline at end of file
+        score, best_mon = ranking[0]
+        LOG.info("🧠 Estratega: Elijo a %s (Score: %.1f)", best_mon['name'], score)
+        return best_mon
@@ -4,15 +4,30 @@ import torch.nn as nn
 import random
 import numpy as np
 from src.models.dqn_combat import CombatDQN
+from src.agents.replay_buffer import ReplayBuffer, PrioritizedReplayBuffer
+from src.utils.logger import get_logger
+
+LOG = get_logger('agents')
 
 
 class TacticianAgent:
-    def __init__(self, input_dim, n_actions, lr=1e-3):
+    def __init__(self, input_dim, n_actions, lr=1e-3, buffer_size=20000, batch_size=64, learn_every=1, prioritized=False,
+                 target_update=500, double_dqn=False):
         self.device = torch.device(
             "cuda" if torch.cuda.is_available() else "cpu")
         self.n_actions = n_actions
 
         self.policy_net = CombatDQN(input_dim, n_actions).to(self.device)
+
+        # Red objetivo congelada (se sincroniza cada target_update pasos de aprendizaje).
+        # target_update=0 la desactiva y el objetivo sale de la propia policy_net.
+        self.target_update = target_update
+        self.double_dqn = double_dqn
+        self.learn_steps = 0
+        self.target_net = None
+        if target_update > 0:
+            self.target_net = CombatDQN(input_dim, n_actions).to(self.device)
+            self.sync_target()
         self.optimizer = optim.Adam(self.policy_net.parameters(), lr=lr)
         self.loss_fn = nn.MSELoss()
 
@@ -21,70 +36,149 @@ class TacticianAgent:
         self.epsilon_decay = 0.995
         self.gamma = 0.95
 
+        # Memoria de experiencias (minibatches en lugar de un paso por transición)
+        # prioritized=True: replay priorizado por error TD (sum-tree)
+        self.prioritized = prioritized
+        buffer_cls = PrioritizedReplayBuffer if prioritized else ReplayBuffer
+        self.memory = buffer_cls(buffer_size, (input_dim,), self.device)
+        self.batch_size = batch_size
+        self.learn_every = learn_every
+        self.steps = 0
+
     def select_action(self, state):
         if random.random() < self.epsilon:
             return random.randint(0, self.n_actions - 1)
 
         with torch.no_grad():
-            state_tensor = torch.FloatTensor(state).to(self.device)
+            state_tensor = torch.as_tensor(state, dtype=torch.float32).to(self.device)
             if state_tensor.dim() == 1:
                 state_tensor = state_tensor.unsqueeze(0)
             q_values = self.policy_net(state_tensor)
             return q_values.argmax().item()
 
+    def select_actions(self, states):
+        """Epsilon-greedy para un lote de estados (p. ej. de PokemonVectorEnv) con un solo forward."""
+        with torch.no_grad():
+            q_values = self.policy_net(torch.as_tensor(states, dtype=torch.float32).to(self.device))
+            actions = q_values.argmax(1).cpu().numpy()
+        explore = np.random.rand(len(actions)) < self.epsilon
+        actions[explore] = np.random.randint(0, self.n_actions, explore.sum())
+        return actions
+
+    def sync_target(self):
+        """Copia los pesos de la red viva a la red objetivo."""
+        self.target_net.load_state_dict(self.policy_net.state_dict())
+        self.target_net.eval()
+        for param in self.target_net.parameters():
+            param.requires_grad_(False)
+
+    def _forward(self, states, next_states):
+        """
+        Q(s) con gradiente y, si el objetivo necesita la red viva (sin red objetivo
+        o Double DQN), Q(s') sacado del mismo forward concatenando ambos lotes.
+        """
+        if self.target_net is not None and not self.double_dqn:
+            return self.policy_net(states), None
+        n = states.shape[0]
+        q_all = self.policy_net(torch.cat([states, next_states]))
+        return q_all[:n], q_all[n:].detach()
+
+    def _next_q(self, next_states, next_q_online):
+        """Valor del siguiente estado según el modo: DQN simple, red objetivo o Double DQN."""
+        if self.target_net is None:
+            return next_q_online.max(1)[0]
+        if self.double_dqn:
+            # La red viva elige la acción, la red objetivo la evalúa
+            best = next_q_online.argmax(1, keepdim=True)
+            return self.target_net(next_states).gather(1, best).squeeze(1)
+        return self.target_net(next_states).max(1)[0]
+
     def learn(self, state, action, reward, next_state, done):
+        """Paso de gradiente con una sola transición (versión clásica)."""
+        state = np.asarray(state, dtype=np.float32).reshape(1, -1)
+        next_state = np.asarray(next_state, dtype=np.float32).reshape(1, -1)
+        self.learn_batch(state, np.array([action]), np.array([reward], dtype=np.float32),
+                         next_state, np.array([1.0 if done else 0.0], dtype=np.float32))
+
+    def learn_batch(self, states, actions, rewards, next_states, dones, weights=None):
+        """
+        Un paso de gradiente sobre un minibatch (tensores o arrays).
+        weights: pesos de importancia del replay priorizado. Devuelve los errores TD.
+        """
         try:
             # 1. Preparar Tensores
-            state_t = torch.FloatTensor(state).to(self.device)
-            if state_t.dim() == 1:
-                state_t = state_t.unsqueeze(0)
-
-            next_state_t = torch.FloatTensor(next_state).to(self.device)
-            if next_state_t.dim() == 1:
-                next_state_t = next_state_t.unsqueeze(0)
+            states = torch.as_tensor(states, dtype=torch.float32, device=self.device)
+            next_states = torch.as_tensor(next_states, dtype=torch.float32, device=self.device)
+            rewards = torch.as_tensor(rewards, dtype=torch.float32, device=self.device)
+            dones = torch.as_tensor(dones, dtype=torch.float32, device=self.device)
 
             # 2. Preparar Acción (El culpable habitual)
-            action_t = torch.tensor(
-                [[action]], dtype=torch.long).to(self.device)
-
-            reward_t = torch.FloatTensor([reward]).to(self.device)
-            done_t = torch.FloatTensor([1.0 if done else 0.0]).to(self.device)
+            action_t = torch.as_tensor(actions, dtype=torch.long, device=self.device).view(-1, 1)
 
-            # 3. Calcular Q-Values
-            q_values = self.policy_net(state_t)
+            # 3. Calcular Q-Values (estado y siguiente estado en un solo forward si hace falta la red viva)
+            q_values, next_q_online = self._forward(states, next_states)
 
             # --- ZONA DE DEBUG ---
             # Si las dimensiones no coinciden, imprimimos chivatazo antes del error
             if q_values.dim() != action_t.dim():
-                print("\n" + "="*30)
-                print("🚨 --- DEBUG ERROR DETECTADO --- 🚨")
-                print(f"Input Action (raw): {action}")
-                print(
-                    f"Tensor Q_Values Shape: {q_values.shape} | Dims: {q_values.dim()}")
-                print(
-                    f"Tensor Action Shape:   {action_t.shape} | Dims: {action_t.dim()}")
-                print("La función .gather() va a fallar ahora mismo.")
-                print("="*30 + "\n")
+                LOG.error("🚨 --- DEBUG ERROR DETECTADO --- 🚨\n"
+                          "Input Action (raw): %s\n"
+                          "Tensor Q_Values Shape: %s | Dims: %s\n"
+                          "Tensor Action Shape:   %s | Dims: %s\n"
+                          "La función .gather() va a fallar ahora mismo.",
+                          actions, q_values.shape, q_values.dim(), action_t.shape, action_t.dim())
 
             # 4. Gather y Loss
             q_val = q_values.gather(1, action_t).squeeze(1)
 
             with torch.no_grad():
-                next_q_values = self.policy_net(next_state_t)
-                max_next_q = next_q_values.max(1)[0]
-                target = reward_t + (1 - done_t) * self.gamma * max_next_q
+                max_next_q = self._next_q(next_states, next_q_online)
+                target = rewards + (1 - dones) * self.gamma * max_next_q
 
-            loss = self.loss_fn(q_val, target)
+            if weights is None:
+                loss = self.loss_fn(q_val, target)
+            else:
+                loss = (weights * (q_val - target).pow(2)).mean()
 
             self.optimizer.zero_grad()
             loss.backward()
             self.optimizer.step()
 
+            self.learn_steps += 1
+            if self.target_net is not None and self.learn_steps % self.target_update == 0:
+                self.sync_target()
+            return (q_val - target).detach().cpu().numpy()
+
         except Exception as e:
             # Si falla algo más, lo atrapamos aquí
-            print(f"❌ Error crítico en learn(): {e}")
+            LOG.error("❌ Error crítico en learn(): %s", e)
             raise e  # Lanzamos el error igual para que pare el programa
 
+    def remember(self, state, action, reward, next_state, done):
+        """Guarda la transición y cada learn_every pasos aprende de un minibatch."""
+        self.memory.push(state, action, reward, next_state, done)
+        self.steps += 1
+        if self.steps % self.learn_every == 0:
+            self.replay()
+
+    def remember_batch(self, states, actions, rewards, next_states, dones):
+        """Igual que remember() para N transiciones (workers / entornos vectorizados)."""
+        self.memory.push_batch(states, actions, rewards, next_states, dones)
+        before = self.steps // self.learn_every
+        self.steps += len(actions)
+        for _ in range(self.steps // self.learn_every - before):
+            self.replay()
+
+    def replay(self):
+        if len(self.memory) < self.batch_size:
+            return
+        if self.prioritized:
+            *batch, weights, idx = self.memory.sample(self.batch_size)
+            td_errors = self.learn_batch(*batch, weights=weights)
+            self.memory.update_priorities(idx, td_errors)
+        else:
+            self.learn_batch(*self.memory.sample(self.batch_size))
+
     def decay_epsilon(self):
         if self.epsilon > self.epsilon_min:
             self.epsilon *= self.epsilon_decay
@@ -0,0 +1,181 @@
+"""
+Búsqueda del equipo de 6 contra el Líder de Gimnasio.
+
+Algoritmo genético sobre equipos: la población inicial mezcla equipos formados con
+los mejores counters por tipos (Strategist.rank_against) y equipos al azar, y cada
+equipo se puntúa jugando combates simulados por lotes (battle_sim) contra
+GYM_LEADER_TEAM_IDS. Los equipos ya evaluados se guardan en caché y las
+evaluaciones nuevas de cada generación se reparten entre procesos.
+
+    python -m src.agents.team_search --generations 30 --workers 4
+"""
+import argparse
+import multiprocessing as mp
+import zlib
+import numpy as np
+from src.agents.strategist import Strategist
+from src.env.battle_sim import team_records, simulate_battles
+from src.game_manager import GYM_LEADER_TEAM_IDS, LEVEL_GATES
+from src.utils.game_data import load_pokedex
+
+PARTY_SIZE = 6
+PARTY_LEVEL = max(LEVEL_GATES.values())  # Nivel mínimo para llegar al jefe
+GYM_LEVEL = 60                            # Nivel del equipo del Líder (GameManager.init_game)
+HP_WEIGHT = 0.1  # Peso de los PS (propios que quedan - rivales que quedan) para desempatar
+
+
+def party_key(party):
+    """Clave canónica de un equipo (el orden no cambia la caché)."""
+    return tuple(sorted(str(pid) for pid in party))
+
+
+class PartyEvaluator:
+    """
+    Fitness de un equipo: victorias en n_battles combates simulados contra el rival,
+    más HP_WEIGHT x (PS propios que quedan - PS rivales que quedan) para desempatar.
+    Los movimientos y los combates de cada equipo salen de una semilla derivada de su
+    clave, así la fitness no depende del proceso ni del orden en que se evalúe.
+    """
+
+    def __init__(self, opponent_ids=GYM_LEADER_TEAM_IDS, level=PARTY_LEVEL, opponent_level=GYM_LEVEL,
+                 n_battles=64, seed=0, pokedex=None):
+        self.strategist = Strategist(load_pokedex() if pokedex is None else pokedex, seed=seed)
+        self.level = level
+        self.n_battles = n_battles
+        self.seed = seed
+        self.opponent = team_records(self.strategist, opponent_ids, opponent_level)
+
+    def __call__(self, party):
+        seed = zlib.crc32(','.join(party_key(party)).encode()) ^ self.seed
+        self.strategist.rng = np.random.default_rng(seed)
+        team = team_records(self.strategist, party, self.level)
+        result = simulate_battles(team, self.opponent, self.strategist.species,
+                                  n_battles=self.n_battles, rng=np.random.default_rng(seed))
+        return float(result['won'].mean() + HP_WEIGHT * (result['hp_a'] - result['hp_b']).mean())
+
+
+# Evaluador de cada proceso del pool (se crea una vez en _init_worker)
+_evaluator = None
+
+
+def _init_worker(kwargs):
+    global _evaluator
+    _evaluator = PartyEvaluator(**kwargs)
+
+
+def _evaluate(party):
+    return _evaluator(party)
+
+
+class TeamSearch:
+    """
+    Algoritmo genético sobre equipos de PARTY_SIZE especies distintas.
+    run() devuelve (mejor equipo, fitness); self.cache guarda la fitness de todo lo evaluado.
+    """
+
+    def __init__(self, opponent_ids=GYM_LEADER_TEAM_IDS, level=PARTY_LEVEL, opponent_level=GYM_LEVEL,
+                 population=32, elite=4, mutation=0.2, n_battles=64, workers=0, seed=0):
+        self.opponent_ids = list(opponent_ids)
+        self.population = population
+        self.elite = elite
+        self.mutation = mutation
+        self.workers = workers
+        self.rng = np.random.default_rng(seed)
+        self.cache = {}
+
+        eval_args = dict(opponent_ids=self.opponent_ids, level=level, opponent_level=opponent_level,
+                         n_battles=n_battles, seed=seed)
+        self.evaluator = PartyEvaluator(**eval_args)
+        self.species_ids = list(self.evaluator.strategist.pokedex)
+        self.pool = (mp.get_context("spawn").Pool(workers, initializer=_init_worker, initargs=(eval_args,))
+                     if workers > 0 else None)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    def evaluate(self, parties):
+        """Fitness de cada equipo; solo se simulan los que no están en la caché."""
+        keys = [party_key(p) for p in parties]
+        new = list(dict.fromkeys(k for k in keys if k not in self.cache))
+        if new:
+            if self.pool is not None:
+                scores = self.pool.map(_evaluate, new, chunksize=max(1, len(new) // (4 * self.workers)))
+            else:
+                scores = [self.evaluator(k) for k in new]
+            self.cache.update(zip(new, scores))
+        return np.array([self.cache[k] for k in keys])
+
+    def random_party(self, candidates=None):
+        candidates = self.species_ids if candidates is None else candidates
+        return [str(pid) for pid in self.rng.choice(candidates, PARTY_SIZE, replace=False)]
+
+    def initial_population(self):
+        """Mitad equipos de los mejores counters por tipos, mitad al azar."""
+        ranking = self.evaluator.strategist.rank_against(self.opponent_ids, k=4 * PARTY_SIZE,
+                                                         pool=self.evaluator.strategist.pokedex)
+        counters = [str(data['id']) for _, data in ranking]
+        half = self.population // 2
+        return ([self.random_party(counters) for _ in range(half)] +
+                [self.random_party() for _ in range(self.population - half)])
+
+    def _tournament(self, population, fitness, size=3):
+        idx = self.rng.choice(len(population), size, replace=False)
+        return population[idx[np.argmax(fitness[idx])]]
+
+    def _child(self, population, fitness):
+        """Cruce (especies de ambos padres) + mutación (cambiar un miembro por otra especie)."""
+        genes = list(dict.fromkeys(self._tournament(population, fitness) + self._tournament(population, fitness)))
+        child = [str(pid) for pid in self.rng.choice(genes, PARTY_SIZE, replace=False)]
+        for i in range(PARTY_SIZE):
+            if self.rng.random() < self.mutation:
+                child[i] = str(self.rng.choice([s for s in self.species_ids if s not in child]))
+        return child
+
+    def run(self, generations=30, seed_parties=(), verbose=True):
+        population = [list(map(str, p)) for p in seed_parties] + self.initial_population()
+        population = population[:self.population]
+        fitness = self.evaluate(population)
+
+        for gen in range(generations):
+            order = np.argsort(-fitness, kind='stable')
+            population = [population[i] for i in order]
+            fitness = fitness[order]
+            if verbose:
+                print(f"🧬 Generación {gen + 1}/{generations} | Mejor: {fitness[0]:.3f} | "
+                      f"Media: {fitness.mean():.3f} | Evaluados: {len(self.cache)} | "
+                      f"Equipo: {population[0]}")
+
+            # Élite + hijos nuevos (sin repetir equipos)
+            next_pop = population[:self.elite]
+            seen = {party_key(p) for p in next_pop}
+            while len(next_pop) < self.population:
+                child = self._child(population, fitness)
+                if party_key(child) not in seen:
+                    seen.add(party_key(child))
+                    next_pop.append(child)
+            population = next_pop
+            fitness = self.evaluate(population)
+
+        best = int(np.argmax(fitness))
+        return population[best], float(fitness[best])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Busca el mejor equipo contra el Líder de Gimnasio.")
+    parser.add_argument("--generations", type=int, default=30)
+    parser.add_argument("--population", type=int, default=32)
+    parser.add_argument("--battles", type=int, default=64, help="combates simulados por equipo")
+    parser.add_argument("--workers", type=int, default=0, help="procesos de evaluación (0 = en este proceso)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    search = TeamSearch(population=args.population, n_battles=args.battles, workers=args.workers, seed=args.seed)
+    try:
+        party, score = search.run(args.generations)
+    finally:
+        search.close()
+    names = [search.evaluator.strategist.pokedex[pid]['name'] for pid in party]
+    print(f"\n🏆 Mejor equipo (fitness {score:.3f}): {party} {names}")
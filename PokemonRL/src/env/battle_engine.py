@@ -1,79 +1,45 @@
 import numpy as np
-import json
-import os
 import random
+from src.env.type_chart import TYPE_CHART, NO_TYPE, DUAL_TYPE_MATRIX, type_ids
+# La tabla de movimientos vive en move_table (MOVES_DB, EFFECTS_DB, MOVE_IDS... se reexportan desde aquí)
+from src.env.move_table import (MOVES_DB, STRUGGLE, STRUGGLE_ID, EFFECTS_DB, MOVE_NAMES, MOVE_IDS,
+                                MOVE_TYPE, MOVE_POWER, MOVE_SPECIAL, MOVE_PHYSICAL, MOVE_ROWS,
+                                CLASS_SPECIAL, CLASS_PHYSICAL,
+                                move_ids)
 
-# Intentar cargar moves.json
-try:
-    # Ajusta la ruta según tu estructura de carpetas
-    base_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    path = os.path.join(base_path, 'data', 'moves.json')
-    with open(path, 'r') as f:
-        MOVES_DB = json.load(f)
-except:
-    MOVES_DB = {}
-
-STRUGGLE = {"type": "normal", "power": 50, "accuracy": 100, "class": "physical"}
-
-# --- LISTA BLANCA DE EFECTOS SOPORTADOS ---
-# Solo los movimientos que estén aquí O tengan daño > 0 serán usados.
-EFFECTS_DB = {
-    # BUFFS (Usuario)
-    'swords-dance': {'target': 'self', 'stat': 'attack', 'stage': 2, 'msg': '¡Subió mucho su ATAQUE!'},
-    'growth':       {'target': 'self', 'stat': 'special-attack', 'stage': 1, 'msg': '¡Subió su AT. ESP!'},
-    'defense-curl': {'target': 'self', 'stat': 'defense', 'stage': 1, 'msg': '¡Subió su DEFENSA!'},
-    'hardening':    {'target': 'self', 'stat': 'defense', 'stage': 1, 'msg': '¡Subió su DEFENSA!'},
-    'agility':      {'target': 'self', 'stat': 'speed', 'stage': 2, 'msg': '¡Subió mucho su VELOCIDAD!'},
-    'recover':      {'target': 'self', 'heal': 0.5, 'msg': '¡Recuperó salud!'},
-    'soft-boiled':  {'target': 'self', 'heal': 0.5, 'msg': '¡Recuperó salud!'},
-    'protect':      {'target': 'self', 'special': 'protect', 'msg': '¡Se protegió!'},
-    'focus-energy': {'target': 'self', 'special': 'crit', 'msg': '¡Se está concentrando!'},
-
-    # DEBUFFS (Rival)
-    'growl':        {'target': 'enemy', 'stat': 'attack', 'stage': -1, 'msg': '¡Bajó el ATAQUE del rival!'},
-    'tail-whip':    {'target': 'enemy', 'stat': 'defense', 'stage': -1, 'msg': '¡Bajó la DEFENSA del rival!'},
-    'leer':         {'target': 'enemy', 'stat': 'defense', 'stage': -1, 'msg': '¡Bajó la DEFENSA del rival!'},
-    'screech':      {'target': 'enemy', 'stat': 'defense', 'stage': -2, 'msg': '¡Bajó mucho la DEFENSA rival!'},
-    'sand-attack':  {'target': 'enemy', 'stat': 'accuracy', 'stage': -1, 'msg': '¡Bajó la PRECISIÓN rival!'},
-    'string-shot':  {'target': 'enemy', 'stat': 'speed', 'stage': -1, 'msg': '¡Bajó la VELOCIDAD rival!'},
-    'smokescreen':  {'target': 'enemy', 'stat': 'accuracy', 'stage': -1, 'msg': '¡Bajó la PRECISIÓN rival!'},
-
-    # ESTADOS ALTERADOS
-    'thunder-wave': {'target': 'enemy', 'status': 'PAR', 'msg': '¡El rival está paralizado!'},
-    'glare':        {'target': 'enemy', 'status': 'PAR', 'msg': '¡El rival está paralizado!'},
-    'stun-spore':   {'target': 'enemy', 'status': 'PAR', 'msg': '¡El rival está paralizado!'},
-    'toxic':        {'target': 'enemy', 'status': 'PSN', 'msg': '¡El rival está gravemente envenenado!'},
-    'poison-powder':{'target': 'enemy', 'status': 'PSN', 'msg': '¡El rival está envenenado!'},
-    'poison-gas':   {'target': 'enemy', 'status': 'PSN', 'msg': '¡El rival está envenenado!'},
-    'hypnosis':     {'target': 'enemy', 'status': 'SLP', 'msg': '¡El rival se durmió!'},
-    'sleep-powder': {'target': 'enemy', 'status': 'SLP', 'msg': '¡El rival se durmió!'},
-    'sing':         {'target': 'enemy', 'status': 'SLP', 'msg': '¡El rival se durmió!'},
-    'will-o-wisp':  {'target': 'enemy', 'status': 'BRN', 'msg': '¡El rival se quemó!'},
-    'confuse-ray':  {'target': 'enemy', 'special': 'confuse', 'msg': '¡El rival está confuso!'},
-    'supersonic':   {'target': 'enemy', 'special': 'confuse', 'msg': '¡El rival está confuso!'},
+XP_PER_LEVEL = 500 # XP Turbo: experiencia por nivel del rival derrotado
+
+
+# --- CÓDIGOS PARA EL MOTOR VECTORIZADO ---
+# Estados alterados como enteros (0 = sano)
+STATUS_NAMES = [None, 'SLP', 'PAR', 'FRZ', 'BRN', 'PSN']
+STATUS_CODES = {name: code for code, name in enumerate(STATUS_NAMES)}
+
+# Mensajes que devuelve calculate_damage_batch en lugar de strings
+MSG_NONE = 0
+MSG_EFFECTIVE = 1
+MSG_NOT_EFFECTIVE = 2
+MSG_ASLEEP = 3
+MSG_WOKE_UP = 4
+MSG_PARALYZED = 5
+MSG_FROZEN = 6
+MSG_PROTECTED = 7
+MSG_EFFECT = 8  # Movimiento de estado: el efecto lo aplica el llamador con apply_effect
+
+MSG_TEXTS = {
+    MSG_NONE: "",
+    MSG_EFFECTIVE: "(Eficaz!)",
+    MSG_NOT_EFFECTIVE: "(No eficaz)",
+    MSG_ASLEEP: "{name} duerme.",
+    MSG_WOKE_UP: "¡{name} despertó!",
+    MSG_PARALYZED: "{name} está paralizado.",
+    MSG_FROZEN: "{name} está congelado.",
+    MSG_PROTECTED: "¡{name} se protegió!",
+    MSG_EFFECT: "",
 }
 
 class BattleEngine:
-    TYPE_CHART = {
-        'normal': {'rock': 0.5, 'ghost': 0, 'steel': 0.5},
-        'fire': {'fire': 0.5, 'water': 0.5, 'grass': 2.0, 'ice': 2.0, 'bug': 2.0, 'rock': 0.5, 'dragon': 0.5, 'steel': 2.0},
-        'water': {'fire': 2.0, 'water': 0.5, 'grass': 0.5, 'ground': 2.0, 'rock': 2.0, 'dragon': 0.5},
-        'electric': {'water': 2.0, 'electric': 0.5, 'grass': 0.5, 'ground': 0, 'flying': 2.0, 'dragon': 0.5},
-        'grass': {'fire': 0.5, 'water': 2.0, 'grass': 0.5, 'poison': 0.5, 'ground': 2.0, 'flying': 0.5, 'bug': 0.5, 'rock': 2.0, 'dragon': 0.5, 'steel': 0.5},
-        'ice': {'fire': 0.5, 'water': 0.5, 'grass': 2.0, 'ice': 0.5, 'ground': 2.0, 'flying': 2.0, 'dragon': 2.0, 'steel': 0.5},
-        'fighting': {'normal': 2.0, 'ice': 2.0, 'poison': 0.5, 'flying': 0.5, 'psychic': 0.5, 'bug': 0.5, 'rock': 2.0, 'ghost': 0, 'dark': 2.0, 'steel': 2.0, 'fairy': 0.5},
-        'poison': {'grass': 2.0, 'poison': 0.5, 'ground': 0.5, 'rock': 0.5, 'ghost': 0.5, 'steel': 0, 'fairy': 2.0},
-        'ground': {'fire': 2.0, 'electric': 2.0, 'grass': 0.5, 'poison': 2.0, 'flying': 0, 'bug': 0.5, 'rock': 2.0, 'steel': 2.0},
-        'flying': {'electric': 0.5, 'grass': 2.0, 'fighting': 2.0, 'bug': 2.0, 'rock': 0.5, 'steel': 0.5},
-        'psychic': {'fighting': 2.0, 'poison': 2.0, 'psychic': 0.5, 'dark': 0, 'steel': 0.5},
-        'bug': {'fire': 0.5, 'grass': 2.0, 'fighting': 0.5, 'poison': 2.0, 'flying': 0.5, 'psychic': 2.0, 'ghost': 0.5, 'dark': 2.0, 'steel': 0.5, 'fairy': 0.5},
-        'rock': {'fire': 2.0, 'ice': 2.0, 'fighting': 0.5, 'ground': 0.5, 'flying': 2.0, 'bug': 2.0, 'steel': 0.5},
-        'ghost': {'normal': 0, 'psychic': 2.0, 'ghost': 2.0, 'dark': 0.5},
-        'dragon': {'dragon': 2.0, 'steel': 0.5, 'fairy': 0},
-        'dark': {'fighting': 0.5, 'psychic': 2.0, 'ghost': 2.0, 'dark': 0.5, 'fairy': 0.5},
-        'steel': {'fire': 0.5, 'water': 0.5, 'electric': 0.5, 'ice': 2.0, 'rock': 2.0, 'steel': 0.5, 'fairy': 2.0},
-        'fairy': {'fire': 0.5, 'fighting': 2.0, 'poison': 0.5, 'dragon': 2.0, 'dark': 2.0, 'steel': 0.5}
-    }
+    TYPE_CHART = TYPE_CHART
 
     @staticmethod
     def get_moves_for_level(pokemon, level):
@@ -82,27 +48,30 @@ class BattleEngine:
         return ['tackle']
 
     @staticmethod
-    def calculate_damage(attacker, defender, move_name):
-        move = MOVES_DB.get(move_name, STRUGGLE)
+    def calculate_damage(attacker, defender, move_name, rng=None):
+        # rng: lo que tenga random() y uniform() (RandomStream del entorno); por defecto el módulo random
+        rng = random if rng is None else rng
+        # Columnas de la tabla de movimientos (los desconocidos son STRUGGLE)
+        m_type, power, move_class = MOVE_ROWS[MOVE_IDS.get(move_name, STRUGGLE_ID)]
         
         # 1. ESTADOS QUE IMPIDEN MOVERSE
         status = attacker.get('status_condition')
         if status == 'SLP':
-            if random.random() < 0.6: return 0, f"{attacker['name']} duerme."
+            if rng.random() < 0.6: return 0, f"{attacker['name']} duerme."
             else: attacker['status_condition'] = None; return 0, f"¡{attacker['name']} despertó!"
-        if status == 'PAR' and random.random() < 0.25:
+        if status == 'PAR' and rng.random() < 0.25:
             return 0, f"{attacker['name']} está paralizado."
-        if status == 'FRZ' and random.random() < 0.8:
+        if status == 'FRZ' and rng.random() < 0.8:
             return 0, f"{attacker['name']} está congelado."
 
         # 2. PROTECCIÓN
-        if defender.get('is_protected', False) and move.get('power', 0) > 0:
+        if defender.get('is_protected', False) and power > 0:
             defender['is_protected'] = False
             return 0, f"¡{defender['name']} se protegió!"
         defender['is_protected'] = False 
 
         # 3. APLICAR EFECTO (Si no tiene daño)
-        if move.get('power', 0) == 0:
+        if power == 0:
             return BattleEngine.apply_effect(attacker, defender, move_name)
 
         # 4. CÁLCULO DE DAÑO
@@ -119,28 +88,24 @@ class BattleEngine:
         att_stat = attacker['stats'].get('attack', 10) * atk_mult
         def_stat = defender['stats'].get('defense', 10) * def_mult
         
-        if move.get('class') == 'special':
+        if move_class == CLASS_SPECIAL:
             # Simplificación: Usamos special-attack sin stages por ahora
             att_stat = attacker['stats'].get('special-attack', 10) 
             def_stat = defender['stats'].get('special-defense', 10)
 
-        stab = 1.5 if move['type'] in attacker['types'] else 1.0
-        
-        multiplier = 1.0
-        for dt in defender['types']:
-            m_type = move['type']
-            dt_name = dt.lower()
-            if m_type in BattleEngine.TYPE_CHART and dt_name in BattleEngine.TYPE_CHART[m_type]:
-                multiplier *= BattleEngine.TYPE_CHART[m_type][dt_name]
+        stab = 1.5 if m_type in BattleEngine.get_type_ids(attacker) else 1.0
+
+        t1, t2 = BattleEngine.get_type_ids(defender)
+        multiplier = float(DUAL_TYPE_MATRIX[m_type, t1, t2]) if m_type != NO_TYPE else 1.0
         
-        critical = 1.5 if random.random() < 0.06 else 1.0
-        random_factor = random.uniform(0.85, 1.0)
+        critical = 1.5 if rng.random() < 0.06 else 1.0
+        random_factor = rng.uniform(0.85, 1.0)
 
-        damage = (((2 * level / 5 + 2) * move.get('power', 40) * (att_stat / def_stat)) / 50 + 2)
+        damage = (((2 * level / 5 + 2) * power * (att_stat / def_stat)) / 50 + 2)
         damage *= stab * multiplier * critical * random_factor
         
         # Estado Quemado reduce ataque físico a la mitad
-        if attacker.get('status_condition') == 'BRN' and move.get('class') == 'physical':
+        if attacker.get('status_condition') == 'BRN' and move_class == CLASS_PHYSICAL:
             damage *= 0.5
 
         msg = ""
@@ -149,6 +114,128 @@ class BattleEngine:
         
         return int(max(1, damage)), msg
 
+    @staticmethod
+    def get_type_ids(pokemon):
+        """Par (tipo1, tipo2) de ids enteros; usa el precalculado 'type_ids' si existe."""
+        ids = pokemon.get('type_ids')
+        if ids is None:
+            ids = type_ids(pokemon['types'])
+        return ids
+
+    @staticmethod
+    def to_columns(pokemons):
+        """
+        Convierte una lista de Pokémon (dicts) en columnas NumPy para calculate_damage_batch.
+        Cada fila es un Pokémon; las columnas son arrays de la misma longitud.
+        """
+        n = len(pokemons)
+        cols = {
+            'level': np.empty(n, dtype=np.int16),
+            'attack': np.empty(n, dtype=np.float32),
+            'defense': np.empty(n, dtype=np.float32),
+            'special-attack': np.empty(n, dtype=np.float32),
+            'special-defense': np.empty(n, dtype=np.float32),
+            'type1': np.empty(n, dtype=np.int8),
+            'type2': np.empty(n, dtype=np.int8),
+            'status': np.empty(n, dtype=np.int8),
+            'stage_attack': np.empty(n, dtype=np.int8),
+            'stage_defense': np.empty(n, dtype=np.int8),
+            'protected': np.empty(n, dtype=bool),
+        }
+        for i, p in enumerate(pokemons):
+            stats = p['stats']
+            mods = p.get('modifiers', {})
+            t1, t2 = BattleEngine.get_type_ids(p)
+            cols['level'][i] = p.get('level', 5)
+            cols['attack'][i] = stats.get('attack', 10)
+            cols['defense'][i] = stats.get('defense', 10)
+            cols['special-attack'][i] = stats.get('special-attack', 10)
+            cols['special-defense'][i] = stats.get('special-defense', 10)
+            cols['type1'][i] = t1
+            cols['type2'][i] = t2
+            cols['status'][i] = STATUS_CODES.get(p.get('status_condition'), 0)
+            cols['stage_attack'][i] = mods.get('attack', 0)
+            cols['stage_defense'][i] = mods.get('defense', 0)
+            cols['protected'][i] = p.get('is_protected', False)
+        return cols
+
+    @staticmethod
+    def move_ids(move_names):
+        """Traduce nombres de movimientos a ids enteros (los desconocidos pasan a STRUGGLE)."""
+        return move_ids(move_names)
+
+    @staticmethod
+    def calculate_damage_batch(attackers, defenders, move_ids, rng):
+        """
+        Versión vectorizada de calculate_damage: resuelve N ataques en una sola pasada.
+        attackers / defenders: columnas de to_columns (fila i ataca a fila i).
+        move_ids: array de ids de movimiento. rng: np.random.Generator.
+        Devuelve (daño int32[N], códigos MSG_* int8[N]).
+        Igual que la versión escalar, actualiza en sitio el estado del atacante
+        (despertar) y el flag 'protected' del defensor. Las filas con MSG_EFFECT
+        son movimientos de estado: el efecto se aplica fuera con apply_effect.
+        """
+        move_ids = np.asarray(move_ids)
+        n = move_ids.shape[0]
+        damage = np.zeros(n, dtype=np.int32)
+        msg = np.full(n, MSG_NONE, dtype=np.int8)
+        r_status, r_crit, r_roll = rng.random((3, n))
+
+        # 1. ESTADOS QUE IMPIDEN MOVERSE
+        status = attackers['status']
+        asleep = status == STATUS_CODES['SLP']
+        still_asleep = asleep & (r_status < 0.6)
+        woke_up = asleep & ~still_asleep
+        paralyzed = (status == STATUS_CODES['PAR']) & (r_status < 0.25)
+        frozen = (status == STATUS_CODES['FRZ']) & (r_status < 0.8)
+        msg[still_asleep] = MSG_ASLEEP
+        msg[woke_up] = MSG_WOKE_UP
+        msg[paralyzed] = MSG_PARALYZED
+        msg[frozen] = MSG_FROZEN
+        status[woke_up] = 0
+        acts = ~(asleep | paralyzed | frozen)
+
+        # 2. PROTECCIÓN
+        power = MOVE_POWER[move_ids]
+        blocked = acts & defenders['protected'] & (power > 0)
+        msg[blocked] = MSG_PROTECTED
+        defenders['protected'][acts] = False
+
+        # 3. EFECTOS (sin daño)
+        msg[acts & ~blocked & (power == 0)] = MSG_EFFECT
+        hit = acts & ~blocked & (power > 0)
+
+        # 4. CÁLCULO DE DAÑO
+        atk_st = attackers['stage_attack'].astype(np.float32)
+        def_st = defenders['stage_defense'].astype(np.float32)
+        atk_mult = np.where(atk_st >= 0, (2 + atk_st) / 2, 2 / (2 + np.abs(atk_st)))
+        def_mult = np.where(def_st >= 0, (2 + def_st) / 2, 2 / (2 + np.abs(def_st)))
+
+        special = MOVE_SPECIAL[move_ids]
+        att_stat = np.where(special, attackers['special-attack'], attackers['attack'] * atk_mult)
+        def_stat = np.where(special, defenders['special-defense'], defenders['defense'] * def_mult)
+
+        m_type = MOVE_TYPE[move_ids]
+        stab = np.where((m_type == attackers['type1']) | (m_type == attackers['type2']), 1.5, 1.0)
+
+        multiplier = DUAL_TYPE_MATRIX[m_type, defenders['type1'], defenders['type2']]
+
+        critical = np.where(r_crit < 0.06, 1.5, 1.0)
+        random_factor = 0.85 + 0.15 * r_roll
+
+        level = attackers['level'].astype(np.float32)
+        dmg = ((2 * level / 5 + 2) * power * (att_stat / def_stat)) / 50 + 2
+        dmg *= stab * multiplier * critical * random_factor
+
+        # Estado Quemado reduce ataque físico a la mitad
+        burned = (status == STATUS_CODES['BRN']) & MOVE_PHYSICAL[move_ids]
+        dmg = np.where(burned, dmg * 0.5, dmg)
+
+        damage[hit] = np.maximum(1, dmg[hit]).astype(np.int32)
+        msg[hit & (multiplier > 1.2)] = MSG_EFFECTIVE
+        msg[hit & (multiplier < 0.8)] = MSG_NOT_EFFECTIVE
+        return damage, msg
+
     @staticmethod
     def apply_effect(attacker, defender, move_name):
         if move_name not in EFFECTS_DB:
@@ -161,7 +248,7 @@ class BattleEngine:
         if 'modifiers' not in target: target['modifiers'] = {}
         
         if 'heal' in effect:
-            max_hp = BattleEngine.get_stats_at_level(target, target['level'])['hp']
+            max_hp = BattleEngine.get_max_hp(target)
             heal = int(max_hp * effect['heal'])
             target['stats']['hp'] = min(max_hp, target['stats']['hp'] + heal)
             return 0, f"¡Recuperó {heal} PS!"
@@ -187,6 +274,10 @@ class BattleEngine:
 
     @staticmethod
     def get_stats_at_level(pokemon, level):
+        # Un BattleMon consulta la tabla de su especie: sus 'stats' ya son de nivel,
+        # no stats base, así que la fórmula no se le puede aplicar
+        if hasattr(pokemon, 'stats_at_level'):
+            return pokemon.stats_at_level(level)
         stats = {}
         for s, val in pokemon['stats'].items():
             # Fórmula aproximada
@@ -196,9 +287,19 @@ class BattleEngine:
                 stats[s] = int((val * 2 * level) / 100 + 5)
         return stats
 
+    @staticmethod
+    def get_max_hp(pokemon):
+        if hasattr(pokemon, 'max_hp'):
+            return pokemon.max_hp
+        return BattleEngine.get_stats_at_level(pokemon, pokemon['level'])['hp']
+
+    @staticmethod
+    def get_exp_reward(loser):
+        return loser.get('level', 5) * XP_PER_LEVEL
+
     @staticmethod
     def gain_experience(winner, loser_level):
-        xp_gain = loser_level * 500 # XP Turbo
+        xp_gain = loser_level * XP_PER_LEVEL
         winner['exp'] = winner.get('exp', 0) + xp_gain
         
         leveled_up = False
@@ -213,4 +314,4 @@ class BattleEngine:
             winner['status_condition'] = None # Curar estado al subir nivel
             winner['modifiers'] = {}
             
-        return xp_gain, leveled_up, old_stats
\ No newline at end of file
+        return xp_gain, leveled_up, old_stats
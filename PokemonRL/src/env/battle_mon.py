@@ -0,0 +1,288 @@
+import numpy as np
+from src.env.battle_engine import STATUS_NAMES, STATUS_CODES
+from src.env.move_table import MOVE_NAMES, MOVE_IDS, STRUGGLE_ID
+from src.env.type_chart import NO_TYPE, type_ids
+
+# Orden fijo de los vectores de stats y de modificadores
+STAT_NAMES = ['hp', 'attack', 'defense', 'special-attack', 'special-defense', 'speed']
+STAT_IDX = {name: i for i, name in enumerate(STAT_NAMES)}
+STAGE_NAMES = ['attack', 'defense', 'special-attack', 'special-defense', 'speed', 'accuracy', 'evasion']
+STAGE_IDX = {name: i for i, name in enumerate(STAGE_NAMES)}
+MAX_MOVES = 4
+MAX_LEVEL = 100
+LEVELS = np.arange(MAX_LEVEL + 1)
+
+# Registro compacto (36 bytes) para guardar millones de Pokémon en un solo array
+BATTLE_MON_DTYPE = np.dtype([
+    ('species', np.uint16),
+    ('level', np.uint8),
+    ('status', np.uint8),
+    ('exp', np.uint32),
+    ('stats', np.int16, (len(STAT_NAMES),)),   # stats[0] = PS actuales
+    ('moves', np.int16, (MAX_MOVES,)),         # ids de movimiento, -1 = hueco
+    ('stages', np.int8, (len(STAGE_NAMES),)),
+    ('protected', np.bool_),
+])
+
+
+def level_stats(base_stats, level):
+    """Stats a un nivel dado (misma fórmula que BattleEngine.get_stats_at_level). Acepta arrays."""
+    base = np.asarray(base_stats, dtype=np.int32)
+    level = np.asarray(level)
+    stats = (base * 2 * level[..., None]) // 100 + 5
+    stats[..., 0] += level + 5  # PS: + nivel + 10
+    return stats
+
+
+class Species:
+    """Datos inmutables de una especie. Se comparten por referencia entre todos sus BattleMon."""
+    __slots__ = ('id', 'name', 'types', 'type_ids', 'base_stats', 'level_stats', 'move_ids', 'sprite')
+
+    def __init__(self, data, arrays=None):
+        self.id = int(data['id'])
+        self.name = data['name']
+        self.types = list(data['types'])
+        self.type_ids = data.get('type_ids') or type_ids(self.types)
+        self.sprite = data.get('sprite')
+        if arrays is not None:
+            # Vistas ya compiladas (p. ej. filas de la caché mapeada en memoria)
+            self.base_stats, self.level_stats, self.move_ids = arrays
+            return
+        self.base_stats = np.array([data['stats'].get(s, 0) for s in STAT_NAMES], dtype=np.int16)
+        # Stats a cada nivel 0..MAX_LEVEL: level_stats[nivel] es una consulta, no un cálculo
+        self.level_stats = level_stats(self.base_stats, LEVELS).astype(np.int16)
+        self.move_ids = np.array([MOVE_IDS[m] for m in data.get('moves', []) if m in MOVE_IDS], dtype=np.int16)
+        self.base_stats.flags.writeable = False
+        self.level_stats.flags.writeable = False
+        self.move_ids.flags.writeable = False
+
+    def stats_at(self, level):
+        """Vector de stats (6,) a un nivel (por encima de MAX_LEVEL se queda en MAX_LEVEL)."""
+        return self.level_stats[min(level, MAX_LEVEL)]
+
+
+class SpeciesTable:
+    """
+    Todas las especies de la Pokédex indexadas por id entero, con la tabla
+    level_stats (n_especies x MAX_LEVEL + 1 x 6) calculada una sola vez.
+
+    Si la Pokédex viene de la caché binaria (PokedexView), las tablas son los
+    arrays mapeados en memoria del fichero, compartidos entre procesos, y cada
+    Species se crea la primera vez que se pide.
+    """
+
+    def __init__(self, pokedex):
+        self.pokedex = pokedex
+        tables = getattr(pokedex, 'tables', None)
+        if tables:
+            self.base_stats = tables['base_stats']
+            self.type_ids = tables['type_ids']
+            self.level_stats = tables['level_stats']
+            self._move_offsets = tables['move_offsets'].tolist()
+            self._move_ids = tables['move_ids']
+            self.species = [None] * len(self.base_stats)
+            return
+        self._move_ids = None
+        n = max((int(k) for k in pokedex), default=0) + 1
+        self.species = [None] * n
+        self.base_stats = np.zeros((n, len(STAT_NAMES)), dtype=np.int16)
+        self.type_ids = np.full((n, 2), NO_TYPE, dtype=np.int8)
+        self.level_stats = np.zeros((n, MAX_LEVEL + 1, len(STAT_NAMES)), dtype=np.int16)
+        for key, data in pokedex.items():
+            sp = Species(data)
+            self.species[int(key)] = sp
+            self.base_stats[sp.id] = sp.base_stats
+            self.type_ids[sp.id] = sp.type_ids
+            self.level_stats[sp.id] = sp.level_stats
+        self.level_stats.flags.writeable = False
+
+    def get(self, pid):
+        pid = int(pid)
+        if not 0 <= pid < len(self.species):
+            return None
+        sp = self.species[pid]
+        if sp is None and self._move_ids is not None and str(pid) in self.pokedex:
+            start, end = self._move_offsets[pid], self._move_offsets[pid + 1]
+            sp = self.species[pid] = Species(self.pokedex[str(pid)], arrays=(
+                self.base_stats[pid], self.level_stats[pid], self._move_ids[start:end]))
+        return sp
+
+    def stats_at(self, pid, level):
+        """Stats (6,) de la especie pid a un nivel. Acepta arrays de ids y niveles."""
+        return self.level_stats[pid, np.minimum(level, MAX_LEVEL)]
+
+
+class _VectorView:
+    """Vista tipo dict sobre un vector de stats/modificadores (compatibilidad con el código antiguo)."""
+    __slots__ = ('_arr', '_idx')
+
+    def __init__(self, arr, idx):
+        self._arr = arr
+        self._idx = idx
+
+    def __getitem__(self, key):
+        return int(self._arr[self._idx[key]])
+
+    def __setitem__(self, key, value):
+        self._arr[self._idx[key]] = value
+
+    def __contains__(self, key):
+        return key in self._idx
+
+    def get(self, key, default=None):
+        return int(self._arr[self._idx[key]]) if key in self._idx else default
+
+    def keys(self):
+        return self._idx.keys()
+
+    def items(self):
+        return [(k, int(self._arr[i])) for k, i in self._idx.items()]
+
+    def copy(self):
+        return dict(self.items())
+
+
+class BattleMon:
+    """
+    Pokémon vivo en formato compacto: especie compartida + vectores numéricos.
+    Acepta también el acceso tipo dict (p['stats']['hp'], p['name'], ...) que usan
+    BattleEngine, GameManager y la interfaz, así que puede sustituir a los dicts.
+    """
+    __slots__ = ('species', 'level', 'exp', 'stats', 'moves', 'status', 'stages', 'protected')
+
+    def __init__(self, species, level, stats=None, moves=(), exp=0):
+        self.species = species
+        self.level = level
+        self.exp = exp
+        self.stats = np.array(species.stats_at(level) if stats is None else stats, dtype=np.int16)
+        self.moves = np.full(MAX_MOVES, -1, dtype=np.int16)
+        moves = list(moves)[:MAX_MOVES]
+        self.moves[:len(moves)] = moves
+        self.status = 0
+        self.stages = np.zeros(len(STAGE_NAMES), dtype=np.int8)
+        self.protected = False
+
+    @property
+    def max_hp(self):
+        return int(self.species.stats_at(self.level)[0])
+
+    def stats_at_level(self, level):
+        """Stats de su especie a un nivel, como dict (lo que devuelve BattleEngine.get_stats_at_level)."""
+        return dict(zip(STAT_NAMES, self.species.stats_at(level).tolist()))
+
+    def heal(self):
+        """Restaura PS, estado y modificadores sin volver a elegir movimientos."""
+        self.stats[:] = self.species.stats_at(self.level)
+        self.status = 0
+        self.stages[:] = 0
+        self.protected = False
+
+    def copy(self):
+        mon = BattleMon(self.species, self.level, self.stats, exp=self.exp)
+        mon.moves[:] = self.moves
+        mon.status = self.status
+        mon.stages[:] = self.stages
+        mon.protected = self.protected
+        return mon
+
+    # --- REGISTROS COMPACTOS ---
+    def to_record(self):
+        rec = np.zeros((), dtype=BATTLE_MON_DTYPE)
+        rec['species'] = self.species.id
+        rec['level'] = self.level
+        rec['status'] = self.status
+        rec['exp'] = self.exp
+        rec['stats'] = self.stats
+        rec['moves'] = self.moves
+        rec['stages'] = self.stages
+        rec['protected'] = self.protected
+        return rec
+
+    @staticmethod
+    def from_record(rec, species_table):
+        mon = BattleMon(species_table.get(rec['species']), int(rec['level']), rec['stats'], exp=int(rec['exp']))
+        mon.moves[:] = rec['moves']
+        mon.status = int(rec['status'])
+        mon.stages[:] = rec['stages']
+        mon.protected = bool(rec['protected'])
+        return mon
+
+    # --- COMPATIBILIDAD CON DICTS ---
+    def __getitem__(self, key):
+        if key == 'id': return self.species.id
+        if key == 'name': return self.species.name
+        if key == 'types': return self.species.types
+        if key == 'type_ids': return self.species.type_ids
+        if key == 'level': return self.level
+        if key == 'exp': return self.exp
+        if key == 'stats': return _VectorView(self.stats, STAT_IDX)
+        if key == 'modifiers': return _VectorView(self.stages, STAGE_IDX)
+        if key == 'active_moves': return [MOVE_NAMES[m] for m in self.moves if m >= 0]
+        if key == 'moves': return [MOVE_NAMES[m] for m in self.species.move_ids]
+        if key == 'status_condition': return STATUS_NAMES[self.status]
+        if key == 'is_protected': return self.protected
+        if key == 'sprite': return self.species.sprite
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key == 'level': self.level = value
+        elif key == 'exp': self.exp = value
+        elif key == 'stats':
+            for s, v in value.items(): self.stats[STAT_IDX[s]] = v
+        elif key == 'modifiers':
+            self.stages[:] = 0
+            for s, v in value.items(): self.stages[STAGE_IDX[s]] = v
+        elif key == 'active_moves':
+            ids = [MOVE_IDS.get(m, STRUGGLE_ID) for m in value][:MAX_MOVES]
+            self.moves[:] = -1
+            self.moves[:len(ids)] = ids
+        elif key == 'status_condition': self.status = STATUS_CODES.get(value, 0)
+        elif key == 'is_protected': self.protected = bool(value)
+        else: raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in _DICT_KEYS
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __repr__(self):
+        return f"BattleMon({self.species.name} Lv{self.level} PS {int(self.stats[0])})"
+
+
+_DICT_KEYS = {'id', 'name', 'types', 'type_ids', 'level', 'exp', 'stats', 'modifiers',
+              'active_moves', 'moves', 'status_condition', 'is_protected', 'sprite'}
+
+
+def pack_mons(mons):
+    """Lista de BattleMon -> array estructurado BATTLE_MON_DTYPE."""
+    records = np.zeros(len(mons), dtype=BATTLE_MON_DTYPE)
+    for i, mon in enumerate(mons):
+        records[i] = mon.to_record()
+    return records
+
+
+def records_to_columns(records, species_table):
+    """
+    Columnas para BattleEngine.calculate_damage_batch directamente desde registros.
+    'status' y 'protected' son vistas del array, así que los cambios del motor se guardan en él.
+    """
+    stats = records['stats']
+    stages = records['stages']
+    types = species_table.type_ids[records['species']]
+    return {
+        'level': records['level'],
+        'attack': stats[:, STAT_IDX['attack']],
+        'defense': stats[:, STAT_IDX['defense']],
+        'special-attack': stats[:, STAT_IDX['special-attack']],
+        'special-defense': stats[:, STAT_IDX['special-defense']],
+        'type1': types[:, 0],
+        'type2': types[:, 1],
+        'status': records['status'],
+        'stage_attack': stages[:, STAGE_IDX['attack']],
+        'stage_defense': stages[:, STAGE_IDX['defense']],
+        'protected': records['protected'],
+    }
@@ -0,0 +1,254 @@
+"""
+Simulador de combates por lotes, sin GameManager ni interfaz.
+
+Juega B combates equipo contra equipo a la vez con BattleEngine.calculate_damage_batch,
+con las mismas reglas que el jefe final de GameManager: cada turno ataca primero el
+equipo A y, si el rival sigue en pie, contesta el B; el que cae deja paso al primer
+Pokémon vivo de su equipo. Gana el equipo que deja al otro sin Pokémon.
+
+estimate_win_rate() es el oráculo de evaluación: juega lotes de combates hasta que el
+intervalo de confianza de la tasa de victorias es lo bastante estrecho.
+"""
+from statistics import NormalDist
+import numpy as np
+from src.env.battle_engine import BattleEngine, EFFECTS_DB, STATUS_CODES, MSG_EFFECT
+from src.env.battle_mon import STAT_IDX, STAGE_IDX, MAX_LEVEL, BattleMon, pack_mons
+from src.env.move_table import (MOVE_EFFECT, EFFECT_NAMES, MOVE_POWER, MOVE_TYPE, MOVE_SPECIAL,
+                                STRUGGLE_ID)
+from src.env.type_chart import DUAL_TYPE_MATRIX
+
+MAX_TURNS = 300  # Tope por combate (un combate que no acaba cuenta como derrota de A)
+
+# --- EFECTOS DE ESTADO COMO TABLAS (fila = id de efecto de move_table) ---
+# Mismo comportamiento que BattleEngine.apply_effect. De los modificadores solo cuentan
+# ataque y defensa: son los únicos que entran en la fórmula de daño.
+_effects = [EFFECTS_DB[name] if name else {} for name in EFFECT_NAMES]
+EFFECT_SELF = np.array([e.get('target') == 'self' for e in _effects])
+EFFECT_HEAL = np.array([e.get('heal', 0.0) for e in _effects])
+EFFECT_PROTECT = np.array([e.get('special') == 'protect' for e in _effects])
+EFFECT_STAGE_ATTACK = np.array([e.get('stage', 0) if e.get('stat') == 'attack' else 0 for e in _effects], dtype=np.int8)
+EFFECT_STAGE_DEFENSE = np.array([e.get('stage', 0) if e.get('stat') == 'defense' else 0 for e in _effects], dtype=np.int8)
+EFFECT_STATUS = np.array([STATUS_CODES.get(e.get('status'), 0) for e in _effects], dtype=np.int8)
+del _effects
+
+# Columnas que pide calculate_damage_batch
+_COLUMN_KEYS = ('level', 'attack', 'defense', 'special-attack', 'special-defense', 'type1', 'type2',
+                'status', 'stage_attack', 'stage_defense', 'protected')
+
+
+def team_records(strategist, party_ids, level):
+    """Equipo listo para simular: prepare_pokemon de cada especie, empaquetado en registros."""
+    mons = [strategist.prepare_pokemon(pid, level) for pid in party_ids]
+    mons = [m for m in mons if m is not None]
+    if not mons:
+        raise ValueError(f"Equipo vacío: no se pudo preparar ninguna especie de {list(party_ids)}")
+    return pack_mons(mons)
+
+
+def as_team(team):
+    """Registros de un equipo a partir de un BattleMon (1v1), una lista de BattleMon o registros."""
+    if isinstance(team, BattleMon):
+        return pack_mons([team])
+    if isinstance(team, (list, tuple)):
+        return pack_mons(team)
+    return team
+
+
+def _side(records, n_battles, species_table):
+    """Estado de un equipo en los B combates: un array (B, tamaño) por campo."""
+    records = np.asarray(records)
+    if records.ndim == 1:
+        records = np.broadcast_to(records, (n_battles,) + records.shape)
+    species = records['species']
+    stats = records['stats']
+    stages = records['stages']
+    types = species_table.type_ids[species]
+    return {
+        'hp': stats[..., 0].astype(np.int32),
+        'max_hp': species_table.level_stats[species, np.minimum(records['level'], MAX_LEVEL), 0].astype(np.int32),
+        'level': records['level'].astype(np.int16),
+        'attack': stats[..., STAT_IDX['attack']].astype(np.float32),
+        'defense': stats[..., STAT_IDX['defense']].astype(np.float32),
+        'special-attack': stats[..., STAT_IDX['special-attack']].astype(np.float32),
+        'special-defense': stats[..., STAT_IDX['special-defense']].astype(np.float32),
+        'type1': types[..., 0].copy(),
+        'type2': types[..., 1].copy(),
+        'status': records['status'].astype(np.int8),
+        'stage_attack': stages[..., STAGE_IDX['attack']].astype(np.int8),
+        'stage_defense': stages[..., STAGE_IDX['defense']].astype(np.int8),
+        'protected': records['protected'].copy(),
+        'moves': records['moves'].copy(),
+    }
+
+
+def _first_alive(side, rows):
+    """Primer hueco con PS > 0 de cada combate, -1 si el equipo está derrotado."""
+    alive = side['hp'][rows] > 0
+    slot = alive.argmax(axis=1)
+    slot[~alive.any(axis=1)] = -1
+    return slot
+
+
+# --- POLÍTICAS DE ELECCIÓN DE MOVIMIENTO ---
+def greedy_moves(attacker, defender, moves, rng):
+    """El movimiento con más daño esperado (poder x STAB x tipos x ataque/defensa)."""
+    known = moves >= 0
+    ids = np.where(known, moves, STRUGGLE_ID)
+    m_type = MOVE_TYPE[ids]
+    stab = np.where((m_type == attacker['type1'][:, None]) | (m_type == attacker['type2'][:, None]), 1.5, 1.0)
+    mult = DUAL_TYPE_MATRIX[m_type, defender['type1'][:, None], defender['type2'][:, None]]
+    ratio = np.where(MOVE_SPECIAL[ids],
+                     attacker['special-attack'][:, None] / defender['special-defense'][:, None],
+                     attacker['attack'][:, None] / defender['defense'][:, None])
+    score = np.where(known, MOVE_POWER[ids] * stab * mult * ratio, -1.0)
+    return ids[np.arange(len(ids)), score.argmax(axis=1)]
+
+
+def random_moves(attacker, defender, moves, rng):
+    """Un movimiento al azar entre los que conoce (como GameManager.enemy_turn)."""
+    n_known = (moves >= 0).sum(axis=1)
+    pick = (rng.random(len(moves)) * np.maximum(n_known, 1)).astype(np.int64)
+    ids = moves[np.arange(len(moves)), pick]  # BattleMon guarda los movimientos al principio
+    return np.where(n_known > 0, ids, STRUGGLE_ID)
+
+
+POLICIES = {'greedy': greedy_moves, 'random': random_moves}
+
+
+def _apply_effects(att_side, def_side, rows, att_slots, def_slots, moves):
+    """Versión vectorizada de BattleEngine.apply_effect para las filas con MSG_EFFECT."""
+    effect = MOVE_EFFECT[moves]
+    on_self = EFFECT_SELF[effect]
+    for side, mask, slots in ((att_side, on_self, att_slots), (def_side, ~on_self, def_slots)):
+        r, s, e = rows[mask], slots[mask], effect[mask]
+        if not len(r):
+            continue
+        heal = EFFECT_HEAL[e] > 0
+        if heal.any():
+            hr, hs = r[heal], s[heal]
+            max_hp = side['max_hp'][hr, hs]
+            side['hp'][hr, hs] = np.minimum(max_hp, side['hp'][hr, hs] + (max_hp * EFFECT_HEAL[e[heal]]).astype(np.int32))
+        protect = EFFECT_PROTECT[e]
+        side['protected'][r[protect], s[protect]] = True
+        side['stage_attack'][r, s] = np.clip(side['stage_attack'][r, s] + EFFECT_STAGE_ATTACK[e], -6, 6)
+        side['stage_defense'][r, s] = np.clip(side['stage_defense'][r, s] + EFFECT_STAGE_DEFENSE[e], -6, 6)
+        status = EFFECT_STATUS[e]
+        hit = (status > 0) & (side['status'][r, s] == 0)  # Un estado no pisa a otro
+        side['status'][r[hit], s[hit]] = status[hit]
+
+
+def _attack(att_side, def_side, rows, att_slots, def_slots, policy, rng):
+    """Un ataque en cada combate de rows: elige movimiento, calcula daño y aplica efectos."""
+    if not len(rows):
+        return
+    attacker = {k: att_side[k][rows, att_slots] for k in _COLUMN_KEYS}
+    defender = {k: def_side[k][rows, def_slots] for k in _COLUMN_KEYS}
+    moves = policy(attacker, defender, att_side['moves'][rows, att_slots], rng)
+    damage, msg = BattleEngine.calculate_damage_batch(attacker, defender, moves, rng)
+    # calculate_damage_batch modifica las columnas (copias): se devuelven al estado
+    att_side['status'][rows, att_slots] = attacker['status']
+    def_side['protected'][rows, def_slots] = defender['protected']
+    def_side['hp'][rows, def_slots] = np.maximum(def_side['hp'][rows, def_slots] - damage, 0)
+    effect = msg == MSG_EFFECT
+    if effect.any():
+        _apply_effects(att_side, def_side, rows[effect], att_slots[effect], def_slots[effect], moves[effect])
+
+
+def simulate_battles(team_a, team_b, species_table, n_battles=None, rng=None,
+                     policy_a='greedy', policy_b='random', max_turns=MAX_TURNS):
+    """
+    Juega B combates independientes de team_a contra team_b.
+    team_a / team_b: registros BATTLE_MON_DTYPE, (tamaño,) para repetir el mismo equipo
+    en n_battles combates o (B, tamaño) para uno distinto por combate. Los huecos con
+    PS 0 cuentan como debilitados. Las políticas son 'greedy', 'random' o una función
+    (atacante, defensor, movimientos, rng) -> ids de movimiento.
+    Devuelve un dict de arrays (B,): 'won' (ganó A), 'turns', y 'hp_a' / 'hp_b'
+    (fracción de los PS totales de cada equipo que queda al final).
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    policy_a, policy_b = POLICIES.get(policy_a, policy_a), POLICIES.get(policy_b, policy_b)
+    if n_battles is None:
+        n_battles = len(team_a) if np.ndim(team_a) == 2 else len(team_b) if np.ndim(team_b) == 2 else 1
+    for name, team in (('team_a', team_a), ('team_b', team_b)):
+        if np.shape(team)[-1] == 0:
+            raise ValueError(f"{name} no tiene Pokémon")
+    a, b = _side(team_a, n_battles, species_table), _side(team_b, n_battles, species_table)
+
+    rows = np.arange(n_battles)
+    turns = np.zeros(n_battles, dtype=np.int32)
+    active_a, active_b = _first_alive(a, rows), _first_alive(b, rows)
+    live = rows[(active_a >= 0) & (active_b >= 0)]
+
+    while len(live):
+        turns[live] += 1
+        _attack(a, b, live, active_a[live], active_b[live], policy_a, rng)
+        # El rival contesta si sigue en pie
+        back = live[b['hp'][live, active_b[live]] > 0]
+        _attack(b, a, back, active_b[back], active_a[back], policy_b, rng)
+
+        # Cambios: entra el primer Pokémon vivo de cada equipo
+        fainted = live[a['hp'][live, active_a[live]] <= 0]
+        active_a[fainted] = _first_alive(a, fainted)
+        fainted = live[b['hp'][live, active_b[live]] <= 0]
+        active_b[fainted] = _first_alive(b, fainted)
+        live = live[(active_a[live] >= 0) & (active_b[live] >= 0) & (turns[live] < max_turns)]
+
+    def hp_left(side):
+        return side['hp'].sum(axis=1) / np.maximum(side['max_hp'].sum(axis=1), 1)
+
+    return {
+        'won': (active_b < 0) & (active_a >= 0),
+        'turns': turns,
+        'hp_a': hp_left(a),
+        'hp_b': hp_left(b),
+    }
+
+
+def wilson_interval(wins, n, confidence=0.95):
+    """Intervalo de confianza de Wilson para una proporción (no se sale de [0, 1] con n pequeño)."""
+    if n == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = wins / n
+    center = (p + z * z / (2 * n)) / (1 + z * z / n)
+    half = z * np.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+    return float(center - half), float(center + half)
+
+
+def estimate_win_rate(team_a, team_b, species_table, rng=None, tolerance=0.02, confidence=0.95,
+                      batch_size=256, max_battles=20000, **kwargs):
+    """
+    P(gana A) por Monte Carlo: juega lotes de batch_size combates independientes desde el
+    estado dado (BattleMon, lista de BattleMon o registros; no se modifican) hasta que la
+    mitad del intervalo de confianza baja de tolerance o se llega a max_battles.
+    kwargs se pasan a simulate_battles (políticas, max_turns).
+    Devuelve un dict con 'win_rate', 'ci' (bajo, alto), 'battles', 'turns' (media),
+    'hp_a' / 'hp_b' (fracción media de PS que queda) y sus desviaciones 'turns_std', 'hp_a_std'.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    team_a, team_b = as_team(team_a), as_team(team_b)
+    results = []
+    wins = battles = 0
+    while battles < max_battles:
+        n = min(batch_size, max_battles - battles)
+        result = simulate_battles(team_a, team_b, species_table, n_battles=n, rng=rng, **kwargs)
+        results.append(result)
+        wins += int(result['won'].sum())
+        battles += n
+        low, high = wilson_interval(wins, battles, confidence)
+        if (high - low) / 2 <= tolerance:
+            break
+
+    turns = np.concatenate([r['turns'] for r in results])
+    hp_a = np.concatenate([r['hp_a'] for r in results])
+    hp_b = np.concatenate([r['hp_b'] for r in results])
+    return {
+        'win_rate': wins / battles,
+        'ci': wilson_interval(wins, battles, confidence),
+        'battles': battles,
+        'turns': float(turns.mean()),
+        'turns_std': float(turns.std()),
+        'hp_a': float(hp_a.mean()),
+        'hp_a_std': float(hp_a.std()),
+        'hp_b': float(hp_b.mean()),
+    }
@@ -0,0 +1,111 @@
+import numpy as np
+from src.env.type_chart import TYPE_IDS
+from src.utils.game_data import load_moves, cached_arrays
+
+# --- BASE DE DATOS DE MOVIMIENTOS (se lee una sola vez) ---
+# De la caché binaria (data/game_data.npz) si está al día, si no de moves.json
+MOVES_DB, MOVES_PATH = load_moves()
+
+STRUGGLE = {"type": "normal", "power": 50, "accuracy": 100, "pp": 1, "class": "physical"}
+
+# --- LISTA BLANCA DE EFECTOS SOPORTADOS ---
+# Solo los movimientos que estén aquí O tengan daño > 0 serán usados.
+EFFECTS_DB = {
+    # BUFFS (Usuario)
+    'swords-dance': {'target': 'self', 'stat': 'attack', 'stage': 2, 'msg': '¡Subió mucho su ATAQUE!'},
+    'growth':       {'target': 'self', 'stat': 'special-attack', 'stage': 1, 'msg': '¡Subió su AT. ESP!'},
+    'defense-curl': {'target': 'self', 'stat': 'defense', 'stage': 1, 'msg': '¡Subió su DEFENSA!'},
+    'hardening':    {'target': 'self', 'stat': 'defense', 'stage': 1, 'msg': '¡Subió su DEFENSA!'},
+    'agility':      {'target': 'self', 'stat': 'speed', 'stage': 2, 'msg': '¡Subió mucho su VELOCIDAD!'},
+    'recover':      {'target': 'self', 'heal': 0.5, 'msg': '¡Recuperó salud!'},
+    'soft-boiled':  {'target': 'self', 'heal': 0.5, 'msg': '¡Recuperó salud!'},
+    'protect':      {'target': 'self', 'special': 'protect', 'msg': '¡Se protegió!'},
+    'focus-energy': {'target': 'self', 'special': 'crit', 'msg': '¡Se está concentrando!'},
+
+    # DEBUFFS (Rival)
+    'growl':        {'target': 'enemy', 'stat': 'attack', 'stage': -1, 'msg': '¡Bajó el ATAQUE del rival!'},
+    'tail-whip':    {'target': 'enemy', 'stat': 'defense', 'stage': -1, 'msg': '¡Bajó la DEFENSA del rival!'},
+    'leer':         {'target': 'enemy', 'stat': 'defense', 'stage': -1, 'msg': '¡Bajó la DEFENSA del rival!'},
+    'screech':      {'target': 'enemy', 'stat': 'defense', 'stage': -2, 'msg': '¡Bajó mucho la DEFENSA rival!'},
+    'sand-attack':  {'target': 'enemy', 'stat': 'accuracy', 'stage': -1, 'msg': '¡Bajó la PRECISIÓN rival!'},
+    'string-shot':  {'target': 'enemy', 'stat': 'speed', 'stage': -1, 'msg': '¡Bajó la VELOCIDAD rival!'},
+    'smokescreen':  {'target': 'enemy', 'stat': 'accuracy', 'stage': -1, 'msg': '¡Bajó la PRECISIÓN rival!'},
+
+    # ESTADOS ALTERADOS
+    'thunder-wave': {'target': 'enemy', 'status': 'PAR', 'msg': '¡El rival está paralizado!'},
+    'glare':        {'target': 'enemy', 'status': 'PAR', 'msg': '¡El rival está paralizado!'},
+    'stun-spore':   {'target': 'enemy', 'status': 'PAR', 'msg': '¡El rival está paralizado!'},
+    'toxic':        {'target': 'enemy', 'status': 'PSN', 'msg': '¡El rival está gravemente envenenado!'},
+    'poison-powder':{'target': 'enemy', 'status': 'PSN', 'msg': '¡El rival está envenenado!'},
+    'poison-gas':   {'target': 'enemy', 'status': 'PSN', 'msg': '¡El rival está envenenado!'},
+    'hypnosis':     {'target': 'enemy', 'status': 'SLP', 'msg': '¡El rival se durmió!'},
+    'sleep-powder': {'target': 'enemy', 'status': 'SLP', 'msg': '¡El rival se durmió!'},
+    'sing':         {'target': 'enemy', 'status': 'SLP', 'msg': '¡El rival se durmió!'},
+    'will-o-wisp':  {'target': 'enemy', 'status': 'BRN', 'msg': '¡El rival se quemó!'},
+    'confuse-ray':  {'target': 'enemy', 'special': 'confuse', 'msg': '¡El rival está confuso!'},
+    'supersonic':   {'target': 'enemy', 'special': 'confuse', 'msg': '¡El rival está confuso!'},
+}
+
+# --- IDS ENTEROS ---
+# Movimientos por id entero (0 = STRUGGLE, que también cubre los desconocidos)
+STRUGGLE_ID = 0
+MOVE_NAMES = ['struggle'] + [m for m in MOVES_DB if m != 'struggle']
+MOVE_IDS = {name: i for i, name in enumerate(MOVE_NAMES)}
+N_MOVES = len(MOVE_NAMES)
+
+CLASS_NAMES = ['physical', 'special', 'status']
+CLASS_IDS = {name: i for i, name in enumerate(CLASS_NAMES)}
+CLASS_PHYSICAL, CLASS_SPECIAL, CLASS_STATUS = range(len(CLASS_NAMES))
+
+# Efectos de estado por id (0 = sin efecto soportado)
+EFFECT_NONE = 0
+EFFECT_NAMES = [None] + list(EFFECTS_DB)
+EFFECT_IDS = {name: i for i, name in enumerate(EFFECT_NAMES) if name}
+
+
+def compile_move_table(moves_db):
+    """Columnas de la tabla de movimientos (mismo orden de ids que MOVE_NAMES) a partir del dict de moves.json."""
+    names = ['struggle'] + [m for m in moves_db if m != 'struggle']
+    moves = [STRUGGLE] + [moves_db[m] for m in names[1:]]
+    return {
+        'move_type': np.array([TYPE_IDS.get(m.get('type'), TYPE_IDS['normal']) for m in moves], dtype=np.int8),
+        'move_power': np.array([m.get('power') or 0 for m in moves], dtype=np.float32),
+        'move_accuracy': np.array([m.get('accuracy') or 0 for m in moves], dtype=np.int16),  # 0 = no falla nunca
+        'move_pp': np.array([m.get('pp') or 0 for m in moves], dtype=np.int8),
+        'move_class': np.array([CLASS_IDS.get(m.get('class'), CLASS_STATUS) for m in moves], dtype=np.int8),
+        'move_effect': np.array([EFFECT_IDS.get(name, EFFECT_NONE) for name in names], dtype=np.int16),
+    }
+
+
+# --- TABLA COMPILADA (una columna por campo, indexada por id de movimiento) ---
+# Con la caché al día las columnas son vistas de solo lectura del fichero mapeado en memoria
+_arrays = cached_arrays()
+_columns = ({k: _arrays['table_' + k] for k in ('move_type', 'move_power', 'move_accuracy',
+                                                'move_pp', 'move_class', 'move_effect')}
+            if _arrays is not None else compile_move_table(MOVES_DB))
+MOVE_TYPE = _columns['move_type']
+MOVE_POWER = _columns['move_power']
+MOVE_ACCURACY = _columns['move_accuracy']
+MOVE_PP = _columns['move_pp']
+MOVE_CLASS = _columns['move_class']
+MOVE_EFFECT = _columns['move_effect']
+MOVE_SPECIAL = MOVE_CLASS == CLASS_SPECIAL
+MOVE_PHYSICAL = MOVE_CLASS == CLASS_PHYSICAL
+del _arrays, _columns
+
+# Las mismas columnas como tuplas de Python (tipo, poder, clase) para el motor escalar,
+# donde indexar arrays NumPy de uno en uno sale más caro que una tupla
+MOVE_ROWS = list(zip(MOVE_TYPE.tolist(), MOVE_POWER.tolist(), MOVE_CLASS.tolist()))
+
+for _col in (MOVE_TYPE, MOVE_POWER, MOVE_ACCURACY, MOVE_PP, MOVE_CLASS, MOVE_EFFECT, MOVE_SPECIAL, MOVE_PHYSICAL):
+    _col.flags.writeable = False
+
+
+def move_id(name):
+    """Id entero de un movimiento (los desconocidos pasan a STRUGGLE)."""
+    return MOVE_IDS.get(name, STRUGGLE_ID)
+
+
+def move_ids(names):
+    """Traduce una lista de nombres a un array de ids."""
+    return np.array([MOVE_IDS.get(m, STRUGGLE_ID) for m in names], dtype=np.int32)
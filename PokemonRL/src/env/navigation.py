@@ -0,0 +1,102 @@
+"""
+Índice de navegación de cada mapa, calculado una sola vez al importar (ALL_MAPS es fijo).
+
+Por mapa (MapNav):
+  walls       (10, 10) bool     muros
+  neighbors   (100, 4) int      casilla destino de cada acción (-1 = muro o borde)
+  dist        (100, 100) int16  pasos mínimos entre cada par de casillas (UNREACHABLE sin camino)
+  goal_dist   (10, 10) int16    pasos hasta la meta
+  grass_dist  (10, 10) int16    pasos hasta la hierba más cercana
+
+GameManager lo usa para guiar al Explorador sin descubrir muros a golpes, y el entorno
+puede añadir goal_dist/grass_dist normalizados como capas de la observación (NAV_PLANES).
+"""
+import numpy as np
+from src.env.maps import ALL_MAPS
+
+WALL, GRASS, GOAL = 1, 2, 9
+ACTION_DELTAS = ((-1, 0), (1, 0), (0, -1), (0, 1))  # Mismo orden que las acciones 0-3
+UNREACHABLE = np.iinfo(np.int16).max
+N_NAV_PLANES = 2  # Capas de observación: distancia a la meta y a la hierba
+
+
+def neighbor_table(grid):
+    """(casillas, 4): índice plano del destino de cada acción, o -1 si es muro o se sale."""
+    h, w = grid.shape
+    ys, xs = np.divmod(np.arange(h * w), w)
+    table = np.full((h * w, 4), -1, dtype=np.int64)
+    for a, (dy, dx) in enumerate(ACTION_DELTAS):
+        ny, nx = ys + dy, xs + dx
+        inside = (ny >= 0) & (ny < h) & (nx >= 0) & (nx < w)
+        target = np.where(inside, ny * w + nx, 0)
+        ok = inside & (grid.ravel()[target] != WALL) & (grid.ravel() != WALL)
+        table[ok, a] = target[ok]
+    return table
+
+
+def all_pairs_distances(neighbors):
+    """BFS desde todas las casillas a la vez: una multiplicación de matrices por nivel."""
+    n = len(neighbors)
+    rows, cols = np.nonzero(neighbors >= 0)
+    adj = np.zeros((n, n), dtype=np.float32)
+    adj[rows, neighbors[rows, cols]] = 1.0
+
+    dist = np.full((n, n), UNREACHABLE, dtype=np.int16)
+    reached = np.eye(n, dtype=bool)
+    np.fill_diagonal(dist, 0)
+    frontier = reached.astype(np.float32)
+    d = 0
+    while True:
+        d += 1
+        new = ((frontier @ adj) > 0) & ~reached
+        if not new.any():
+            return dist
+        dist[new] = d
+        reached |= new
+        frontier = new.astype(np.float32)
+
+
+class MapNav:
+    def __init__(self, grid):
+        self.grid = np.asarray(grid)
+        self.shape = self.grid.shape
+        self.walls = self.grid == WALL
+        self.neighbors = neighbor_table(self.grid)
+        self.dist = all_pairs_distances(self.neighbors)
+        self.goal_dist = self.distance_to(self.grid == GOAL)
+        self.grass_dist = self.distance_to(self.grid == GRASS)
+        for arr in (self.walls, self.neighbors, self.dist, self.goal_dist, self.grass_dist):
+            arr.flags.writeable = False
+        # Copias en listas para los caminos escalares (GameManager, una consulta por acción)
+        self.neighbor_rows = self.neighbors.tolist()
+        self.fields = {'goal': self.goal_dist.ravel().tolist(), 'grass': self.grass_dist.ravel().tolist()}
+        self.is_grass = (self.grid == GRASS).ravel().tolist()
+
+    def distance_to(self, mask):
+        """Campo (10, 10) de pasos hasta la casilla más cercana de mask."""
+        targets = np.flatnonzero(mask)
+        if len(targets) == 0:
+            return np.full(self.shape, UNREACHABLE, dtype=np.int16)
+        return self.dist[:, targets].min(axis=1).reshape(self.shape)
+
+    def cell(self, y, x):
+        return y * self.shape[1] + x
+
+    def distance(self, a, b):
+        """Pasos mínimos entre dos casillas (y, x)."""
+        return int(self.dist[self.cell(*a), self.cell(*b)])
+
+    def planes(self):
+        """goal_dist y grass_dist normalizados a [0, 1] (1 = lo más lejos o sin camino)."""
+        planes = np.ones((N_NAV_PLANES,) + self.shape, dtype=np.float32)
+        for plane, field in zip(planes, (self.goal_dist, self.grass_dist)):
+            reachable = field != UNREACHABLE
+            if reachable.any():
+                plane[reachable] = field[reachable] / max(int(field[reachable].max()), 1)
+        return planes
+
+
+# Índices de todos los mapas, calculados una vez
+MAP_NAV = [MapNav(m) for m in ALL_MAPS]
+NAV_PLANES = np.stack([nav.planes() for nav in MAP_NAV])
+NAV_PLANES.flags.writeable = False
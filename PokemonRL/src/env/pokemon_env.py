@@ -1,30 +1,72 @@
 import gymnasium as gym
 from gymnasium import spaces
 import numpy as np
-import json
-import os
-from collections import deque # <--- IMPORTANTE: Para la memoria
 from src.env.battle_engine import BattleEngine
+from src.env.battle_mon import SpeciesTable, STAT_IDX, MAX_LEVEL
 from src.env.maps import ALL_MAPS
+from src.env.navigation import NAV_PLANES, N_NAV_PLANES
+from src.utils.frame_stack import FrameRing
+from src.utils.game_data import load_pokedex
+from src.utils.rng import make_rng, RandomStream
+from src.utils.logger import get_logger
+
+# Ataques genéricos del Táctico (acciones 4..8): potencia 60 de cada tipo
+COMBAT_MOVES = ['swift', 'flame-wheel', 'water-pulse', 'magical-leaf', 'shock-wave']
+# Ataque del rival salvaje según su primer tipo (potencia ~40)
+WILD_TYPE_MOVES = {
+    'normal': 'tackle', 'fire': 'ember', 'water': 'water-gun', 'grass': 'mega-drain',
+    'electric': 'thunder-shock', 'ice': 'powder-snow', 'fighting': 'mach-punch',
+    'poison': 'acid', 'ground': 'mud-slap', 'flying': 'gust', 'psychic': 'confusion',
+    'bug': 'fury-cutter', 'rock': 'rock-throw', 'ghost': 'shadow-sneak', 'dragon': 'twister',
+    'dark': 'pursuit', 'steel': 'bullet-punch', 'fairy': 'fairy-wind',
+}
+ATK, DEF = STAT_IDX['attack'], STAT_IDX['defense']
+LOG = get_logger('env')
+
+
+def static_planes(grid):
+    """Capas fijas de un mapa: muros y zonas de interés (hierba 0.5, meta 1.0)."""
+    grid = np.asarray(grid)
+    planes = np.zeros((2,) + grid.shape, dtype=np.float32)
+    planes[0] = grid == 1
+    planes[1] = (grid == 2) * 0.5 + (grid == 9) * 1.0
+    return planes
+
+
+# Capas fijas de cada mapa, calculadas una vez: (n_mapas, 2, 10, 10)
+MAP_PLANES = np.stack([static_planes(m) for m in ALL_MAPS])
+MAP_PLANES.flags.writeable = False
 
 class PokemonSimEnv(gym.Env):
-    def __init__(self, verbose=False):
+    def __init__(self, verbose=False, seed=None, nav_channels=False):
         super(PokemonSimEnv, self).__init__()
         self.verbose = verbose
+        # Capas extra de navegación (distancia a la meta y a la hierba, src.env.navigation)
+        self.nav_channels = nav_channels
+        # Todo el azar del entorno, del motor y de GameManager sale de aquí (ver src/utils/rng.py)
+        self.np_random = make_rng(seed)
+        self.rng = RandomStream(self.np_random)
         
-        try:
-            base_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-            with open(os.path.join(base_dir, 'data', 'pokedex.json'), 'r') as f:
-                self.pokedex = json.load(f)
-        except:
-            self.pokedex = {}
+        # Caché binaria (python -m src.utils.game_data) o pokedex.json si no está al día
+        # (cada entrada trae ya sus ids de tipo, que el motor usa en cada ataque)
+        self.pokedex = load_pokedex()
+        if not self.pokedex:
+            # Los stats salen de la tabla por especie: sin Pokédex no hay con qué jugar
+            raise FileNotFoundError("No hay Pokédex: genera data/pokedex.json (src.utils.data_loader) "
+                                    "o la caché (python -m src.utils.game_data)")
+        # Tabla de stats por especie y nivel: ver _stats()
+        self.species = SpeciesTable(self.pokedex)
+        # Ataque y defensa ya normalizados (/300) tal como los pide el estado de combate
+        self._combat_stats = (self.species.level_stats[:, :, [ATK, DEF]] / 300.0).astype(np.float32)
 
         # --- FRAME STACKING ---
-        # Ahora el estado es 9 capas (3 frames x 3 canales)
+        # Ahora el estado es 9 capas (3 frames x 3 canales) sobre un buffer circular:
+        # el estado devuelto es una vista, sin copias (ver FrameRing).
         self.stack_size = 3
-        self.frame_stack = deque(maxlen=self.stack_size)
+        self.frame_ring = FrameRing(1, self.stack_size, (3, 10, 10))
         
-        self.observation_space = spaces.Box(low=0, high=1, shape=(9, 10, 10), dtype=np.float32)
+        n_planes = 9 + (N_NAV_PLANES if nav_channels else 0)
+        self.observation_space = spaces.Box(low=0, high=1, shape=(n_planes, 10, 10), dtype=np.float32)
         self.action_space = spaces.Discrete(4) 
         
         self.current_map_idx = 0
@@ -32,50 +74,62 @@ class PokemonSimEnv(gym.Env):
         self.mode = "MAP"
         self.my_pokemon = None
 
-    def log(self, msg):
-        if self.verbose: print(msg)
+    def log(self, msg, *args):
+        if self.verbose: LOG.info(msg, *args)
+
+    def _stats(self, pokemon, table=None):
+        """Stats (hp, attack, defense, ...) del Pokémon a su nivel actual, leídos de la tabla."""
+        table = self.species.level_stats if table is None else table
+        return table[int(pokemon['id']), min(pokemon['level'], MAX_LEVEL)]
 
     def _get_map_state(self):
         """Genera UN solo frame (3 capas)"""
         state = np.zeros((3, 10, 10), dtype=np.float32)
-        state[0] = (self.grid == 1).astype(np.float32) # Muros
-        
-        mask_grass = (self.grid == 2).astype(np.float32) * 0.5
-        mask_goal = (self.grid == 9).astype(np.float32) * 1.0
-        state[1] = mask_grass + mask_goal # Interés
-        
+        state[:2] = MAP_PLANES[self.current_map_idx] # Muros e Interés
         py, px = self.player_pos
         state[2][py][px] = 1.0 # Jugador
         return state
 
+    def _push_frame(self):
+        """Escribe el frame actual en el siguiente hueco de la pila (capas fijas desde la caché)."""
+        slot = self.frame_ring.advance(0)
+        frame = self.frame_ring.buf[0, slot]
+        frame[:2] = MAP_PLANES[self.current_map_idx]
+        frame[2] = 0.0
+        py, px = self.player_pos
+        frame[2, py, px] = 1.0
+
     def _get_stacked_state(self):
-        """Devuelve los últimos 3 frames concatenados (9 capas)"""
-        # Convertimos la deque en un array numpy (3, 3, 10, 10) -> (9, 10, 10)
-        stack = np.array(self.frame_stack)
-        return stack.reshape(-1, 10, 10)
+        """
+        Devuelve los últimos 3 frames concatenados (9 capas) como vista del buffer, sin copiar.
+        Con nav_channels se añaden detrás las capas de navegación del mapa (esto sí copia).
+        """
+        if self.nav_channels:
+            return np.concatenate((self.frame_ring.window(0), NAV_PLANES[self.current_map_idx]))
+        return self.frame_ring.window(0)
 
     def reset(self, seed=None):
         super().reset(seed=seed)
+        if seed is not None:
+            # Nueva semilla: todo el azar del entorno (y del motor) sale de ella
+            self.rng = RandomStream(self.np_random)
         self.grid = np.array(ALL_MAPS[self.current_map_idx])
         self.player_pos = [0, 0]
         
         if self.my_pokemon is None:
-            if self.pokedex: self.my_pokemon = self.pokedex.get("4", {}).copy()
-            else: self.my_pokemon = {"name": "BugMon", "stats": {"hp":40,"atk":40,"def":40}, "types":["normal"]}
+            self.my_pokemon = self.pokedex.get("4", {}).copy()
 
         if 'level' not in self.my_pokemon: self.my_pokemon['level'] = 5
         if 'exp' not in self.my_pokemon: self.my_pokemon['exp'] = 0
 
-        stats = BattleEngine.get_stats_at_level(self.my_pokemon, self.my_pokemon['level'])
-        self.max_hp_my = stats['hp']
+        self.max_hp_my = int(self._stats(self.my_pokemon)[0])
         self.my_hp = self.max_hp_my
         self.mode = "MAP"
         
         # --- LLENAR PILA INICIAL ---
-        initial_frame = self._get_map_state()
         for _ in range(self.stack_size):
-            self.frame_stack.append(initial_frame)
-            
+            self._push_frame()
+
         return self._get_stacked_state(), {}
 
     def step(self, action):
@@ -96,18 +150,18 @@ class PokemonSimEnv(gym.Env):
             tile = self.grid[ny][nx]
             
             if tile == 1: # Choque
-                self.frame_stack.append(self._get_map_state()) # Actualizamos visión (ve el muro)
+                self._push_frame() # Actualizamos visión (ve el muro)
                 return self._get_stacked_state(), -0.5, False, False, {}
             
             self.player_pos = [ny, nx]
             
             # --- RECOMPENSAS OPTIMIZADAS ---
             if tile == 9: # META
-                self.log(f"¡Mapa Completado!")
+                self.log("¡Mapa Completado!")
                 # Si soy nivel bajo, llegar a la meta da poco (prefiero farmear)
                 # Si soy nivel alto, llegar a la meta da MUCHO (quiero avanzar)
                 reward = 500 if self.my_pokemon['level'] >= 25 else 50
-                self.frame_stack.append(self._get_map_state())
+                self._push_frame()
                 return self._get_stacked_state(), reward, True, False, {}
             
             elif tile == 2: # HIERBA
@@ -115,36 +169,34 @@ class PokemonSimEnv(gym.Env):
                 if self.my_pokemon['level'] < 25:
                     step_reward = 0.1 
                 
-                if np.random.rand() < 0.2: # Combate
+                if self.rng.random() < 0.2: # Combate
                     self.mode = "COMBAT"
                     self._generate_wild_enemy()
-                    self.log(f"¡{self.enemy_pokemon['name']} salvaje!")
-                    self.frame_stack.append(self._get_map_state())
+                    self.log("¡%s salvaje!", self.enemy_pokemon['name'])
+                    self._push_frame()
                     return self._get_combat_state(), 0, False, False, {}
         else:
-            self.frame_stack.append(self._get_map_state())
+            self._push_frame()
             return self._get_stacked_state(), -0.5, False, False, {}
 
-        self.frame_stack.append(self._get_map_state())
+        self._push_frame()
         return self._get_stacked_state(), step_reward, False, False, {}
 
     def _generate_wild_enemy(self):
         min_lvl = 3 + (self.current_map_idx * 5)
         max_lvl = 6 + (self.current_map_idx * 5)
-        level = np.random.randint(min_lvl, max_lvl + 1)
-        if self.pokedex:
-            eid = str(np.random.randint(1, 152))
-            self.enemy_pokemon = self.pokedex.get(eid, self.my_pokemon).copy()
-        else: self.enemy_pokemon = self.my_pokemon.copy()
+        level = self.rng.integers(min_lvl, max_lvl + 1)
+        eid = str(self.rng.integers(1, 152))
+        self.enemy_pokemon = self.pokedex.get(eid, self.my_pokemon).copy()
         self.enemy_pokemon['level'] = level
-        stats = BattleEngine.get_stats_at_level(self.enemy_pokemon, level)
-        self.max_hp_enemy = stats['hp']
+        self.max_hp_enemy = int(self._stats(self.enemy_pokemon)[0])
         self.enemy_hp = self.max_hp_enemy
 
     def _step_combat(self, action):
         if action < 4: return self._get_combat_state(), -0.5, False, False, {}
         idx = action - 4
-        dmg, _ = BattleEngine.calculate_damage(self.my_pokemon, self.enemy_pokemon, 60, ["normal","fire","water","grass","electric"][idx] if idx<5 else "normal")
+        move = COMBAT_MOVES[idx] if idx < len(COMBAT_MOVES) else COMBAT_MOVES[0]
+        dmg, _ = BattleEngine.calculate_damage(self.my_pokemon, self.enemy_pokemon, move, self.rng)
         self.enemy_hp -= dmg
         
         if self.enemy_hp <= 0:
@@ -154,8 +206,7 @@ class PokemonSimEnv(gym.Env):
             msg = f"Ganaste +{exp} XP"
             if self.my_pokemon['exp'] >= 100:
                 self.my_pokemon['level'] += 1; self.my_pokemon['exp'] = 0
-                s = BattleEngine.get_stats_at_level(self.my_pokemon, self.my_pokemon['level'])
-                self.max_hp_my = s['hp']; self.my_hp = s['hp']
+                self.max_hp_my = self.my_hp = int(self._stats(self.my_pokemon)[0])
                 msg += " ¡NIVEL UP!"
             
             # --- RECOMPENSA DE COMBATE ---
@@ -163,11 +214,11 @@ class PokemonSimEnv(gym.Env):
             combat_reward = 100 if self.my_pokemon['level'] < 30 else 20
             
             # ¡IMPORTANTE! Al volver al mapa, añadimos el frame actual a la pila
-            self.frame_stack.append(self._get_map_state()) 
+            self._push_frame() 
             return self._get_stacked_state(), combat_reward, False, False, {"log": msg}
             
         enemy_type = self.enemy_pokemon['types'][0]
-        dmg_r, _ = BattleEngine.calculate_damage(self.enemy_pokemon, self.my_pokemon, 40, enemy_type)
+        dmg_r, _ = BattleEngine.calculate_damage(self.enemy_pokemon, self.my_pokemon, WILD_TYPE_MOVES.get(enemy_type, 'tackle'), self.rng)
         self.my_hp -= dmg_r
         
         if self.my_hp <= 0: return self._get_combat_state(), -50, True, False, {"log": "Debilitado..."}
@@ -177,9 +228,7 @@ class PokemonSimEnv(gym.Env):
         # El estado de combate sigue siendo 1D (no usa frame stacking por ahora, no hace falta para táctica simple)
         state = np.zeros(10, dtype=np.float32)
         if self.max_hp_my > 0: state[0] = self.my_hp / self.max_hp_my
-        ms = BattleEngine.get_stats_at_level(self.my_pokemon, self.my_pokemon['level'])
-        state[1] = ms['attack']/300.0; state[2] = ms['defense']/300.0
+        state[1:3] = self._stats(self.my_pokemon, self._combat_stats)
         if self.max_hp_enemy > 0: state[5] = self.enemy_hp / self.max_hp_enemy
-        es = BattleEngine.get_stats_at_level(self.enemy_pokemon, self.enemy_pokemon['level'])
-        state[6] = es['attack']/300.0; state[7] = es['defense']/300.0
+        state[6:8] = self._stats(self.enemy_pokemon, self._combat_stats)
         return state
\ No newline at end of file
@@ -0,0 +1,55 @@
+import numpy as np
+
+# Tabla de efectividades (atacante -> defensor). Lo que no aparece vale x1.
+TYPE_CHART = {
+    'normal': {'rock': 0.5, 'ghost': 0, 'steel': 0.5},
+    'fire': {'fire': 0.5, 'water': 0.5, 'grass': 2.0, 'ice': 2.0, 'bug': 2.0, 'rock': 0.5, 'dragon': 0.5, 'steel': 2.0},
+    'water': {'fire': 2.0, 'water': 0.5, 'grass': 0.5, 'ground': 2.0, 'rock': 2.0, 'dragon': 0.5},
+    'electric': {'water': 2.0, 'electric': 0.5, 'grass': 0.5, 'ground': 0, 'flying': 2.0, 'dragon': 0.5},
+    'grass': {'fire': 0.5, 'water': 2.0, 'grass': 0.5, 'poison': 0.5, 'ground': 2.0, 'flying': 0.5, 'bug': 0.5, 'rock': 2.0, 'dragon': 0.5, 'steel': 0.5},
+    'ice': {'fire': 0.5, 'water': 0.5, 'grass': 2.0, 'ice': 0.5, 'ground': 2.0, 'flying': 2.0, 'dragon': 2.0, 'steel': 0.5},
+    'fighting': {'normal': 2.0, 'ice': 2.0, 'poison': 0.5, 'flying': 0.5, 'psychic': 0.5, 'bug': 0.5, 'rock': 2.0, 'ghost': 0, 'dark': 2.0, 'steel': 2.0, 'fairy': 0.5},
+    'poison': {'grass': 2.0, 'poison': 0.5, 'ground': 0.5, 'rock': 0.5, 'ghost': 0.5, 'steel': 0, 'fairy': 2.0},
+    'ground': {'fire': 2.0, 'electric': 2.0, 'grass': 0.5, 'poison': 2.0, 'flying': 0, 'bug': 0.5, 'rock': 2.0, 'steel': 2.0},
+    'flying': {'electric': 0.5, 'grass': 2.0, 'fighting': 2.0, 'bug': 2.0, 'rock': 0.5, 'steel': 0.5},
+    'psychic': {'fighting': 2.0, 'poison': 2.0, 'psychic': 0.5, 'dark': 0, 'steel': 0.5},
+    'bug': {'fire': 0.5, 'grass': 2.0, 'fighting': 0.5, 'poison': 2.0, 'flying': 0.5, 'psychic': 2.0, 'ghost': 0.5, 'dark': 2.0, 'steel': 0.5, 'fairy': 0.5},
+    'rock': {'fire': 2.0, 'ice': 2.0, 'fighting': 0.5, 'ground': 0.5, 'flying': 2.0, 'bug': 2.0, 'steel': 0.5},
+    'ghost': {'normal': 0, 'psychic': 2.0, 'ghost': 2.0, 'dark': 0.5},
+    'dragon': {'dragon': 2.0, 'steel': 0.5, 'fairy': 0},
+    'dark': {'fighting': 0.5, 'psychic': 2.0, 'ghost': 2.0, 'dark': 0.5, 'fairy': 0.5},
+    'steel': {'fire': 0.5, 'water': 0.5, 'electric': 0.5, 'ice': 2.0, 'rock': 2.0, 'steel': 0.5, 'fairy': 2.0},
+    'fairy': {'fire': 0.5, 'fighting': 2.0, 'poison': 0.5, 'dragon': 2.0, 'dark': 2.0, 'steel': 0.5}
+}
+
+# --- IDS ENTEROS ---
+TYPE_NAMES = list(TYPE_CHART)
+TYPE_IDS = {name: i for i, name in enumerate(TYPE_NAMES)}
+N_TYPES = len(TYPE_NAMES)
+NO_TYPE = N_TYPES  # Hueco del segundo tipo en Pokémon monotipo (multiplica x1)
+
+# TYPE_MATRIX[atacante, defensor] -> multiplicador (18x18)
+TYPE_MATRIX = np.ones((N_TYPES, N_TYPES), dtype=np.float32)
+for _atk, _row in TYPE_CHART.items():
+    for _dfn, _mult in _row.items():
+        TYPE_MATRIX[TYPE_IDS[_atk], TYPE_IDS[_dfn]] = _mult
+
+# DUAL_TYPE_MATRIX[atacante, tipo1, tipo2] -> multiplicador contra el par de tipos.
+# La fila/columna NO_TYPE vale x1, así un monotipo es (t, NO_TYPE).
+_padded = np.ones((N_TYPES, N_TYPES + 1), dtype=np.float32)
+_padded[:, :N_TYPES] = TYPE_MATRIX
+DUAL_TYPE_MATRIX = _padded[:, :, None] * _padded[:, None, :]
+del _padded
+
+
+def type_ids(types):
+    """Convierte una lista de nombres de tipo en el par (tipo1, tipo2) de ids."""
+    ids = [TYPE_IDS.get(t.lower(), NO_TYPE) for t in types[:2]]
+    while len(ids) < 2:
+        ids.append(NO_TYPE)
+    return ids[0], ids[1]
+
+
+def effectiveness(attack_type, t1, t2=NO_TYPE):
+    """Multiplicador de un tipo atacante (id) contra un defensor (ids). Acepta arrays."""
+    return DUAL_TYPE_MATRIX[attack_type, t1, t2]
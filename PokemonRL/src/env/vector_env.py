@@ -0,0 +1,264 @@
+import gymnasium as gym
+from gymnasium import spaces
+from gymnasium.vector.utils import batch_space
+import numpy as np
+from src.env.battle_engine import BattleEngine, XP_PER_LEVEL
+from src.env.move_table import MOVE_IDS
+from src.env.battle_mon import STAT_IDX, SpeciesTable
+from src.env.type_chart import TYPE_IDS, NO_TYPE
+from src.env.pokemon_env import COMBAT_MOVES, WILD_TYPE_MOVES, MAP_PLANES, LOG
+from src.env.maps import ALL_MAPS
+from src.env.navigation import NAV_PLANES, N_NAV_PLANES
+from src.utils.frame_stack import FrameRing
+from src.utils.game_data import load_pokedex
+
+MODE_MAP = 0
+MODE_COMBAT = 1
+
+# Desplazamientos (dy, dx) de las acciones 0..3
+_MOVES = np.array([(-1, 0), (1, 0), (0, -1), (0, 1)], dtype=np.int64)
+_MAPS = np.array(ALL_MAPS, dtype=np.int8)
+_COMBAT_MOVE_IDS = np.array([MOVE_IDS[m] for m in COMBAT_MOVES], dtype=np.int32)
+# Ataque del rival indexado por id de tipo (NO_TYPE -> placaje)
+_WILD_MOVE_BY_TYPE = np.full(NO_TYPE + 1, MOVE_IDS['tackle'], dtype=np.int32)
+for _t, _m in WILD_TYPE_MOVES.items():
+    _WILD_MOVE_BY_TYPE[TYPE_IDS[_t]] = MOVE_IDS[_m]
+
+
+class PokemonVectorEnv(gym.vector.VectorEnv):
+    """
+    N copias de PokemonSimEnv guardadas como arrays NumPy y avanzadas con una sola llamada.
+    Mismas reglas y recompensas que PokemonSimEnv. Como el estado cambia de forma entre
+    mapa (9x10x10) y combate (10), la observación es un Dict con ambas partes y 'mode'.
+    Autoreset en el mismo paso: la observación final queda en infos['final_obs'].
+    """
+    metadata = {"autoreset_mode": gym.vector.AutoresetMode.SAME_STEP}
+
+    def __init__(self, num_envs, verbose=False, nav_channels=False):
+        self.num_envs = num_envs
+        self.verbose = verbose
+        self.nav_channels = nav_channels  # Ver PokemonSimEnv
+
+        pokedex = load_pokedex()
+        self.pokedex = pokedex
+        self._species_ids = np.array(sorted(int(k) for k in pokedex), dtype=np.int64)
+        # Stats base, tipos y stats por nivel de cada especie (tablas calculadas una vez)
+        self.species = SpeciesTable(pokedex)
+        self._base_stats = self.species.base_stats
+        self._type_ids = self.species.type_ids
+
+        self.stack_size = 3
+        self.single_observation_space = spaces.Dict({
+            "map": spaces.Box(low=0, high=1, shape=(3 * self.stack_size + (N_NAV_PLANES if nav_channels else 0), 10, 10),
+                              dtype=np.float32),
+            "combat": spaces.Box(low=0, high=np.inf, shape=(10,), dtype=np.float32),
+            "mode": spaces.Discrete(2),
+        })
+        # 0-3: moverse, 4-8: atacar (igual que PokemonSimEnv.step)
+        self.single_action_space = spaces.Discrete(4 + len(COMBAT_MOVES))
+        self.observation_space = batch_space(self.single_observation_space, num_envs)
+        self.action_space = batch_space(self.single_action_space, num_envs)
+
+        n = num_envs
+        self.current_map_idx = np.zeros(n, dtype=np.int64)
+        self.grids = np.zeros((n, 10, 10), dtype=np.int8)
+        self.player_pos = np.zeros((n, 2), dtype=np.int64)
+        self.frame_ring = FrameRing(n, self.stack_size, (3, 10, 10))
+        self.mode = np.zeros(n, dtype=np.int64)
+
+        # Nuestro Pokémon (stats base como en los dicts de la Pokédex)
+        self.my_species = np.full(n, 4, dtype=np.int64)
+        self.my_level = np.full(n, 5, dtype=np.int64)
+        self.my_exp = np.zeros(n, dtype=np.int64)
+        self.my_hp = np.zeros(n, dtype=np.int64)
+        self.max_hp_my = np.zeros(n, dtype=np.int64)
+
+        # Rival salvaje
+        self.enemy_species = np.ones(n, dtype=np.int64)
+        self.enemy_level = np.ones(n, dtype=np.int64)
+        self.enemy_hp = np.zeros(n, dtype=np.int64)
+        self.max_hp_enemy = np.zeros(n, dtype=np.int64)
+
+    def log(self, msg, *args):
+        if self.verbose: LOG.info(msg, *args)
+
+    def set_my_pokemon(self, indices, pokemons):
+        """Asigna Pokémon (dicts de la Pokédex) a los entornos indicados, como env.my_pokemon = ..."""
+        for i, p in zip(np.atleast_1d(indices), pokemons):
+            self.my_species[i] = int(p['id'])
+            self.my_level[i] = p.get('level', 5)
+            self.my_exp[i] = p.get('exp', 0)
+
+    # --- OBSERVACIONES ---
+    def _push_frames(self, idx):
+        """Escribe el frame actual de los entornos idx en el siguiente hueco de su pila."""
+        if len(idx) == 0: return
+        slots = self.frame_ring.advance(idx)
+        buf = self.frame_ring.buf
+        buf[idx, slots, :2] = MAP_PLANES[self.current_map_idx[idx]]
+        buf[idx, slots, 2] = 0.0
+        buf[idx, slots, 2, self.player_pos[idx, 0], self.player_pos[idx, 1]] = 1.0
+
+    def _combat_obs(self):
+        state = np.zeros((self.num_envs, 10), dtype=np.float32)
+        state[:, 0] = self.my_hp / np.maximum(self.max_hp_my, 1)
+        ms = self.species.stats_at(self.my_species, self.my_level)
+        state[:, 1] = ms[:, STAT_IDX['attack']] / 300.0
+        state[:, 2] = ms[:, STAT_IDX['defense']] / 300.0
+        state[:, 5] = self.enemy_hp / np.maximum(self.max_hp_enemy, 1)
+        es = self.species.stats_at(self.enemy_species, self.enemy_level)
+        state[:, 6] = es[:, STAT_IDX['attack']] / 300.0
+        state[:, 7] = es[:, STAT_IDX['defense']] / 300.0
+        return state
+
+    def _obs(self):
+        frames = self.frame_ring.gather()
+        if self.nav_channels:
+            frames = np.concatenate((frames, NAV_PLANES[self.current_map_idx]), axis=1)
+        return {"map": frames, "combat": self._combat_obs(), "mode": self.mode.copy()}
+
+    # --- RESET ---
+    def _reset_envs(self, idx):
+        if len(idx) == 0: return
+        self.grids[idx] = _MAPS[self.current_map_idx[idx]]
+        self.player_pos[idx] = 0
+        self.mode[idx] = MODE_MAP
+        self.max_hp_my[idx] = self.species.stats_at(self.my_species[idx], self.my_level[idx])[:, 0]
+        self.my_hp[idx] = self.max_hp_my[idx]
+        # Llenar la pila con el frame inicial
+        for _ in range(self.stack_size):
+            self._push_frames(idx)
+
+    def reset(self, seed=None, options=None):
+        super().reset(seed=seed)
+        self._reset_envs(np.arange(self.num_envs))
+        return self._obs(), {}
+
+    # --- STEP ---
+    def step(self, actions):
+        actions = np.asarray(actions, dtype=np.int64)
+        rewards = np.zeros(self.num_envs, dtype=np.float64)
+        terminated = np.zeros(self.num_envs, dtype=bool)
+
+        in_map = self.mode == MODE_MAP
+        self._step_map(np.flatnonzero(in_map), actions, rewards, terminated)
+        self._step_combat(np.flatnonzero(~in_map), actions, rewards, terminated)
+
+        obs = self._obs()
+        infos = {}
+        done = np.flatnonzero(terminated)
+        if len(done):
+            infos["final_obs"] = {k: v.copy() for k, v in obs.items()}
+            infos["_final_obs"] = terminated.copy()
+            self._reset_envs(done)
+            for k, v in self._obs().items():
+                obs[k][done] = v[done]
+        return obs, rewards, terminated, np.zeros(self.num_envs, dtype=bool), infos
+
+    def _step_map(self, idx, actions, rewards, terminated):
+        a = actions[idx]
+        # Acción de combate en el mapa: penalización, no cambia la visión
+        valid = a < 4
+        rewards[idx[~valid]] = -0.1
+        idx, a = idx[valid], a[valid]
+        if len(idx) == 0: return
+
+        target = self.player_pos[idx] + _MOVES[a]
+        inside = np.all((target >= 0) & (target < 10), axis=1)
+        tile = np.full(len(idx), 1, dtype=np.int8)
+        tile[inside] = self.grids[idx[inside], target[inside, 0], target[inside, 1]]
+
+        # Choque (muro o borde)
+        bump = ~inside | (tile == 1)
+        rewards[idx[bump]] = -0.5
+
+        moved = ~bump
+        self.player_pos[idx[moved]] = target[moved]
+        low_level = self.my_level[idx] < 25
+        rewards[idx[moved]] = -0.01
+
+        # META
+        goal = moved & (tile == 9)
+        rewards[idx[goal]] = np.where(low_level[goal], 50, 500)
+        terminated[idx[goal]] = True
+
+        # HIERBA
+        grass = moved & (tile == 2)
+        rewards[idx[grass & low_level]] = 0.1
+        encounter = grass & (self.np_random.random(len(idx)) < 0.2)
+        rewards[idx[encounter]] = 0
+
+        self._push_frames(idx)
+        enc = idx[encounter]
+        if len(enc):
+            self.mode[enc] = MODE_COMBAT
+            self._generate_wild_enemies(enc)
+
+    def _generate_wild_enemies(self, idx):
+        min_lvl = 3 + self.current_map_idx[idx] * 5
+        self.enemy_level[idx] = min_lvl + self.np_random.integers(0, 4, size=len(idx))
+        if len(self._species_ids):
+            self.enemy_species[idx] = self.np_random.integers(1, 152, size=len(idx))
+        else:
+            self.enemy_species[idx] = self.my_species[idx]
+        self.max_hp_enemy[idx] = self.species.stats_at(self.enemy_species[idx], self.enemy_level[idx])[:, 0]
+        self.enemy_hp[idx] = self.max_hp_enemy[idx]
+
+    def _columns(self, species, level):
+        base = self._base_stats[species]
+        types = self._type_ids[species]
+        n = len(species)
+        return {
+            'level': level,
+            'attack': base[:, STAT_IDX['attack']],
+            'defense': base[:, STAT_IDX['defense']],
+            'special-attack': base[:, STAT_IDX['special-attack']],
+            'special-defense': base[:, STAT_IDX['special-defense']],
+            'type1': types[:, 0],
+            'type2': types[:, 1],
+            'status': np.zeros(n, dtype=np.int8),
+            'stage_attack': np.zeros(n, dtype=np.int8),
+            'stage_defense': np.zeros(n, dtype=np.int8),
+            'protected': np.zeros(n, dtype=bool),
+        }
+
+    def _step_combat(self, idx, actions, rewards, terminated):
+        a = actions[idx]
+        # Movimiento en combate: penalización
+        rewards[idx[a < 4]] = -0.5
+        idx, a = idx[a >= 4], a[a >= 4]
+        if len(idx) == 0: return
+
+        move_ids = _COMBAT_MOVE_IDS[np.minimum(a - 4, len(COMBAT_MOVES) - 1)]
+        mine = self._columns(self.my_species[idx], self.my_level[idx])
+        theirs = self._columns(self.enemy_species[idx], self.enemy_level[idx])
+        dmg, _ = BattleEngine.calculate_damage_batch(mine, theirs, move_ids, self.np_random)
+        self.enemy_hp[idx] -= dmg
+
+        # Victoria: +XP, subida de nivel y vuelta al mapa
+        won = self.enemy_hp[idx] <= 0
+        win = idx[won]
+        if len(win):
+            self.mode[win] = MODE_MAP
+            self.my_exp[win] += self.enemy_level[win] * XP_PER_LEVEL
+            up = win[self.my_exp[win] >= 100]
+            self.my_level[up] += 1
+            self.my_exp[up] = 0
+            self.max_hp_my[up] = self.species.stats_at(self.my_species[up], self.my_level[up])[:, 0]
+            self.my_hp[up] = self.max_hp_my[up]
+            rewards[win] = np.where(self.my_level[win] < 30, 100, 20)
+            self._push_frames(win)
+
+        # El rival contraataca
+        alive = idx[~won]
+        if len(alive) == 0: return
+        enemy_moves = _WILD_MOVE_BY_TYPE[self._type_ids[self.enemy_species[alive], 0]]
+        theirs = self._columns(self.enemy_species[alive], self.enemy_level[alive])
+        mine = self._columns(self.my_species[alive], self.my_level[alive])
+        dmg_r, _ = BattleEngine.calculate_damage_batch(theirs, mine, enemy_moves, self.np_random)
+        self.my_hp[alive] -= dmg_r
+
+        fainted = self.my_hp[alive] <= 0
+        rewards[alive[fainted]] = -50
+        terminated[alive[fainted]] = True
+        rewards[alive[~fainted]] = dmg[~won][~fainted] * 0.05
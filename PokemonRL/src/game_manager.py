@@ -1,9 +1,16 @@
+import logging
 import numpy as np
-import time
 from collections import deque
-from src.env.battle_engine import BattleEngine
+from src.env.battle_engine import BattleEngine, STATUS_CODES
+from src.env.move_table import move_id
 from src.env.maps import ALL_MAPS
-import sys
+from src.env.navigation import MAP_NAV
+from src.utils.rng import RandomStream, spawn_rngs
+from src.utils import event_log as ev
+from src.utils.logger import get_logger
+
+LOG = get_logger('game')
+
 # Configuración de Niveles
 LEVEL_GATES = {0: 10, 1: 20, 2: 30, 3: 40, 4: 55}
 WILD_ENCOUNTERS = {
@@ -14,13 +21,23 @@ WILD_ENCOUNTERS = {
     4: ['147', '148', '142', '115', '113']
 }
 GYM_LEADER_TEAM_IDS = ["18", "65", "112", "59", "103", "6"]
+GUIDE_BONUS = 1000  # Por cada paso que la acción acerca a la hierba (farmeo) o a la meta
 
 class GameManager:
-    def __init__(self, env, strategist, tactician, explorer):
+    def __init__(self, env, strategist, tactician, explorer, inference=None, verbose=True, events=None,
+                 navigation=True):
         self.env = env
         self.strategist = strategist
         self.tactician = tactician
         self.explorer = explorer
+        # Servicio de inferencia (src.agents.inference): se puede compartir entre muchas
+        # partidas para agrupar sus forwards; si no se pasa, se crea uno propio al primer uso
+        self.inference = inference
+        if inference is not None:
+            inference.register()
+        # Guiar al Explorador con el índice de navegación de cada mapa (src.env.navigation);
+        # con False, los muros se descubren chocando (máscaras originales)
+        self.navigation = navigation
         
         # Estado del RPG
         self.my_team = []
@@ -30,8 +47,13 @@ class GameManager:
         self.farming_mode = True
         self.boss_mode = False
         self.boss_idx = 0
+        self.champion = False  # Se activa al vencer al último Pokémon del Líder
+        self.wipeouts = 0
+        self.ticks = 0
         
         # Logs y Memoria
+        self.verbose = verbose
+        self.events = events  # src.utils.event_log.EventLog (opcional): registro binario de la partida
         self.logs = deque(maxlen=8)
         self.logs.append("Sistema Modular Iniciado")
         self.wall_hits = {}
@@ -39,20 +61,80 @@ class GameManager:
         self.visit_counts = {}
         self.action_history = deque(maxlen=15)
 
-    def log(self, msg):
-        self.logs.append(msg)
-        print(msg)
+    def _inference(self):
+        if self.inference is None:
+            # Import tardío: torch solo se carga si la partida llega a decidir algo
+            from src.agents.inference import InferenceService
+            self.inference = InferenceService(self.explorer, self.tactician)
+            self.inference.register()
+        return self.inference
+
+    def close(self):
+        """La partida deja de usar el servicio (las demás ya no la esperan para formar el lote)."""
+        if self.inference is not None:
+            self.inference.unregister()
+            self.inference = None
+
+    def log(self, msg, *args):
+        """
+        Mensaje de la partida (argumentos perezosos, como logging). Con verbose va también
+        al panel (self.logs); si no, solo se formatea si el logger 'game' acepta INFO.
+        """
+        if self.verbose:
+            msg = msg % args if args else msg
+            self.logs.append(msg)
+            LOG.info(msg)
+        elif LOG.isEnabledFor(logging.INFO):
+            LOG.info(msg, *args)
+
+    def event(self, kind, actor=0, a=0, b=0, c=0):
+        if self.events is not None:
+            self.events.emit(self.ticks, kind, actor, a, b, c)
+
+    def slot(self, pokemon):
+        for i, p in enumerate(self.my_team):
+            if p['name'] == pokemon['name']:
+                return i
+        return -1
+
+    def tick(self):
+        """Un paso de la partida: mapa (Explorador) o combate (Táctico)."""
+        self.ticks += 1
+        if self.env.mode == "MAP":
+            self.map_logic()
+        else:
+            self.combat_logic()
+
+    @property
+    def rng(self):
+        """Azar de la partida: el RandomStream del entorno (env.reset(seed=...) lo fija)."""
+        return self.env.rng
 
-    def init_game(self):
-        # 1. Crear Equipo
-        all_ids = list(self.env.pokedex.keys())
-        party_ids = np.random.choice(all_ids, 6, replace=False) if len(all_ids)>6 else all_ids
+    def init_game(self, party_ids=None, seed=None):
+        if self.events is not None and seed is None:
+            # Partida registrada: siempre con semilla, para poder reproducirla (src.replay)
+            seed = np.random.randint(ev.MAX_SEED)
+        self.ticks = 0
+        if seed is not None:
+            # Una semilla fija el entorno (mapas, combates, GameManager) y el Estratega
+            env_rng, strategist_rng = spawn_rngs(seed, 2)
+            self.env.np_random = env_rng
+            self.env.rng = RandomStream(env_rng)
+            self.strategist.rng = strategist_rng
+        # 1. Crear Equipo (al azar, o el que se pase, p. ej. el de src.agents.team_search)
+        explicit_party = int(party_ids is not None)
+        if party_ids is None:
+            all_ids = list(self.env.pokedex.keys())
+            party_ids = self.rng.rng.choice(all_ids, 6, replace=False) if len(all_ids)>6 else all_ids
         self.strategist.set_party(party_ids)
         
         self.my_team = []
         for pid in party_ids:
             if str(pid) in self.env.pokedex:
                 self.my_team.append(self.strategist.prepare_pokemon(pid, level=5))
+        self.event(ev.EV_GAME_START, explicit_party, len(self.my_team), seed)
+        for i, p in enumerate(self.my_team):
+            self.event(ev.EV_PARTY, 0, int(p['id']), i, p['level'])
         
         # 2. Crear Boss
         self.gym_team = []
@@ -60,6 +142,10 @@ class GameManager:
             if str(pid) in self.env.pokedex:
                 self.gym_team.append(self.strategist.prepare_pokemon(pid, level=60))
         
+        self.boss_mode = False
+        self.boss_idx = 0
+        self.champion = False
+        self.wipeouts = 0
         self.load_level(0)
 
     def load_level(self, idx):
@@ -75,15 +161,14 @@ class GameManager:
         self.heal_team()
         self.wall_hits.clear(); self.blocked_cells.clear(); self.visit_counts.clear()
         self.farming_mode = True
-        self.log(f"--- NIVEL {idx + 1} ---")
+        self.event(ev.EV_LEVEL, 0, idx)
+        self.log("--- NIVEL %s ---", idx + 1)
 
     def heal_team(self):
         self.potions = 10
-        for i, p in enumerate(self.my_team):
-            # Regenerar manteniendo XP
-            new_p = self.strategist.prepare_pokemon(p['id'], p['level'])
-            new_p['exp'] = p['exp']
-            self.my_team[i] = new_p
+        for p in self.my_team:
+            # Curar en sitio (mantiene XP y movimientos)
+            p.heal()
         self.update_active_pokemon()
 
     def update_active_pokemon(self):
@@ -92,7 +177,9 @@ class GameManager:
             if p['stats']['hp'] > 0:
                 self.env.my_pokemon = p
                 self.env.my_hp = p['stats']['hp']
-                self.env.max_hp_my = p['stats']['hp']
+                # PS máximos reales (antes, los PS actuales): el estado de combate y la
+                # regla del <50% de combat_logic usan el porcentaje de vida de verdad
+                self.env.max_hp_my = BattleEngine.get_max_hp(p)
                 return True
         return False
 
@@ -114,8 +201,9 @@ class GameManager:
         
         self.env.my_pokemon = new_pokemon
         self.env.my_hp = new_pokemon['stats']['hp']
-        self.env.max_hp_my = new_pokemon['stats']['hp']
-        self.log(f"🔄 Cambio: Entra {new_pokemon['name']}")
+        self.env.max_hp_my = BattleEngine.get_max_hp(new_pokemon)  # Ver update_active_pokemon
+        self.event(ev.EV_SWITCH, 0, int(new_pokemon['id']), self.slot(new_pokemon))
+        self.log("🔄 Cambio: Entra %s", new_pokemon['name'])
 
     # --- CEREBRO DE COMBATE ---
     def combat_logic(self):
@@ -135,7 +223,7 @@ class GameManager:
             
             # A) Si el débil está vivo y NO está peleando -> SACARLO
             if weakest['stats']['hp'] > 0 and active['name'] != weakest['name']:
-                self.log(f"🎓 ¡Hora de aprender, {weakest['name']}!")
+                self.log("🎓 ¡Hora de aprender, %s!", weakest['name'])
                 self.switch_pokemon(weakest)
                 self.enemy_turn() # Pierde turno
                 return
@@ -144,7 +232,7 @@ class GameManager:
             current_pct = self.env.my_hp / self.env.max_hp_my
             if active['name'] == weakest['name'] and current_pct < 0.5:
                 if strongest and strongest['name'] != active['name']:
-                    self.log(f"🛡️ ¡Ayuda {strongest['name']}!")
+                    self.log("🛡️ ¡Ayuda %s!", strongest['name'])
                     self.switch_pokemon(strongest)
                     self.enemy_turn()
                     return
@@ -153,56 +241,67 @@ class GameManager:
         if self.potions > 0:
             for p in self.my_team:
                 # Curar solo si no es el activo (para no perder tempo) o si es crítico
-                limit = p['stats']['hp'] < (p['stats']['hp'] * 0.4) # Esto está mal, arreglamos
-                # Necesitamos Max HP real
-                real_max = BattleEngine.get_stats_at_level(p, p['level'])['hp']
+                # Necesitamos Max HP real (consulta a la tabla de stats)
+                real_max = BattleEngine.get_max_hp(p)
                 if p['stats']['hp'] > 0 and p['stats']['hp'] < real_max * 0.4:
                     heal = int(real_max * 0.5)
                     p['stats']['hp'] = min(real_max, p['stats']['hp'] + heal)
                     self.potions -= 1
-                    self.log(f"💊 Poción a {p['name']}")
+                    self.event(ev.EV_POTION, 0, int(p['id']), self.slot(p), heal)
+                    self.log("💊 Poción a %s", p['name'])
                     if p == self.env.my_pokemon: self.env.my_hp = p['stats']['hp']
                     self.enemy_turn()
                     return
 
         # 3. Ataque (Tactician)
-        import torch
-        with torch.no_grad():
-            st = self.env._get_combat_state()
-            st_t = torch.FloatTensor(st).unsqueeze(0).to(self.tactician.device)
-            action = self.tactician.policy_net(st_t).argmax().item()
-        
-        self.player_attack(action)
+        self.player_attack(self.choose_combat_action())
+
+    def choose_combat_action(self):
+        return self._inference().act('combat', self.env._get_combat_state())
 
     def player_attack(self, action_idx):
+        choice = action_idx
         if action_idx > 3: action_idx = 0
         moves = self.env.my_pokemon.get('active_moves', ['tackle'])
         move = moves[action_idx] if action_idx < len(moves) else moves[0]
         
-        dmg, msg = BattleEngine.calculate_damage(self.env.my_pokemon, self.env.enemy_pokemon, move)
+        status = self.env.enemy_pokemon.get('status_condition')
+        dmg, msg = BattleEngine.calculate_damage(self.env.my_pokemon, self.env.enemy_pokemon, move, self.rng)
         self.env.enemy_hp -= dmg
-        self.log(f"Tú: {move} -{dmg} {msg}")
+        self.event(ev.EV_MOVE, ev.PLAYER, move_id(move), dmg, choice)
+        self._status_event(self.env.enemy_pokemon, status, ev.ENEMY)
+        self.log("Tú: %s -%s %s", move, dmg, msg)
         
         if self.env.enemy_hp > 0:
             self.enemy_turn()
 
     def enemy_turn(self):
         moves = self.env.enemy_pokemon.get('active_moves', ['tackle'])
-        move = np.random.choice(moves)
-        dmg, msg = BattleEngine.calculate_damage(self.env.enemy_pokemon, self.env.my_pokemon, move)
+        move = self.rng.choice(moves)
+        status = self.env.my_pokemon.get('status_condition')
+        dmg, msg = BattleEngine.calculate_damage(self.env.enemy_pokemon, self.env.my_pokemon, move, self.rng)
         self.env.my_hp -= dmg
-        self.log(f"Rival: {move} -{dmg}")
+        self.event(ev.EV_MOVE, ev.ENEMY, move_id(move), dmg)
+        self._status_event(self.env.my_pokemon, status, ev.PLAYER)
+        self.log("Rival: %s -%s", move, dmg)
+
+    def _status_event(self, target, before, side):
+        after = target.get('status_condition')
+        if after != before and after:
+            self.event(ev.EV_STATUS, side, STATUS_CODES.get(after, 0))
 
     def handle_victory(self):
         # Repartir XP al más débil siempre
         receiver = self.get_weakest()
         xp, leveled, _ = BattleEngine.gain_experience(receiver, self.env.enemy_pokemon['level'])
+        self.event(ev.EV_VICTORY, 0, int(receiver['id']), xp)
         
-        self.log(f"Ganaste! {receiver['name']} +{xp} XP")
+        self.log("Ganaste! %s +%s XP", receiver['name'], xp)
         
         if leveled:
             new_lvl = receiver['level']
-            self.log(f"🎉 ¡{receiver['name']} SUBE A NIVEL {new_lvl}!")
+            self.event(ev.EV_LEVEL_UP, 0, int(receiver['id']), new_lvl, self.slot(receiver))
+            self.log("🎉 ¡%s SUBE A NIVEL %s!", receiver['name'], new_lvl)
             # Actualizar datos del pokemon
             new_p = self.strategist.prepare_pokemon(receiver['id'], new_lvl)
             new_p['exp'] = receiver['exp']
@@ -222,28 +321,34 @@ class GameManager:
             self.boss_idx += 1
             if self.boss_idx >= len(self.gym_team):
                 self.log("🏆 ¡CAMPEÓN!")
-                time.sleep(5)
-                sys.exit()
+                self.champion = True
+                self.event(ev.EV_CHAMPION)
             else:
                 self.env.enemy_pokemon = self.gym_team[self.boss_idx]
                 self.env.max_hp_enemy = self.env.enemy_pokemon['stats']['hp']
                 self.env.enemy_hp = self.env.max_hp_enemy
-                self.log(f"Líder saca a {self.env.enemy_pokemon['name']}")
+                self.event(ev.EV_BOSS, 0, self.boss_idx, int(self.env.enemy_pokemon['id']))
+                self.log("Líder saca a %s", self.env.enemy_pokemon['name'])
         else:
             self.env.mode = "MAP"
 
     def handle_faint(self):
         name = self.env.my_pokemon['name']
-        self.log(f"❌ {name} cayó!")
+        self.event(ev.EV_FAINT, 0, int(self.env.my_pokemon['id']), self.slot(self.env.my_pokemon))
+        self.log("❌ %s cayó!", name)
         
         # Marcar muerto
         for i, p in enumerate(self.my_team):
             if p['name'] == name: self.my_team[i]['stats']['hp'] = 0
             
         if self.update_active_pokemon():
-            self.log(f"¡Ve {self.env.my_pokemon['name']}!")
+            self.log("¡Ve %s!", self.env.my_pokemon['name'])
         else:
             self.log("💀 WIPEOUT. Reiniciando...")
+            self.wipeouts += 1
+            self.event(ev.EV_WIPEOUT, 0, self.current_level_idx)
+            # Contra el Líder: combate perdido, se repite el último mapa y luego el Líder
+            self.boss_mode = False
             self.heal_team()
             self.env.reset()
             self.env.grid = np.array(ALL_MAPS[self.current_level_idx])
@@ -256,54 +361,84 @@ class GameManager:
         # Modo Farmeo activo si CUALQUIERA del equipo es menor al requisito
         self.farming_mode = any(p['level'] < req for p in self.my_team)
         
-        # 2. Explorer decide (Torch)
-        import torch
-        with torch.no_grad():
-            st_t = torch.FloatTensor(self.env._get_stacked_state()).unsqueeze(0).to(self.explorer.device)
-            q_vals = self.explorer.policy_net(st_t).cpu().numpy()[0].copy()
+        # 2. Explorer decide
+        action = chosen = self.choose_map_action()
+        
+        # Anti-Bucle
+        self.action_history.append(action)
+        if len(self.action_history) >= 10 and len(set(self.action_history)) == 1:
+            action = self.rng.integers(0,4)
+            self.action_history.clear()
             
-            # MÁSCARAS LÓGICAS
-            y, x = self.env.player_pos
+        # Ejecutar
+        self.process_map_action(action, chosen)
+
+    def choose_map_action(self):
+        # Servicio de inferencia (el estado es la vista del buffer de frames) + máscaras
+        q_vals = self._inference().q_values('map', self.env._get_stacked_state()).copy()
+        if self.navigation:
+            return self._guided_action(q_vals)
+        
+        # MÁSCARAS LÓGICAS
+        y, x = self.env.player_pos
+        
+        for a in range(4):
+            # Calcular coord destino
+            ty, tx = y, x
+            if a==0: ty-=1
+            elif a==1: ty+=1
+            elif a==2: tx-=1
+            elif a==3: tx+=1
             
-            for a in range(4):
-                # Calcular coord destino
-                ty, tx = y, x
-                if a==0: ty-=1
-                elif a==1: ty+=1
-                elif a==2: tx-=1
-                elif a==3: tx+=1
-                
-                coord = (ty, tx)
-                
-                # Paredes / Bloqueos
-                if coord in self.blocked_cells: 
-                    q_vals[a] = -99999
-                    continue
-                
-                # Zanahoria (Hierba)
-                if 0 <= tx < 10 and 0 <= ty < 10:
-                    is_grass = (self.env.grid[ty][tx] == 2)
-                    if self.farming_mode and is_grass:
-                        q_vals[a] += 5000
-                    if not self.farming_mode and is_grass:
-                        q_vals[a] -= 5000 # Repelente
-                        
-                # Aburrimiento
-                vis = self.visit_counts.get(coord, 0)
-                if vis > 0: q_vals[a] -= (vis**2) * 5
+            coord = (ty, tx)
             
-            action = np.argmax(q_vals)
+            # Paredes / Bloqueos
+            if coord in self.blocked_cells: 
+                q_vals[a] = -99999
+                continue
             
-            # Anti-Bucle
-            self.action_history.append(action)
-            if len(self.action_history) >= 10 and len(set(self.action_history)) == 1:
-                action = np.random.randint(0,4)
-                self.action_history.clear()
-                
-            # Ejecutar
-            self.process_map_action(action)
-
-    def process_map_action(self, action):
+            # Zanahoria (Hierba)
+            if 0 <= tx < 10 and 0 <= ty < 10:
+                is_grass = (self.env.grid[ty][tx] == 2)
+                if self.farming_mode and is_grass:
+                    q_vals[a] += 5000
+                if not self.farming_mode and is_grass:
+                    q_vals[a] -= 5000 # Repelente
+                    
+            # Aburrimiento
+            vis = self.visit_counts.get(coord, 0)
+            if vis > 0: q_vals[a] -= (vis**2) * 5
+        
+        return np.argmax(q_vals)
+
+    def _guided_action(self, q_vals):
+        """
+        Máscaras con el índice de navegación: muros y bordes conocidos desde el principio,
+        y GUIDE_BONUS por paso hacia la hierba (farmeo) o hacia la meta (con Repelente la
+        hierba ya no estorba). Todo son consultas a tablas precalculadas.
+        """
+        nav = MAP_NAV[self.current_level_idx]
+        y, x = self.env.player_pos
+        here = nav.cell(y, x)
+        field = nav.fields['grass' if self.farming_mode else 'goal']
+        
+        for a, target in enumerate(nav.neighbor_rows[here]):
+            if target < 0: # Muro o borde
+                q_vals[a] = -99999
+                continue
+            
+            q_vals[a] += GUIDE_BONUS * (field[here] - field[target])
+            # Zanahoria (Hierba)
+            if self.farming_mode and nav.is_grass[target]:
+                q_vals[a] += 5000
+            
+            # Aburrimiento
+            vis = self.visit_counts.get(divmod(target, nav.shape[1]), 0)
+            if vis > 0: q_vals[a] -= (vis**2) * 5
+        
+        return np.argmax(q_vals)
+
+    def process_map_action(self, action, chosen=None):
         # Pre-check de colisión para memoria
         y, x = self.env.player_pos
         ty, tx = y, x
@@ -320,6 +455,8 @@ class GameManager:
         self.visit_counts[(y, x)] = self.visit_counts.get((y, x), 0) + 1
         
         _, _, done, _, _ = self.env.step(action)
+        py, px = self.env.player_pos
+        self.event(ev.EV_MAP_STEP, action if chosen is None else chosen, action, py, px)
         
         if done: # Meta
             if not self.farming_mode:
@@ -331,19 +468,20 @@ class GameManager:
                 self.env.grid = np.array(ALL_MAPS[self.current_level_idx])
                 self.wall_hits.clear(); self.blocked_cells.clear()
 
-        if self.env.mode == "COMBAT":
+        # Con el último mapa superado, load_level ya ha empezado el combate contra el Líder
+        if self.env.mode == "COMBAT" and not self.boss_mode:
             if not self.farming_mode:
                 self.env.mode = "MAP" # Repelente
                 self.log("Repelente usado.")
             else:
                 wild = self.generate_wild_pokemon()
-                self.log(f"¡{wild['name']} salvaje!")
+                self.log("¡%s salvaje!", wild['name'])
 
     def generate_wild_pokemon(self):
         base = 3 + (self.current_level_idx * 10)
-        lvl = np.random.randint(base, base+4)
+        lvl = self.rng.integers(base, base+4)
         pool = WILD_ENCOUNTERS.get(self.current_level_idx, ['1'])
-        pid = np.random.choice(pool)
+        pid = self.rng.choice(pool)
         
         wild = self.strategist.prepare_pokemon(pid, lvl)
         if not wild: wild = self.strategist.prepare_pokemon('1', lvl)
@@ -351,6 +489,7 @@ class GameManager:
         self.env.enemy_pokemon = wild
         self.env.max_hp_enemy = wild['stats']['hp']
         self.env.enemy_hp = wild['stats']['hp']
+        self.event(ev.EV_ENCOUNTER, 0, int(wild['id']), wild['level'])
         return wild
 
     def start_boss_battle(self):
@@ -361,4 +500,5 @@ class GameManager:
         self.boss_idx = 0
         self.env.enemy_pokemon = self.gym_team[0]
         self.env.max_hp_enemy = self.env.enemy_pokemon['stats']['hp']
-        self.env.enemy_hp = self.env.max_hp_enemy
\ No newline at end of file
+        self.env.enemy_hp = self.env.max_hp_enemy
+        self.event(ev.EV_BOSS, 0, 0, int(self.env.enemy_pokemon['id']))
\ No newline at end of file
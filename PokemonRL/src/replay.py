@@ -0,0 +1,111 @@
+"""
+Reproducción de partidas registradas con src.utils.event_log.
+
+Con la semilla de EV_GAME_START todo el azar (mapas, combates, movimientos del
+Estratega) se repite igual; las únicas entradas externas son las decisiones de las
+redes, que se leen de los eventos (EV_MAP_STEP y los EV_MOVE del jugador). Por eso el
+estado de GameManager/PokemonSimEnv se reconstruye en cualquier tick sin cargar pesos.
+
+    python -m src.replay runs/campaign_0.bin --tick 500
+    python -m src.replay runs/campaign_0.bin --verify
+"""
+import argparse
+import numpy as np
+from src.env.pokemon_env import PokemonSimEnv
+from src.agents.strategist import Strategist
+from src.game_manager import GameManager
+from src.utils import event_log as ev
+
+
+class ReplayManager(GameManager):
+    """GameManager sin redes: toma las decisiones de los eventos de una partida."""
+
+    def __init__(self, events, env=None, strategist=None, record=False):
+        env = PokemonSimEnv() if env is None else env
+        strategist = Strategist(env.pokedex) if strategist is None else strategist
+        super().__init__(env, strategist, None, None, verbose=False,
+                         events=ev.EventLog() if record else None)
+        if len(events) == 0 or events['kind'][0] != ev.EV_GAME_START:
+            raise ValueError("Los eventos de una partida deben empezar por EV_GAME_START")
+        self.recorded = events
+        kinds = events['kind']
+        self._map_actions = iter(events['actor'][kinds == ev.EV_MAP_STEP].tolist())
+        self._combat_actions = iter(events['c'][(kinds == ev.EV_MOVE) & (events['actor'] == ev.PLAYER)].tolist())
+
+    def choose_map_action(self):
+        return next(self._map_actions)
+
+    def choose_combat_action(self):
+        return next(self._combat_actions)
+
+    def start(self):
+        start = self.recorded[0]
+        party = None
+        if start['actor']:
+            party = [str(pid) for pid in self.recorded['a'][self.recorded['kind'] == ev.EV_PARTY].tolist()]
+        self.init_game(party_ids=party, seed=int(start['b']))
+
+    @property
+    def last_tick(self):
+        return int(self.recorded['tick'][-1])
+
+    def run_to(self, tick):
+        """Avanza hasta tick (o hasta el final de la partida registrada)."""
+        tick = min(tick, self.last_tick)
+        while self.ticks < tick and not self.champion:
+            self.tick()
+        return self
+
+
+def replay(events, tick=None, **kwargs):
+    """GameManager con el estado de la partida tras `tick` ticks (por defecto, al final)."""
+    manager = ReplayManager(events, **kwargs)
+    manager.start()
+    return manager.run_to(manager.last_tick if tick is None else tick)
+
+
+def verify(events, **kwargs):
+    """Reproduce la partida entera y comprueba que genera exactamente los mismos eventos."""
+    manager = replay(events, record=True, **kwargs)
+    regenerated = manager.events.events()
+    return len(regenerated) == len(events) and bool(np.all(regenerated == np.asarray(events)))
+
+
+def summary(manager):
+    """Estado principal de una partida reconstruida."""
+    env = manager.env
+    return {
+        'tick': manager.ticks,
+        'map': manager.current_level_idx,
+        'mode': env.mode,
+        'player_pos': tuple(int(v) for v in env.player_pos),
+        'boss_mode': manager.boss_mode,
+        'boss_idx': manager.boss_idx,
+        'champion': manager.champion,
+        'wipeouts': manager.wipeouts,
+        'potions': manager.potions,
+        'team': [(p['name'], int(p['level']), int(p['stats']['hp'])) for p in manager.my_team],
+        'enemy': (env.enemy_pokemon['name'], int(env.enemy_hp)) if env.mode == "COMBAT" else None,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reproduce una partida de un registro de eventos.")
+    parser.add_argument("path")
+    parser.add_argument("--game", type=int, default=0, help="partida dentro del fichero")
+    parser.add_argument("--tick", type=int, default=None, help="tick a reconstruir (por defecto, el último)")
+    parser.add_argument("--verify", action="store_true", help="comprueba que la reproducción es exacta")
+    parser.add_argument("--dump", action="store_true", help="lista los eventos de la partida")
+    args = parser.parse_args()
+
+    games = ev.split_games(ev.read_events(args.path))
+    events = games[args.game]
+    print(f"📼 {args.path}: {len(games)} partidas, la {args.game} tiene {len(events)} eventos")
+    if args.dump:
+        for e in events:
+            print(ev.describe(e))
+    if args.verify:
+        print("✅ Reproducción exacta" if verify(events) else "❌ La reproducción no coincide")
+    else:
+        for key, value in summary(replay(events, args.tick)).items():
+            print(f"  {key:<11} {value}")
@@ -0,0 +1,112 @@
+"""
+Registro de eventos de la partida en registros binarios de ancho fijo (16 bytes).
+
+Cada evento es (tick, kind, actor, a, b, c); el significado de a/b/c depende del tipo
+(ver EV_*). Los eventos se acumulan en una lista y se añaden al fichero por bloques,
+sin formatear texto. El fichero es solo de anexado: varias partidas seguidas se
+separan por sus EV_GAME_START (split_games).
+
+src.replay reconstruye el estado de la partida en cualquier tick a partir de la semilla
+(EV_GAME_START) y las decisiones registradas (EV_MAP_STEP y los EV_MOVE del jugador).
+"""
+import os
+import numpy as np
+
+EVENT_DTYPE = np.dtype([
+    ('tick', '<u4'),
+    ('kind', 'u1'),
+    ('actor', 'u1'),
+    ('a', '<u2'),
+    ('b', '<i4'),
+    ('c', '<i4'),
+])
+
+# Tipos de evento                 actor               a               b               c
+EV_GAME_START = 1   # party explícito (0/1)  tamaño del party  semilla         -
+EV_PARTY = 2        # -                      especie           hueco           nivel
+EV_LEVEL = 3        # -                      mapa              -               -
+EV_MAP_STEP = 4     # acción elegida         acción ejecutada  y               x
+EV_ENCOUNTER = 5    # -                      especie           nivel           -
+EV_MOVE = 6         # 0 jugador / 1 rival    id de movimiento  daño            acción (jugador)
+EV_STATUS = 7       # lado que lo sufre      código de estado  -               -
+EV_SWITCH = 8       # -                      especie           hueco           -
+EV_POTION = 9       # -                      especie           hueco           PS curados
+EV_VICTORY = 10     # -                      especie (XP)      XP              -
+EV_LEVEL_UP = 11    # -                      especie           nivel nuevo     hueco
+EV_FAINT = 12       # -                      especie           hueco           -
+EV_WIPEOUT = 13     # -                      mapa              -               -
+EV_BOSS = 14        # -                      nº en el equipo   especie         -
+EV_CHAMPION = 15    # -                      -                 -               -
+
+EVENT_NAMES = {v: k[3:] for k, v in globals().items() if k.startswith('EV_')}
+
+PLAYER, ENEMY = 0, 1
+MAX_SEED = 2**31  # La semilla va en el campo b (int32)
+
+
+class EventLog:
+    """
+    Escritor de eventos. Con path, los bloques se añaden al fichero (modo 'ab');
+    sin path se quedan en memoria (events() los devuelve igual).
+    """
+
+    def __init__(self, path=None, buffer_size=4096):
+        self.path = path
+        self.buffer_size = buffer_size
+        self._buffer = []
+        self._chunks = []
+        if path is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def emit(self, tick, kind, actor=0, a=0, b=0, c=0):
+        self._buffer.append((tick, kind, actor, a, b, c))
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        records = np.array(self._buffer, dtype=EVENT_DTYPE)
+        self._buffer = []
+        if self.path is None:
+            self._chunks.append(records)
+        else:
+            with open(self.path, 'ab') as f:
+                f.write(records.tobytes())
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def events(self):
+        """Todos los eventos escritos hasta ahora (array estructurado EVENT_DTYPE)."""
+        self.flush()
+        if self.path is not None:
+            return read_events(self.path)
+        if not self._chunks:
+            return np.empty(0, dtype=EVENT_DTYPE)
+        return np.concatenate(self._chunks)
+
+
+def read_events(path):
+    """Eventos de un fichero, mapeados en memoria (no se carga entero)."""
+    if os.path.getsize(path) == 0:
+        return np.empty(0, dtype=EVENT_DTYPE)
+    return np.memmap(path, dtype=EVENT_DTYPE, mode='r')
+
+
+def split_games(events):
+    """Parte un array de eventos en una vista por partida (cada una empieza en EV_GAME_START)."""
+    starts = np.flatnonzero(events['kind'] == EV_GAME_START)
+    return [events[s:e] for s, e in zip(starts, list(starts[1:]) + [len(events)])]
+
+
+def describe(event):
+    """Una línea legible de un evento (para inspeccionar ficheros a mano)."""
+    tick, kind, actor, a, b, c = event.tolist()
+    return f"{tick:>7} {EVENT_NAMES.get(kind, kind):<11} actor={actor} a={a} b={b} c={c}"
@@ -0,0 +1,59 @@
+import numpy as np
+import torch
+
+
+class FrameRing:
+    """
+    Pila de frames sin copias: un buffer circular por entorno donde los últimos
+    stack_size frames siempre están contiguos, así la observación es una vista.
+
+    Cada entorno tiene capacity + stack_size - 1 huecos. Al dar la vuelta se copian
+    los stack_size - 1 frames más recientes al principio (una vez cada capacity pasos).
+    Las vistas que devuelve window() siguen siendo válidas durante al menos
+    capacity - stack_size pasos; quien quiera guardarlas más tiempo debe copiarlas.
+
+    La memoria es un tensor de torch (fijado en RAM si hay CUDA) y self.buf es su
+    vista NumPy: window() y tensor_window() comparten los mismos datos.
+    """
+
+    def __init__(self, num_envs, stack_size, frame_shape, capacity=32):
+        self.num_envs = num_envs
+        self.stack_size = stack_size
+        self.capacity = capacity
+        self.frame_shape = tuple(frame_shape)
+        self.obs_shape = (stack_size * self.frame_shape[0],) + self.frame_shape[1:]
+
+        shape = (num_envs, capacity + stack_size - 1) + self.frame_shape
+        self.tensor = torch.zeros(shape, dtype=torch.float32, pin_memory=torch.cuda.is_available())
+        self.buf = self.tensor.numpy()
+        self.pos = np.full(num_envs, stack_size - 1, dtype=np.int64)  # Hueco del frame más reciente
+        self._offsets = np.arange(1 - stack_size, 1)
+
+    def advance(self, idx):
+        """Avanza la pila de los entornos idx y devuelve el hueco donde escribir su frame nuevo."""
+        s, last = self.stack_size, self.capacity + self.stack_size - 2
+        pos = self.pos[idx] + 1
+        wrap = pos > last
+        if np.any(wrap):
+            w = np.atleast_1d(idx)[np.atleast_1d(wrap)]
+            # Los frames previos pasan al principio para que la ventana siga contigua
+            self.buf[w, :s - 1] = self.buf[w, self.capacity:]
+            pos = np.where(wrap, s - 1, pos)
+        self.pos[idx] = pos
+        return self.pos[idx]
+
+    def window(self, i):
+        """Observación apilada del entorno i como vista NumPy (stack_size * C, H, W)."""
+        p = self.pos[i]
+        return self.buf[i, p - self.stack_size + 1:p + 1].reshape(self.obs_shape)
+
+    def tensor_window(self, i):
+        """Lo mismo que window() pero como tensor de torch sobre la misma memoria."""
+        p = int(self.pos[i])
+        return self.tensor[i, p - self.stack_size + 1:p + 1].reshape(self.obs_shape)
+
+    def gather(self, idx=None):
+        """Observaciones de varios entornos en un solo array (n, stack_size * C, H, W). Es una copia."""
+        idx = np.arange(self.num_envs) if idx is None else np.asarray(idx)
+        slots = self.pos[idx, None] + self._offsets
+        return self.buf[idx[:, None], slots].reshape((len(idx),) + self.obs_shape)
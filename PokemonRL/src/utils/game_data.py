@@ -0,0 +1,308 @@
+"""
+Caché binaria de los datos del juego (Pokédex + movimientos + learnsets).
+
+Compilar una vez:
+    python -m src.utils.game_data
+
+Genera data/game_data.npz con todo en arrays NumPy. Cada carga compara el hash
+de los JSON de origen con el guardado en la caché: si alguien vuelve a descargar
+la Pokédex o los movimientos, la caché deja de usarse hasta recompilarla.
+
+El .npz va sin comprimir, así que cada array se mapea en memoria (solo lectura)
+directamente desde el fichero: todos los procesos que lo abren comparten las
+mismas páginas y nadie vuelve a deserializar JSON.
+"""
+import hashlib
+import json
+import os
+import struct
+import zipfile
+from collections.abc import Mapping
+import numpy as np
+from src.env.type_chart import TYPE_NAMES, TYPE_IDS, NO_TYPE, type_ids
+
+CACHE_VERSION = 2
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Los JSON pueden estar en PokemonRL/data o en data/ en la raíz del repo
+DATA_DIRS = (os.path.join(BASE_DIR, 'data'), os.path.join(os.path.dirname(BASE_DIR), 'data'))
+CACHE_PATH = os.path.join(BASE_DIR, 'data', 'game_data.npz')
+
+# Mismo orden que battle_mon.STAT_NAMES
+STAT_KEYS = ('hp', 'attack', 'defense', 'special-attack', 'special-defense', 'speed')
+NULL = -1  # Valor nulo en las columnas enteras (p. ej. 'power': null)
+
+
+def find_data_file(name):
+    """Ruta del primer data/<name> que exista, o None."""
+    for d in DATA_DIRS:
+        path = os.path.join(d, name)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def source_hash(pokedex_path, moves_path):
+    """Hash de la versión de la caché y del contenido de los JSON de origen."""
+    h = hashlib.sha256(str(CACHE_VERSION).encode())
+    for path in (pokedex_path, moves_path):
+        h.update(b'\0')
+        if path is not None:
+            with open(path, 'rb') as f:
+                h.update(f.read())
+    return h.hexdigest()
+
+
+def _read_json(path):
+    if path is None:
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _nullable(values):
+    return np.array([NULL if v is None else v for v in values], dtype=np.int16)
+
+
+def compile_arrays(pokedex, moves_db):
+    """Convierte los dicts de los JSON en arrays (lo que se guarda en la caché)."""
+    # Vocabulario de movimientos: primero los de moves.json (mismo orden), luego los que solo salen en learnsets
+    vocab = list(moves_db)
+    known = set(vocab)
+    for p in pokedex.values():
+        for m in p.get('moves', []):
+            if m not in known:
+                known.add(m)
+                vocab.append(m)
+    vocab_idx = {m: i for i, m in enumerate(vocab)}
+
+    entries = list(pokedex.values())
+    offsets = np.zeros(len(entries) + 1, dtype=np.int32)
+    offsets[1:] = np.cumsum([len(p.get('moves', [])) for p in entries])
+    types = np.full((len(entries), 2), NULL, dtype=np.int8)
+    for i, p in enumerate(entries):
+        for j, t in enumerate(p['types'][:2]):
+            types[i, j] = TYPE_IDS.get(t, NULL)
+
+    moves = list(moves_db.values())
+    return {
+        'species_key': np.array(list(pokedex), dtype=str),
+        'species_id': np.array([p['id'] for p in entries], dtype=np.int16),
+        'species_name': np.array([p['name'] for p in entries], dtype=str),
+        'species_types': types,
+        'species_stats': np.array([[p['stats'].get(s, 0) for s in STAT_KEYS] for p in entries], dtype=np.int16).reshape(-1, len(STAT_KEYS)),
+        'species_sprite': np.array([p.get('sprite') or '' for p in entries], dtype=str),
+        'learnset_offsets': offsets,
+        'learnset_moves': np.array([vocab_idx[m] for p in entries for m in p.get('moves', [])], dtype=np.int16),
+        'move_vocab': np.array(vocab, dtype=str),
+        'move_type': np.array([TYPE_IDS.get(m.get('type'), NULL) for m in moves], dtype=np.int8),
+        'move_power': _nullable([m.get('power') for m in moves]),
+        'move_accuracy': _nullable([m.get('accuracy') for m in moves]),
+        'move_pp': _nullable([m.get('pp') for m in moves]),
+        'move_class': np.array([m.get('class') or '' for m in moves], dtype=str),
+    }
+
+
+def compile_tables(pokedex, moves_db):
+    """
+    Tablas ya listas para el motor: las de SpeciesTable (indexadas por id de especie)
+    y las columnas de move_table (indexadas por id de movimiento), con prefijo 'table_'.
+    """
+    # Import tardío: battle_mon y move_table importan este módulo al cargarse
+    from src.env.battle_mon import SpeciesTable
+    from src.env.move_table import compile_move_table
+
+    species = SpeciesTable(pokedex)
+    learnsets = [sp.move_ids if sp is not None else np.zeros(0, dtype=np.int16) for sp in species.species]
+    offsets = np.zeros(len(learnsets) + 1, dtype=np.int32)
+    offsets[1:] = np.cumsum([len(m) for m in learnsets])
+    tables = {
+        'base_stats': species.base_stats,
+        'type_ids': species.type_ids,
+        'level_stats': species.level_stats,
+        'move_offsets': offsets,
+        'move_ids': np.concatenate(learnsets).astype(np.int16) if learnsets else np.zeros(0, dtype=np.int16),
+    }
+    tables.update(compile_move_table(moves_db))
+    return {'table_' + k: np.ascontiguousarray(v) for k, v in tables.items()}
+
+
+def build_cache(path=CACHE_PATH):
+    """Compila los JSON en la caché binaria. Devuelve la ruta escrita."""
+    pokedex_path, moves_path = find_data_file('pokedex.json'), find_data_file('moves.json')
+    pokedex, moves_db = _read_json(pokedex_path), _read_json(moves_path)
+    arrays = compile_arrays(pokedex, moves_db)
+    arrays.update(compile_tables(pokedex, moves_db))
+    arrays['version'] = np.array(CACHE_VERSION)
+    arrays['source_hash'] = np.array(source_hash(pokedex_path, moves_path))
+    # Sin compresión: cargar es leer bytes, sin descomprimir
+    with open(path, 'wb') as f:
+        np.savez(f, **arrays)
+    return path
+
+
+def map_cache(path=CACHE_PATH):
+    """
+    Abre la caché y devuelve sus arrays mapeados en memoria (solo lectura).
+    Un .npz sin comprimir es un zip de ficheros .npy guardados tal cual: basta
+    con localizar dónde empiezan los datos de cada uno dentro del fichero.
+    """
+    arrays = {}
+    with zipfile.ZipFile(path) as zf, open(path, 'rb') as f:
+        for info in zf.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{info.filename} está comprimido: no se puede mapear")
+            # Cabecera local del zip: 30 bytes fijos + nombre + campo extra
+            f.seek(info.header_offset)
+            name_len, extra_len = struct.unpack('<26xHH', f.read(30))
+            f.seek(info.header_offset + 30 + name_len + extra_len)
+            major, _ = np.lib.format.read_magic(f)
+            read_header = np.lib.format.read_array_header_1_0 if major == 1 else np.lib.format.read_array_header_2_0
+            shape, fortran, dtype = read_header(f)
+            name = info.filename[:-4] if info.filename.endswith('.npy') else info.filename
+            if dtype.hasobject:
+                raise ValueError(f"{name} contiene objetos de Python")
+            if shape == () or 0 in shape:
+                # Escalares y arrays vacíos no se pueden mapear: se leen sin más
+                with zf.open(info) as member:
+                    arr = np.lib.format.read_array(member)
+            else:
+                arr = np.asarray(np.memmap(path, dtype=dtype, mode='r', offset=f.tell(), shape=shape,
+                                           order='F' if fortran else 'C'))
+            arrays[name] = arr
+    return arrays
+
+
+def load_cache(path=CACHE_PATH, check=True):
+    """
+    Arrays de la caché (mapeados en memoria), o None si no existe, es de otra
+    versión o los JSON de origen han cambiado desde que se compiló.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        arrays = map_cache(path)
+    except Exception:
+        return None
+    if int(arrays['version']) != CACHE_VERSION:
+        return None
+    if check:
+        pokedex_path, moves_path = find_data_file('pokedex.json'), find_data_file('moves.json')
+        # Sin JSON de origen no hay nada con qué comparar: la caché es la única fuente
+        if (pokedex_path or moves_path) and str(arrays['source_hash']) != source_hash(pokedex_path, moves_path):
+            return None
+    return arrays
+
+
+def _species_entry(arrays, i, vocab):
+    """Entrada i de la Pokédex como dict (mismo formato que pokedex.json + 'type_ids')."""
+    start, end = arrays['learnset_offsets'][i:i + 2].tolist()
+    types = arrays['species_types'][i].tolist()
+    return {
+        'id': int(arrays['species_id'][i]),
+        'name': str(arrays['species_name'][i]),
+        'types': [TYPE_NAMES[t] for t in types if t != NULL],
+        'stats': dict(zip(STAT_KEYS, arrays['species_stats'][i].tolist())),
+        'moves': [vocab[m] for m in arrays['learnset_moves'][start:end].tolist()],
+        'sprite': str(arrays['species_sprite'][i]) or None,
+        'type_ids': tuple(NO_TYPE if t == NULL else t for t in types),
+    }
+
+
+def pokedex_from_arrays(arrays):
+    """Reconstruye el dict completo de la Pokédex."""
+    vocab = arrays['move_vocab'].tolist()
+    return {key: _species_entry(arrays, i, vocab) for i, key in enumerate(arrays['species_key'].tolist())}
+
+
+class PokedexView(Mapping):
+    """
+    Pokédex de solo lectura sobre los arrays mapeados de la caché. Se usa como el
+    dict de pokedex.json, pero cada entrada se construye la primera vez que se pide.
+    'tables' expone las tablas compiladas para SpeciesTable sin pasar por los dicts.
+    """
+
+    def __init__(self, arrays):
+        self.arrays = arrays
+        self.tables = {k[len('table_'):]: v for k, v in arrays.items() if k.startswith('table_')}
+        self._keys = arrays['species_key'].tolist()
+        self._index = {k: i for i, k in enumerate(self._keys)}
+        self._vocab = None
+        self._entries = {}
+
+    def __getitem__(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            i = self._index[key]
+            if self._vocab is None:
+                self._vocab = self.arrays['move_vocab'].tolist()
+            entry = self._entries[key] = _species_entry(self.arrays, i, self._vocab)
+        return entry
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+
+def moves_from_arrays(arrays):
+    """Reconstruye el dict de movimientos (mismo formato que moves.json)."""
+    def value(v):
+        return None if v == NULL else v
+    moves_db = {}
+    cols = zip(arrays['move_type'].tolist(), arrays['move_power'].tolist(), arrays['move_accuracy'].tolist(),
+               arrays['move_pp'].tolist(), arrays['move_class'].tolist())
+    for name, (t, power, acc, pp, cls) in zip(arrays['move_vocab'].tolist(), cols):
+        moves_db[name] = {'type': TYPE_NAMES[t] if t != NULL else None, 'power': value(power),
+                          'accuracy': value(acc), 'pp': value(pp), 'class': cls or None}
+    return moves_db
+
+
+_cache = None
+
+
+def cached_arrays():
+    """Arrays mapeados de la caché (se abre una vez por proceso), o None si no hay caché válida."""
+    global _cache
+    if _cache is None:
+        _cache = load_cache()
+        if _cache is None:
+            _cache = False
+    return _cache or None
+
+
+def load_pokedex():
+    """
+    La Pokédex: una PokedexView sobre la caché si está al día, si no el dict de
+    pokedex.json. En ambos casos cada entrada trae ya su 'type_ids'.
+    """
+    arrays = cached_arrays()
+    if arrays is not None:
+        return PokedexView(arrays)
+    try:
+        pokedex = _read_json(find_data_file('pokedex.json'))
+    except Exception:
+        return {}
+    for p in pokedex.values():
+        p['type_ids'] = type_ids(p['types'])
+    return pokedex
+
+
+def load_moves():
+    """(dict de movimientos, origen): desde la caché binaria si está al día, si no desde moves.json."""
+    arrays = cached_arrays()
+    if arrays is not None:
+        return moves_from_arrays(arrays), CACHE_PATH
+    path = find_data_file('moves.json')
+    try:
+        return _read_json(path), path
+    except Exception:
+        return {}, None
+
+
+if __name__ == "__main__":
+    out = build_cache()
+    print(f"Caché de datos compilada en {out} ({os.path.getsize(out) / 1024:.0f} KB)")
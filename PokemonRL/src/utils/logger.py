@@ -0,0 +1,103 @@
+"""
+Logging de PokemonRL: niveles, filtros por componente y escritura asíncrona.
+
+Cada módulo pide su logger con get_logger('<componente>') ('pokemonrl.<componente>')
+y registra con argumentos perezosos (LOG.info("Tú: %s -%s", move, dmg)): si el nivel
+está desactivado, el mensaje no llega a formatearse. setup_logging() (lo llaman los
+scripts) manda los registros a una cola en memoria; un hilo los escribe por bloques y
+vuelca el stream solo cuando la cola se vacía, así la partida nunca espera a la consola.
+
+Sin setup_logging() (p. ej. en los workers), solo salen WARNING y superiores por
+stderr, como con cualquier logger de la librería estándar.
+"""
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+
+ROOT = 'pokemonrl'
+COMPONENTS = ('game', 'strategist', 'env', 'agents', 'data', 'train')
+FORMAT = '%(message)s'
+
+_listener = None
+
+
+def get_logger(component):
+    return logging.getLogger(f"{ROOT}.{component}")
+
+
+class _StreamHandler(logging.StreamHandler):
+    """StreamHandler que no vuelca el stream en cada registro (lo hace el listener)."""
+
+    def emit(self, record):
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+class _Listener(logging.handlers.QueueListener):
+    """Escribe los registros de la cola y vuelca los handlers cada vez que la vacía."""
+
+    def dequeue(self, block):
+        if self.queue.empty():
+            for handler in self.handlers:
+                handler.flush()
+        return self.queue.get(block)
+
+
+def parse_levels(spec):
+    """'game=WARNING,strategist=ERROR' -> {'game': 'WARNING', 'strategist': 'ERROR'}"""
+    levels = {}
+    for item in filter(None, (s.strip() for s in (spec or "").split(","))):
+        component, _, level = item.partition("=")
+        levels[component.strip()] = level.strip().upper()
+    return levels
+
+
+def setup_logging(level='INFO', components=None, stream=None, path=None, fmt=FORMAT):
+    """
+    Configura 'pokemonrl': nivel general, niveles por componente ({'game': 'WARNING'})
+    y salida (stream, por defecto stdout, y/o fichero). Se puede llamar varias veces.
+    """
+    global _listener
+    shutdown_logging()
+
+    root = logging.getLogger(ROOT)
+    root.setLevel(level)
+    root.propagate = False
+    for component in COMPONENTS:
+        get_logger(component).setLevel(logging.NOTSET)
+    for component, component_level in (components or {}).items():
+        get_logger(component).setLevel(component_level)
+
+    formatter = logging.Formatter(fmt)
+    handlers = [_StreamHandler(sys.stdout if stream is None else stream)]
+    if path is not None:
+        handlers.append(logging.FileHandler(path, encoding='utf-8'))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    records = queue.SimpleQueue()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(records))
+    _listener = _Listener(records, *handlers)
+    _listener.start()
+    return root
+
+
+def shutdown_logging():
+    """Escribe lo que quede en la cola y para el hilo de escritura."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.flush()
+            if isinstance(handler, logging.FileHandler):
+                handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,56 @@
+"""
+Aleatoriedad con semilla para motor, entorno y GameManager.
+
+Cada entorno tiene su np.random.Generator (el np_random de gymnasium, que
+reset(seed=...) vuelve a sembrar) y un RandomStream encima para las llamadas
+escalares del motor. Con la misma semilla, la partida se repite exacta.
+"""
+from itertools import chain
+import numpy as np
+
+
+def make_rng(seed=None):
+    """
+    Generator a partir de una semilla o de otro Generator (se devuelve tal cual).
+    Sin semilla se saca una del estado global de np.random, así np.random.seed()
+    sigue fijando las partidas (p. ej. en los workers de rollout).
+    """
+    if isinstance(seed, np.random.Generator):
+        return seed
+    if seed is None:
+        seed = np.random.randint(2**31)
+    return np.random.default_rng(seed)
+
+
+def spawn_rngs(seed, n):
+    """n Generators independientes derivados de una sola semilla (entorno, estratega, ...)."""
+    return [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(n)]
+
+
+class RandomStream:
+    """
+    Números aleatorios sorteados por bloques desde un Generator. Tiene la interfaz del
+    módulo random que usa el motor (random, uniform, choice) más integers(); cada
+    llamada solo lee el siguiente valor de un bloque ya sorteado, mucho más barato
+    que pedirle un escalar al Generator cada vez.
+    """
+
+    def __init__(self, rng=None, block_size=4096):
+        self.rng = make_rng(rng)
+        self.block_size = block_size
+        # random() es el __next__ de un iterador en C: sin llamada a Python por valor
+        self.random = chain.from_iterable(self._blocks()).__next__
+
+    def _blocks(self):
+        while True:
+            yield self.rng.random(self.block_size).tolist()
+
+    def uniform(self, a, b):
+        return a + (b - a) * self.random()
+
+    def integers(self, low, high):
+        """Entero en [low, high) (como Generator.integers)."""
+        return low + int(self.random() * (high - low))
+
+    def choice(self, seq):
+        return seq[int(self.random() * len(seq))]
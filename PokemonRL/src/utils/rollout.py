@@ -0,0 +1,312 @@
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import queue
+import random
+import numpy as np
+import torch
+from torch.nn.utils import parameters_to_vector, vector_to_parameters
+
+MAP_OBS_SHAPE = (9, 10, 10)
+COMBAT_OBS_SHAPE = (10,)
+
+
+# --- LÓGICA DE UN EPISODIO (compartida por train.py y los workers) ---
+def setup_episode(env, strategist, episode):
+    """Curriculum, equipo y Pokémon inicial del episodio. Devuelve el mapa elegido."""
+    # Curriculum Acelerado para 1500 Episodios
+    if episode < 300: map_idx = 0          # Pueblo Paleta (Tutorial)
+    elif episode < 600: map_idx = np.random.choice([0, 1])
+    elif episode < 1000: map_idx = np.random.choice([0, 1, 2, 3])
+    else: map_idx = np.random.choice([0, 1, 2, 3, 4]) # Examen Final
+    env.current_map_idx = map_idx
+
+    if (episode-1) % 10 == 0 or not strategist.current_party:
+        all_ids = list(env.pokedex.keys())
+        party_ids = np.random.choice(all_ids, 6, replace=False) if len(all_ids) >= 6 else all_ids
+        strategist.set_party(party_ids)
+
+    target = np.random.choice(["fire", "water", "grass", "electric", "rock"])
+    best = strategist.build_team(target)
+
+    env.my_pokemon = best.copy()
+    env.my_pokemon['level'] = 5
+    env.my_pokemon['exp'] = 0
+    return map_idx
+
+
+def run_episode(env, explorer, tactician, max_steps, on_explore, on_combat):
+    """
+    Juega un episodio con ambos agentes. Cada transición se entrega a
+    on_explore / on_combat(state, action, reward, next_state, done).
+    Devuelve (recompensa total, pasos).
+    """
+    state, _ = env.reset()
+    total_reward = 0
+    done = False
+    steps = 0
+
+    while not done and steps < max_steps:
+        steps += 1
+
+        if env.mode == "MAP":
+            action = explorer.select_action(state)
+            next_state, reward, done, _, _ = env.step(action)
+
+            if env.mode == "COMBAT":
+                state = next_state
+                continue
+
+            on_explore(state, action, reward, next_state, done)
+            state = next_state
+            total_reward += reward
+
+        elif env.mode == "COMBAT":
+            action = tactician.select_action(state)
+            next_state, reward, done, _, _ = env.step(action + 4)
+
+            if env.mode == "MAP":
+                state = next_state
+                continue
+
+            on_combat(state, action, reward, next_state, done)
+            state = next_state
+            total_reward += reward
+
+    return total_reward, steps
+
+
+# --- MEMORIA COMPARTIDA ---
+class SharedRingBuffer:
+    """
+    Buffer circular de transiciones en memoria compartida (un escritor, un lector).
+    El worker escribe y luego incrementa el contador; el learner lee lo nuevo con drain().
+    """
+
+    def __init__(self, capacity, obs_shape, name=None):
+        self.capacity = capacity
+        self.obs_shape = tuple(obs_shape)
+        obs_size = int(np.prod(obs_shape))
+        layout = [
+            ('written', np.int64, ()),  # Transiciones escritas en total (no se reinicia)
+            ('states', np.float32, (capacity,) + self.obs_shape),
+            ('next_states', np.float32, (capacity,) + self.obs_shape),
+            ('actions', np.int64, (capacity,)),
+            ('rewards', np.float32, (capacity,)),
+            ('dones', np.float32, (capacity,)),
+        ]
+        nbytes = 8 + capacity * (obs_size * 8 + 16)
+        self.shm = shared_memory.SharedMemory(name=name, create=name is None, size=nbytes)
+        offset = 0
+        for field, dtype, shape in layout:
+            arr = np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=offset)
+            setattr(self, field, arr)
+            offset += arr.nbytes
+        if name is None:
+            self.written[()] = 0
+        self.read = 0
+
+    def spec(self):
+        """Lo necesario para abrir el buffer desde otro proceso."""
+        return (self.capacity, self.obs_shape, self.shm.name)
+
+    @classmethod
+    def attach(cls, spec):
+        capacity, obs_shape, name = spec
+        return cls(capacity, obs_shape, name=name)
+
+    def push(self, state, action, reward, next_state, done):
+        i = int(self.written) % self.capacity
+        self.states[i] = state
+        self.next_states[i] = next_state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.dones[i] = 1.0 if done else 0.0
+        self.written[()] += 1
+
+    def drain(self):
+        """
+        Copia las transiciones nuevas desde la última lectura. Si el worker da la vuelta
+        al anillo (antes o durante la copia) se pierden las más viejas, pero nunca se
+        devuelve una transición con campos de dos pasos distintos.
+        """
+        count = int(self.written)
+        start = max(self.read, count - self.capacity)
+        self.read = count
+        if count == start:
+            return None
+        idx = np.arange(start, count) % self.capacity
+        batch = (self.states[idx], self.actions[idx], self.rewards[idx],
+                 self.next_states[idx], self.dones[idx])
+        # El worker siguió escribiendo durante la copia: las transiciones anteriores a
+        # written - capacity + 1 (la +1 puede estar a medio escribir) ya no son fiables
+        stale = int(self.written) - self.capacity + 1 - start
+        if stale <= 0:
+            return batch
+        if stale >= count - start:
+            return None
+        return tuple(arr[stale:] for arr in batch)
+
+    def close(self, unlink=False):
+        self.shm.close()
+        if unlink: self.shm.unlink()
+
+
+class SharedWeights:
+    """
+    Pesos de explorer + tactician aplanados en memoria compartida, con un contador
+    de versión tipo seqlock (impar = escribiendo) para que los workers no lean a medias.
+    """
+
+    def __init__(self, n_params, name=None):
+        self.n_params = n_params
+        self.shm = shared_memory.SharedMemory(name=name, create=name is None, size=16 + 8 + n_params * 4)
+        self.version = np.ndarray((), dtype=np.int64, buffer=self.shm.buf, offset=0)
+        self.epsilons = np.ndarray((2,), dtype=np.float32, buffer=self.shm.buf, offset=8)
+        self.params = np.ndarray((n_params,), dtype=np.float32, buffer=self.shm.buf, offset=24)
+        if name is None:
+            self.version[()] = 0
+        self.seen = 0
+
+    def spec(self):
+        return (self.n_params, self.shm.name)
+
+    @classmethod
+    def attach(cls, spec):
+        n_params, name = spec
+        return cls(n_params, name=name)
+
+    def publish(self, nets, epsilons):
+        flat = torch.cat([parameters_to_vector(n.parameters()).detach().cpu() for n in nets])
+        self.version[()] += 1
+        self.params[:] = flat.numpy()
+        self.epsilons[:] = epsilons
+        self.version[()] += 1
+
+    def pull(self, nets):
+        """Copia los pesos si hay una versión nueva y completa. Devuelve los epsilons o None."""
+        v1 = int(self.version)
+        if v1 == self.seen or v1 % 2 == 1:
+            return None
+        flat = torch.from_numpy(self.params.copy())
+        epsilons = self.epsilons.copy()
+        if int(self.version) != v1:
+            return None
+        offset = 0
+        for net in nets:
+            n = sum(p.numel() for p in net.parameters())
+            vector_to_parameters(flat[offset:offset + n], net.parameters())
+            offset += n
+        self.seen = v1
+        return epsilons
+
+    def close(self, unlink=False):
+        self.shm.close()
+        if unlink: self.shm.unlink()
+
+
+# --- WORKERS ---
+def _worker_main(worker_id, explore_spec, combat_spec, weights_spec, episode_counter,
+                 stop_event, results, max_steps, seed):
+    # Un hilo por proceso: el paralelismo viene de tener muchos workers
+    torch.set_num_threads(1)
+    np.random.seed(seed)
+    random.seed(seed)
+
+    from src.env.pokemon_env import PokemonSimEnv
+    from src.agents.explorer import ExplorerAgent
+    from src.agents.tactician import TacticianAgent
+    from src.agents.strategist import Strategist
+
+    explore_buf = SharedRingBuffer.attach(explore_spec)
+    combat_buf = SharedRingBuffer.attach(combat_spec)
+    weights = SharedWeights.attach(weights_spec)
+
+    env = PokemonSimEnv(verbose=False)
+    # Los workers solo actúan: sin red objetivo ni memoria que llenar
+    explorer = ExplorerAgent(obs_shape=MAP_OBS_SHAPE, n_actions=4, buffer_size=1, target_update=0)
+    tactician = TacticianAgent(input_dim=COMBAT_OBS_SHAPE[0], n_actions=5, buffer_size=1, target_update=0)
+    explorer.device = tactician.device = torch.device("cpu")
+    explorer.policy_net.cpu(); tactician.policy_net.cpu()
+    strategist = Strategist(env.pokedex)
+
+    try:
+        while not stop_event.is_set():
+            eps = weights.pull([explorer.policy_net, tactician.policy_net])
+            if eps is not None:
+                explorer.epsilon, tactician.epsilon = float(eps[0]), float(eps[1])
+
+            with episode_counter.get_lock():
+                episode_counter.value += 1
+                episode = episode_counter.value
+
+            map_idx = setup_episode(env, strategist, episode)
+            total_reward, steps = run_episode(env, explorer, tactician, max_steps,
+                                              explore_buf.push, combat_buf.push)
+            results.put((worker_id, episode, map_idx, total_reward, steps))
+    finally:
+        explore_buf.close(); combat_buf.close(); weights.close()
+
+
+class RolloutWorkerPool:
+    """
+    N procesos, cada uno con su propio PokemonSimEnv, que juegan episodios y
+    escriben transiciones en buffers de memoria compartida. El learner las
+    recoge con drain() y reparte pesos nuevos con broadcast().
+    """
+
+    def __init__(self, n_workers, explorer, tactician, capacity=20000, max_steps=300, seed=0):
+        self.n_workers = n_workers
+        self.explorer = explorer
+        self.tactician = tactician
+        ctx = mp.get_context("spawn")
+
+        self.explore_bufs = [SharedRingBuffer(capacity, MAP_OBS_SHAPE) for _ in range(n_workers)]
+        self.combat_bufs = [SharedRingBuffer(capacity, COMBAT_OBS_SHAPE) for _ in range(n_workers)]
+        n_params = sum(p.numel() for net in self._nets() for p in net.parameters())
+        self.weights = SharedWeights(n_params)
+        self.broadcast()
+
+        self.episode_counter = ctx.Value('l', 0)
+        self.stop_event = ctx.Event()
+        self.results = ctx.Queue()
+        self.procs = [
+            ctx.Process(target=_worker_main, daemon=True,
+                        args=(i, self.explore_bufs[i].spec(), self.combat_bufs[i].spec(),
+                              self.weights.spec(), self.episode_counter, self.stop_event,
+                              self.results, max_steps, seed + i))
+            for i in range(n_workers)
+        ]
+        for p in self.procs: p.start()
+
+    def _nets(self):
+        return [self.explorer.policy_net, self.tactician.policy_net]
+
+    def broadcast(self):
+        """Publica los pesos y epsilons actuales del learner para todos los workers."""
+        self.weights.publish(self._nets(), [self.explorer.epsilon, self.tactician.epsilon])
+
+    @staticmethod
+    def _concat(batches):
+        batches = [b for b in batches if b is not None]
+        if not batches: return None
+        return tuple(np.concatenate(cols) for cols in zip(*batches))
+
+    def drain(self):
+        """Transiciones nuevas de todos los workers: (explorer_batch, tactician_batch), cada uno tupla de arrays o None."""
+        return (self._concat([b.drain() for b in self.explore_bufs]),
+                self._concat([b.drain() for b in self.combat_bufs]))
+
+    def finished_episodes(self):
+        """Resultados (worker, episodio, mapa, recompensa, pasos) terminados desde la última llamada."""
+        out = []
+        while True:
+            try: out.append(self.results.get_nowait())
+            except queue.Empty: return out
+
+    def close(self):
+        self.stop_event.set()
+        for p in self.procs:
+            p.join(timeout=5)
+            if p.is_alive(): p.terminate()
+        for b in self.explore_bufs + self.combat_bufs: b.close(unlink=True)
+        self.weights.close(unlink=True)
@@ -2,15 +2,25 @@ import torch
 import numpy as np
 import os
 import sys
+import time
 from src.env.pokemon_env import PokemonSimEnv
 from src.agents.explorer import ExplorerAgent
 from src.agents.tactician import TacticianAgent
 from src.agents.strategist import Strategist
+from src.utils.rollout import RolloutWorkerPool, setup_episode, run_episode
+from src.utils.logger import get_logger, setup_logging
 
 # --- AJUSTES PARA VERSIÓN CON MEMORIA ---
 EPISODES = 2000        # Aumentamos duración
 MAX_STEPS = 300        # Damos más tiempo por episodio
 SAVE_INTERVAL = 200    # Guardamos menos a menudo para no llenar el disco
+NUM_WORKERS = 0        # 0 = todo en un proceso; N > 0 = N procesos recogiendo episodios
+WEIGHT_SYNC_INTERVAL = 5  # Episodios entre envíos de pesos a los workers
+PRIORITIZED_REPLAY = False  # Replay priorizado: la meta (+500) y las victorias (+100) se repasan más
+DOUBLE_DQN = False  # La red viva elige la acción del siguiente estado y la red objetivo la evalúa
+LOG_EVERY = 10     # Episodios entre líneas de progreso
+
+LOG = get_logger('train')
 
 def save_checkpoint(explorer, tactician, episode):
     base_dir = os.path.dirname(os.path.abspath(__file__))
@@ -19,90 +29,84 @@ def save_checkpoint(explorer, tactician, episode):
     
     torch.save(explorer.policy_net.state_dict(), os.path.join(path, f"explorer_ep{episode}.pth"))
     torch.save(tactician.policy_net.state_dict(), os.path.join(path, f"tactician_ep{episode}.pth"))
-    print(f"💾 CHECKPOINT GUARDADO: Episodio {episode}")
+    LOG.info("💾 CHECKPOINT GUARDADO: Episodio %d", episode)
 
 def train():
-    print("🚀 INICIANDO ENTRENAMIENTO PRO (CON MEMORIA)...")
+    LOG.info("🚀 INICIANDO ENTRENAMIENTO PRO (CON MEMORIA)...")
     env = PokemonSimEnv(verbose=False)
     
     # --- LA LÍNEA MÁGICA ---
     # Cambiamos 3 por 9. Esto conecta los "ojos" nuevos a la red neuronal.
-    explorer = ExplorerAgent(obs_shape=(9, 10, 10), n_actions=4, lr=1e-4)
+    explorer = ExplorerAgent(obs_shape=(9, 10, 10), n_actions=4, lr=1e-4, prioritized=PRIORITIZED_REPLAY,
+                             double_dqn=DOUBLE_DQN)
     
-    tactician = TacticianAgent(input_dim=10, n_actions=5, lr=1e-3)
+    tactician = TacticianAgent(input_dim=10, n_actions=5, lr=1e-3, prioritized=PRIORITIZED_REPLAY,
+                               double_dqn=DOUBLE_DQN)
     strategist = Strategist(env.pokedex)
 
+    if NUM_WORKERS > 0:
+        return train_parallel(explorer, tactician)
+
     try: 
         for episode in range(1, EPISODES + 1):
-            
-           # Curriculum Acelerado para 1500 Episodios
-            if episode < 300: map_idx = 0          # Pueblo Paleta (Tutorial)
-            elif episode < 600: map_idx = np.random.choice([0, 1])
-            elif episode < 1000: map_idx = np.random.choice([0, 1, 2, 3])
-            else: map_idx = np.random.choice([0, 1, 2, 3, 4]) # Examen Final
-            env.current_map_idx = map_idx
-            
-            if (episode-1) % 10 == 0:
-                all_ids = list(env.pokedex.keys())
-                party_ids = np.random.choice(all_ids, 6, replace=False) if len(all_ids) >= 6 else all_ids
-                strategist.set_party(party_ids)
-
-            target = np.random.choice(["fire", "water", "grass", "electric", "rock"])
-            best = strategist.build_team(target)
-            
-            env.my_pokemon = best.copy()
-            env.my_pokemon['level'] = 5 
-            env.my_pokemon['exp'] = 0
-            
-            state, _ = env.reset()
-            
-            total_reward = 0
-            done = False
-            steps = 0
-            
-            while not done and steps < MAX_STEPS:
-                steps += 1
-                
-                if env.mode == "MAP":
-                    action = explorer.select_action(state)
-                    next_state, reward, done, _, _ = env.step(action)
-                    
-                    if env.mode == "COMBAT":
-                        state = next_state
-                        continue 
-                        
-                    explorer.learn(state, action, reward, next_state, done)
-                    state = next_state
-                    total_reward += reward
-
-                elif env.mode == "COMBAT":
-                    action = tactician.select_action(state)
-                    next_state, reward, done, _, _ = env.step(action + 4)
-                    
-                    if env.mode == "MAP":
-                        state = next_state
-                        continue
-                        
-                    tactician.learn(state, action, reward, next_state, done)
-                    state = next_state
-                    total_reward += reward
+            map_idx = setup_episode(env, strategist, episode)
+            total_reward, steps = run_episode(env, explorer, tactician, MAX_STEPS,
+                                              explorer.remember, tactician.remember)
 
             # Decaimiento más lento para asegurar que aprende bien
             if explorer.epsilon > 0.05: explorer.epsilon *= 0.9997
             if tactician.epsilon > 0.05: tactician.epsilon *= 0.9995
 
-            if episode % 10 == 0:
-                print(f"Ep {episode}/{EPISODES} | Mapa {map_idx} | R: {total_reward:.1f} | Eps: {explorer.epsilon:.2f}")
+            if episode % LOG_EVERY == 0:
+                LOG.info("Ep %d/%d | Mapa %s | R: %.1f | Eps: %.2f", episode, EPISODES, map_idx, total_reward, explorer.epsilon)
 
             if episode % SAVE_INTERVAL == 0:
                 save_checkpoint(explorer, tactician, episode)
 
     except KeyboardInterrupt:
-        print("\n🛑 GUARDANDO...")
+        LOG.info("🛑 GUARDANDO...")
+        save_checkpoint(explorer, tactician, episode)
+        sys.exit(0)
+
+    save_checkpoint(explorer, tactician, EPISODES)
+
+def train_parallel(explorer, tactician):
+    """Los workers juegan y escriben en memoria compartida; este proceso solo aprende."""
+    LOG.info("🧵 %d workers de rollout en paralelo", NUM_WORKERS)
+    pool = RolloutWorkerPool(NUM_WORKERS, explorer, tactician, max_steps=MAX_STEPS)
+    episode = 0
+    try:
+        while episode < EPISODES:
+            explore_batch, combat_batch = pool.drain()
+            if explore_batch is None and combat_batch is None:
+                time.sleep(0.01)
+            if explore_batch is not None: explorer.remember_batch(*explore_batch)
+            if combat_batch is not None: tactician.remember_batch(*combat_batch)
+
+            for _, _, map_idx, total_reward, _ in pool.finished_episodes():
+                if episode >= EPISODES: break
+                episode += 1
+                if explorer.epsilon > 0.05: explorer.epsilon *= 0.9997
+                if tactician.epsilon > 0.05: tactician.epsilon *= 0.9995
+
+                if episode % WEIGHT_SYNC_INTERVAL == 0:
+                    pool.broadcast()
+
+                if episode % LOG_EVERY == 0:
+                    LOG.info("Ep %d/%d | Mapa %s | R: %.1f | Eps: %.2f", episode, EPISODES, map_idx, total_reward, explorer.epsilon)
+
+                if episode % SAVE_INTERVAL == 0:
+                    save_checkpoint(explorer, tactician, episode)
+
+    except KeyboardInterrupt:
+        LOG.info("🛑 GUARDANDO...")
         save_checkpoint(explorer, tactician, episode)
+        pool.close()
         sys.exit(0)
 
+    pool.close()
     save_checkpoint(explorer, tactician, EPISODES)
 
 if __name__ == "__main__":
+    setup_logging()
     train()
\ No newline at end of file
@@ -7,6 +7,7 @@ from src.agents.explorer import ExplorerAgent
 from src.agents.tactician import TacticianAgent
 from src.agents.strategist import Strategist
 from src.game_manager import GameManager  # <--- IMPORTAMOS EL NUEVO MANAGER
+from src.utils.logger import setup_logging
 
 # CONFIG
 CELL_SIZE = 50
@@ -88,13 +89,14 @@ class GameRenderer:
             now = pygame.time.get_ticks()
             if now - last_step > STEP_DELAY:
                 last_step = now
-                if self.env.mode == "MAP":
-                    self.manager.map_logic()
-                else:
-                    self.manager.combat_logic()
+                self.manager.tick()
             
             self.draw()
             pygame.display.flip()
+            
+            if self.manager.champion:
+                pygame.time.wait(5000)
+                running = False
         
         pygame.quit()
 
@@ -185,5 +187,6 @@ class GameRenderer:
             self.screen.blit(self.font.render(f"{prefix}{p['name'][:8]} {hp}", True, col), (350, 510+i*20))
 
 if __name__ == "__main__":
+    setup_logging()
     game = GameRenderer()
     game.run()
\ No newline at end of file